@@ -0,0 +1,40 @@
+"""
+Настройки gunicorn для запуска сервиса в production:
+
+    gunicorn -c task_motivation_service/gunicorn.conf.py task_motivation_service.task_app.main:app
+
+Значения по умолчанию переопределяются переменными окружения.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8002")
+# По умолчанию рабочий процесс на каждое ядро; фоновые задачи каждого процесса согласованы через базу данных
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "task_motivation_service.task_app.core.server.ProductionWorker"
+# Приложение импортируется один раз в главном процессе, рабочие процессы получают его при fork
+preload_app = True
+# Очередь соединений, ожидающих accept
+backlog = int(os.getenv("BACKLOG", "2048"))
+# Больше keepalive_timeout пулов nginx, чтобы простаивающее соединение закрывал nginx, а не сервис
+keepalive = int(os.getenv("KEEPALIVE", "75"))
+timeout = int(os.getenv("TIMEOUT", "60"))
+# Время на остановку рабочего процесса по SIGTERM: ожидание запросов и остановка приложения (см. ProductionWorker)
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "60"))
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "0"))
+# Адреса прокси, от которых принимаются X-Forwarded-For/X-Forwarded-Proto; остальным заголовкам не доверяем
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def when_ready(server):
+    """
+    Вызывается после загрузки приложения, до запуска рабочих процессов.
+
+    Объекты, созданные при импорте приложения, переносятся в постоянное поколение сборщика мусора:
+    сборщик в рабочих процессах их не обходит и не изменяет их заголовки, поэтому страницы памяти
+    остаются общими с главным процессом (copy-on-write).
+    """
+    gc.freeze()
+    server.log.info(f"Приложение загружено, заморожено объектов: {gc.get_freeze_count()}")
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from loguru import logger
+
+
+class PeriodicTask:
+    """
+    Фоновая задача, которая периодически вызывает корутину в рамках жизненного цикла приложения.
+
+    Ошибки отдельного запуска логируются и не останавливают цикл.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[None]], interval: float):
+        """
+        :param name: Имя задачи для логов.
+        :param func: Корутинная функция без аргументов, выполняемая на каждом шаге.
+        :param interval: Пауза между запусками в секундах.
+        """
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = asyncio.Event()
+
+    def start(self) -> None:
+        """Запускает цикл, если он еще не запущен."""
+        if self._task is None or self._task.done():
+            self._stopped.clear()
+            self._task = asyncio.create_task(self._run(), name=self.name)
+            logger.info(f"Фоновая задача {self.name} запущена (интервал {self.interval} с).")
+
+    async def stop(self) -> None:
+        """Останавливает цикл и дожидается завершения текущего шага."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info(f"Фоновая задача {self.name} остановлена.")
+
+    async def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                await self.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка в фоновой задаче {self.name}: {e}")
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
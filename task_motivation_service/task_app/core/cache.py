@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    Кэш в памяти процесса с ограничением по размеру (LRU) и времени жизни записей.
+
+    Предназначен для небольших горячих наборов данных; не потокобезопасен и рассчитан на
+    использование из одного цикла событий.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        """
+        :param maxsize: Максимальное количество записей.
+        :param ttl: Время жизни записи в секундах.
+        :param timer: Источник времени (для тестов).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """Возвращает значение по ключу или default, если записи нет или она устарела."""
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        expires_at, value = item
+        if expires_at <= self._timer():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение; при переполнении вытесняется давно не использованная запись."""
+        self._data[key] = (self._timer() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удаляет запись по ключу."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        self._data.clear()
+
+
+def pop_after_commit(session: AsyncSession, cache: TTLCache, key: Hashable) -> None:
+    """
+    Удаляет запись из кэша после фиксации транзакции сессии.
+
+    Если удалить запись до коммита, параллельный запрос успеет прочитать еще не измененные данные
+    и снова положить их в кэш. При откате транзакции запись не удаляется.
+
+    :param session: Сессия, в которой изменяются данные.
+    :param cache: Кэш.
+    :param key: Ключ записи.
+    """
+    session.info.setdefault("cache_invalidations", []).append((cache, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _pop_committed(session: Session) -> None:
+    for cache, key in session.info.pop("cache_invalidations", ()):
+        cache.pop(key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    # Откат точки сохранения не отменяет изменений внешней транзакции
+    if previous_transaction.parent is None:
+        session.info.pop("cache_invalidations", None)
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from pydantic import Extra, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -17,6 +18,94 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
 
+    # Взаимодействие с сервисом пользователей
+    USER_SERVICE_URL: str = "http://service1:8001"
+    # Общий секрет межсервисных запросов (/internal); без него внутренние эндпоинты недоступны
+    INTERNAL_API_TOKEN: str
+    USER_DIRECTORY_SYNC_INTERVAL: float = 30.0
+    USER_DIRECTORY_SYNC_BATCH: int = 500
+    USER_DIRECTORY_SYNC_OVERLAP: float = 5.0
+    USER_DIRECTORY_REFRESH_INTERVAL: float = 5.0
+
+    # Транзакционный outbox
+    SERVICE_NAME: str = "task_motivation_service"
+    OUTBOX_RELAY_INTERVAL: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_RETENTION_DAYS: int = 7
+
+    # Обработка просроченных задач
+    DEADLINE_SWEEP_INTERVAL: float = 30.0
+    DEADLINE_SWEEP_BATCH: int = 500
+
+    # Уведомления (Server-Sent Events)
+    SSE_HEARTBEAT_INTERVAL: float = 15.0
+    SSE_RETRY_MS: int = 3000
+    NOTIFICATION_LISTENER_CHECK_INTERVAL: float = 5.0
+
+    # Ключи идемпотентности
+    IDEMPOTENCY_KEY_TTL: float = 86400.0
+    # Резерв ключа на время выполнения запроса; истекает, если ответ так и не был сохранен
+    IDEMPOTENCY_LEASE: float = 60.0
+    IDEMPOTENCY_PURGE_INTERVAL: float = 3600.0
+
+    # Архивация завершенных задач
+    ARCHIVE_INTERVAL: float = 3600.0
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_AFTER_MONTHS: int = 6
+    ARCHIVE_RETENTION_MONTHS: int = 24
+    ARCHIVE_EXPORT_DIR: str = "archive"
+
+    # Фоновые задачи
+    JOB_WORKER_IN_APP: bool = True
+    JOB_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_HEARTBEAT_INTERVAL: float = 30.0
+    JOB_STALE_AFTER: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_DELAY: float = 10.0
+    JOB_SHUTDOWN_TIMEOUT: float = 30.0
+
+    # Остановка процесса: ожидание открытых запросов перед остановкой приложения
+    SHUTDOWN_DRAIN_TIMEOUT: float = 15.0
+
+    # Прокси, которым разрешено передавать адрес клиента в X-Forwarded-For (адреса и подсети через запятую)
+    TRUSTED_PROXIES: str = "127.0.0.1"
+
+    # Ограничение частоты запросов (корзина токенов)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_USER_RATE: float = 10.0
+    RATE_LIMIT_USER_BURST: int = 40
+    RATE_LIMIT_IP_RATE: float = 30.0
+    RATE_LIMIT_IP_BURST: int = 100
+    RATE_LIMIT_MAX_BUCKETS: int = 100000
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+
+    # Кэш проверенных JWT
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # Отзыв токенов
+    TOKEN_DENYLIST_CAPACITY: int = 100000
+    TOKEN_DENYLIST_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 2.0
+    TOKEN_REVOCATION_SYNC_OVERLAP: float = 5.0
+    TOKEN_REVOCATION_PURGE_INTERVAL: float = 3600.0
+
+    # Нагрузка исполнителей
+    WORKLOAD_CACHE_SIZE: int = 10000
+    WORKLOAD_CACHE_TTL: float = 15.0
+    WORKLOAD_MAX_USERS: int = 500
+
+    # Рейтинги по оценкам
+    LEADERBOARD_SIZE: int = 50
+    LEADERBOARD_PERIOD_DAYS: int = 30
+    LEADERBOARD_REFRESH_INTERVAL: float = 300.0
+
+    # Сжатие ответов (brotli, если установлен пакет brotli, иначе gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
     model_config = SettingsConfigDict(
         env_file=(".env", ".test.env"),
         extra=Extra.allow
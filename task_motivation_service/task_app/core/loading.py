@@ -0,0 +1,39 @@
+from typing import Callable, Dict, List, Sequence, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import raiseload
+
+S = TypeVar("S", bound=BaseModel)
+
+# Профили загрузки связей: имя (значение параметра include) -> функция, возвращающая опции загрузки
+LoadingProfiles = Dict[str, Callable[[], List]]
+
+
+def load_options(profiles: LoadingProfiles, include: Sequence[str] = ()) -> list:
+    """
+    Опции запроса для выбранных профилей загрузки.
+
+    Выбранные связи загружаются отдельными запросами (selectinload) с нужными колонками (load_only),
+    обращение к остальным связям вызывает ошибку (raiseload) вместо незаметного запроса на каждую запись.
+
+    :param profiles: Профили загрузки репозитория.
+    :param include: Имена выбранных профилей.
+    :return: Список опций для Select.options.
+    """
+    return [option for name in include for option in profiles[name]()] + [raiseload("*")]
+
+
+def to_schema(schema: Type[S], record) -> S:
+    """
+    Преобразует запись в схему по загруженным атрибутам.
+
+    Незагруженные связи и колонки не читаются, поэтому соответствующие поля схемы
+    получают значения по умолчанию.
+
+    :param schema: Схема ответа.
+    :param record: Запись модели.
+    :return: Экземпляр схемы.
+    """
+    loaded = {key: value for key, value in inspect(record).dict.items() if not key.startswith("_")}
+    return schema.model_validate(loaded)
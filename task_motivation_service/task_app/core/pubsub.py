@@ -0,0 +1,75 @@
+import asyncio
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Set
+
+from loguru import logger
+
+# Канал Postgres LISTEN/NOTIFY, через который события доходят до всех процессов сервиса
+EVENTS_CHANNEL = "task_events"
+# Предел размера сообщения NOTIFY (8000 байт) с запасом
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+class LocalBroker:
+    """
+    Pub/sub в памяти процесса: рассылка событий подписчикам, сгруппированным по пользователю.
+
+    У каждой подписки своя ограниченная очередь; если подписчик не успевает читать,
+    самое старое сообщение вытесняется, и публикация никогда не блокируется.
+    Наблюдатели получают все сообщения независимо от получателей (например, для кэшей процесса).
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._observers: List[Callable[[dict], None]] = []
+
+    def observe(self, callback: Callable[[dict], None]) -> None:
+        """Регистрирует наблюдателя, вызываемого синхронно для каждого опубликованного сообщения."""
+        if callback not in self._observers:
+            self._observers.append(callback)
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Создает подписку пользователя и возвращает ее очередь."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        """Удаляет подписку пользователя."""
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def publish(self, user_ids: Iterable[int], message: dict) -> int:
+        """
+        Кладет сообщение в очереди всех подписок указанных пользователей.
+
+        :param user_ids: Получатели сообщения.
+        :param message: Сообщение.
+        :return: Количество подписок, получивших сообщение.
+        """
+        for callback in self._observers:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"Ошибка наблюдателя событий {callback!r}: {e}")
+        delivered = 0
+        for user_id in set(user_ids):
+            for queue in self._subscribers.get(user_id, ()):
+                if queue.full():
+                    queue.get_nowait()
+                    logger.warning(f"Очередь подписки пользователя {user_id} переполнена, старое событие отброшено.")
+                queue.put_nowait(message)
+                delivered += 1
+        return delivered
+
+    @property
+    def subscriptions(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+broker = LocalBroker()
@@ -1,19 +1,21 @@
-import httpx
-from task_motivation_service.task_app.dependencies.repository_dep import get_session_without_commit
-from task_motivation_service.task_app.exceptions.task_meet_exceptions import ForbiddenException
+import hashlib
+import time
 
-
-from fastapi import Depends, HTTPException, Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Request
 from jose import jwt
-from datetime import datetime, timezone
+from task_motivation_service.task_app.core.cache import TTLCache
 from task_motivation_service.task_app.core.config import settings
 from task_motivation_service.task_app.exceptions.task_meet_exceptions import (TokenNoFound, NoJwtException,
-                                                                              TokenExpiredException)
+                                                                              TokenExpiredException,
+                                                                              TokenRevokedException)
+from task_motivation_service.task_app.services.revocation import token_denylist
 
 
 AUTH_SERVICE_URL = "http://127.0.0.1:8000"
 
+# Полезные нагрузки проверенных токенов по их хэшу; запись живет до истечения токена
+_verified_tokens: TTLCache[dict] = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=0)
+
 
 def get_access_token(request: Request) -> str:
     """Извлекаем access_token из кук."""
@@ -32,26 +34,30 @@ def get_refresh_token(request: Request) -> str:
     return token
 
 
-async def check_refresh_token(
-        token: str = Depends(get_refresh_token),
-        session: AsyncSession = Depends(get_session_without_commit)
-) -> dict:
-    """Проверяем refresh_token и возвращаем минимальную информацию о пользователе."""
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        return payload  # Возвращаем полезную нагрузку токена
-    except jwt.JWTError:
-        raise NoJwtException
+def decode_token(token: str) -> dict:
+    """
+    Проверяет подпись и срок действия токена и возвращает его полезную нагрузку.
 
+    Повторные запросы с тем же токеном не проверяют подпись заново: результат берется
+    из кэша, запись в котором истекает вместе с токеном. Отзыв проверяется по списку в памяти.
 
-async def get_current_user_info(
-        token: str = Depends(get_access_token)
-) -> dict:
-    """Проверяем access_token и возвращаем минимальную информацию о пользователе."""
+    :param token: JWT из кук.
+    :return: Полезная нагрузка токена.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _verified_tokens.get(key)
+    if payload is None:
+        payload = _verify_token(token)
+        _verified_tokens.set(key, payload, ttl=int(payload['exp']) - time.time())
+    # Отзыв проверяется и для закэшированных токенов
+    jti = payload.get('jti')
+    if jti and token_denylist.is_revoked(jti):
+        raise TokenRevokedException
+    return payload
+
+
+def _verify_token(token: str) -> dict:
+    """Проверяет подпись и срок действия токена."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except jwt.ExpiredSignatureError:
@@ -59,11 +65,19 @@ async def get_current_user_info(
     except jwt.JWTError:
         raise NoJwtException
 
-    expire: str = payload.get('exp')
-    expire_time = datetime.fromtimestamp(int(expire), tz=timezone.utc)
-    if (not expire) or (expire_time < datetime.now(timezone.utc)):
+    expire = payload.get('exp')
+    if not expire or int(expire) <= time.time():
         raise TokenExpiredException
+    return payload
+
+
+async def check_refresh_token(token: str = Depends(get_refresh_token)) -> dict:
+    """Проверяем refresh_token и возвращаем минимальную информацию о пользователе."""
+    return decode_token(token)
 
-    user_id = payload.get('sub')
 
-    return {"id": user_id}
+async def get_current_user_info(
+        token: str = Depends(get_access_token)
+) -> dict:
+    """Проверяем access_token и возвращаем минимальную информацию о пользователе."""
+    return {"id": decode_token(token).get('sub')}
@@ -0,0 +1,46 @@
+from typing import Callable, Optional, Sequence, Tuple
+
+from fastapi import Query
+
+from task_motivation_service.task_app.core.loading import LoadingProfiles
+from task_motivation_service.task_app.exceptions.task_meet_exceptions import unknown_fields, unknown_include
+
+
+def include_param(profiles: LoadingProfiles) -> Callable[..., Tuple[str, ...]]:
+    """
+    Создает зависимость, разбирающую параметр ?include= со списком связей через запятую.
+
+    :param profiles: Профили загрузки репозитория, из которых можно выбирать.
+    :return: Зависимость, возвращающая кортеж выбранных имен профилей.
+    """
+    allowed = sorted(profiles)
+
+    def dependency(include: Optional[str] = Query(
+            default=None, description=f"Связи для загрузки через запятую: {', '.join(allowed)}")) -> Tuple[str, ...]:
+        names = tuple(dict.fromkeys(name.strip() for name in (include or "").split(",") if name.strip()))
+        unknown = [name for name in names if name not in profiles]
+        if unknown:
+            raise unknown_include(unknown, allowed)
+        return names
+
+    return dependency
+
+
+def fields_param(allowed: Sequence[str]) -> Callable[..., Tuple[str, ...]]:
+    """
+    Создает зависимость, разбирающую параметр ?fields= со списком колонок ответа через запятую.
+
+    :param allowed: Колонки, доступные для выборки (см. selectable_fields репозитория).
+    :return: Зависимость, возвращающая кортеж выбранных колонок (пустой — ответ целиком).
+    """
+    allowed = tuple(allowed)
+
+    def dependency(fields: Optional[str] = Query(
+            default=None, description=f"Поля ответа через запятую: {', '.join(allowed)}")) -> Tuple[str, ...]:
+        names = tuple(dict.fromkeys(name.strip() for name in (fields or "").split(",") if name.strip()))
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise unknown_fields(unknown, allowed)
+        return names
+
+    return dependency
@@ -0,0 +1,18 @@
+import hmac
+from typing import Optional
+
+from fastapi import Header
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.exceptions.task_meet_exceptions import ForbiddenException
+
+
+def verify_internal_token(x_internal_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Проверяем токен межсервисного запроса.
+
+    Запрос без токена или с неверным токеном отклоняется; пустой INTERNAL_API_TOKEN не открывает доступ.
+    """
+    expected = settings.INTERNAL_API_TOKEN
+    if not (expected and x_internal_token and hmac.compare_digest(x_internal_token, expected)):
+        raise ForbiddenException
@@ -36,6 +36,18 @@ ParticipantNotFoundException = HTTPException(
     detail='Участник встречи не найден'
 )
 
+# Пользователь не найден в справочнике
+UserNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail='Пользователь не найден'
+)
+
+# Фоновая задача не найдена
+JobNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail='Задача не найдена'
+)
+
 # Недостаточно прав
 ForbiddenException = HTTPException(
     status_code=status.HTTP_403_FORBIDDEN,
@@ -67,8 +79,31 @@ NoJwtException = HTTPException(
 )
 
 
+# Токен отозван (выход из системы)
+TokenRevokedException = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail='Токен отозван'
+)
+
+
 # Неверный формат токена. Ожидается 'Bearer <токен>'
 TokenInvalidFormatException = HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Неверный формат токена. Ожидается 'Bearer <токен>'"
-)
\ No newline at end of file
+)
+
+
+def unknown_include(unknown, allowed) -> HTTPException:
+    """Запрошены связи, для которых нет профиля загрузки."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Неизвестные связи в include: {', '.join(unknown)}. Доступны: {', '.join(allowed) or 'нет'}"
+    )
+
+
+def unknown_fields(unknown, allowed) -> HTTPException:
+    """Запрошены поля, недоступные для выборки."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Неизвестные поля в fields: {', '.join(unknown)}. Доступны: {', '.join(allowed) or 'нет'}"
+    )
@@ -7,13 +7,73 @@ from loguru import logger
 from .routers.tasks import router as router_task
 from .routers.motivations import router as router_motivation
 from .routers.meetings import router as router_meet
+from .routers.internal import router as router_internal
+from .routers.notifications import router as router_notifications
+from .routers.jobs import router as router_jobs
+from .core.background import PeriodicTask
+from .core.config import settings
+from .core.pubsub import broker
+from .database.database import async_session_maker
+from .core.rate_limit import RatePolicy
+from .middlewares.compression import CompressionMiddleware
+from .middlewares.idempotency import IdempotencyMiddleware
+from .middlewares.rate_limit import RateLimitMiddleware, RouteLimit
+from .repositories.idempotency_repository import IdempotencyRepository
+from .services.archiver import task_archiver
+from .services.deadline_sweeper import deadline_sweeper
+from .services.jobs import job_worker
+from .services.leaderboard import leaderboard, refresh_leaderboards
+from .services.notifications import notification_listener
+from .services.outbox import OutboxRelay
+from .services.revocation import revocation_sync
+from .services.user_directory import user_directory_sync
+
+
+outbox_relay = OutboxRelay(source=settings.SERVICE_NAME, peer_url=settings.USER_SERVICE_URL)
+
+
+async def purge_idempotency_keys() -> None:
+    """Удаляет просроченные ключи идемпотентности."""
+    async with async_session_maker() as session:
+        await IdempotencyRepository(session).purge_expired()
+        await session.commit()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[dict, None]:
     """Управление жизненным циклом приложения."""
     logger.info("Инициализация приложения...")
+    try:
+        await user_directory_sync.load()
+    except Exception as e:
+        logger.error(f"Не удалось загрузить справочник пользователей: {e}")
+    try:
+        await revocation_sync.load()
+    except Exception as e:
+        logger.error(f"Не удалось загрузить отозванные токены: {e}")
+    broker.observe(leaderboard.apply_event)
+    background_tasks = [
+        PeriodicTask("user-directory-sync", user_directory_sync.sync_once, settings.USER_DIRECTORY_SYNC_INTERVAL),
+        PeriodicTask("user-directory-refresh", user_directory_sync.refresh, settings.USER_DIRECTORY_REFRESH_INTERVAL),
+        PeriodicTask("outbox-relay", outbox_relay.relay_once, settings.OUTBOX_RELAY_INTERVAL),
+        PeriodicTask("token-revocation-sync", revocation_sync.refresh, settings.TOKEN_REVOCATION_SYNC_INTERVAL),
+        PeriodicTask("token-revocation-purge", revocation_sync.purge_expired, settings.TOKEN_REVOCATION_PURGE_INTERVAL),
+        PeriodicTask("idempotency-purge", purge_idempotency_keys, settings.IDEMPOTENCY_PURGE_INTERVAL),
+        PeriodicTask("deadline-sweeper", deadline_sweeper.sweep_once, settings.DEADLINE_SWEEP_INTERVAL),
+        PeriodicTask("task-archiver", task_archiver.archive_once, settings.ARCHIVE_INTERVAL),
+        PeriodicTask("leaderboard-refresh", refresh_leaderboards, settings.LEADERBOARD_REFRESH_INTERVAL),
+        PeriodicTask("notification-listener", notification_listener.ensure_connected,
+                     settings.NOTIFICATION_LISTENER_CHECK_INTERVAL),
+    ]
+    for task in background_tasks:
+        task.start()
+    if settings.JOB_WORKER_IN_APP:
+        job_worker.start()
     yield
+    await job_worker.stop()
+    for task in background_tasks:
+        await task.stop()
+    await notification_listener.close()
     logger.info("Завершение работы приложения...")
 
 
@@ -29,6 +89,21 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Повтор запросов на создание по заголовку Idempotency-Key
+    app.add_middleware(IdempotencyMiddleware, paths=["/tasks/create", "/motivations/create", "/meetings/meetings/"])
+
+    # Ограничение частоты запросов (до обращений к базе данных)
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(RateLimitMiddleware, routes={
+            "/internal": None,
+            # Открытие потока уведомлений — долгий запрос, частые переподключения не нужны
+            "/notifications/stream": RouteLimit(user=RatePolicy(0.2, 5), ip=RatePolicy(1.0, 20)),
+        })
+
+    # Сжатие ответов; внутри CORS, но снаружи остальных middleware (ключи идемпотентности хранят несжатые ответы)
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+
     # Настройка CORS
     app.add_middleware(
         CORSMiddleware,
@@ -60,6 +135,9 @@ def register_routers(app: FastAPI) -> None:
     app.include_router(router_task, prefix='/tasks', tags=['Task'])
     app.include_router(router_motivation, prefix='/motivations', tags=['Motivation'])
     app.include_router(router_meet, prefix='/meetings', tags=['Meeting'])
+    app.include_router(router_notifications, prefix='/notifications', tags=['Notifications'])
+    app.include_router(router_jobs, prefix='/jobs', tags=['Jobs'])
+    app.include_router(router_internal, prefix='/internal', tags=['Internal'], include_in_schema=False)
 
 
 # Создание экземпляра приложения
@@ -0,0 +1,142 @@
+import zlib
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from task_motivation_service.task_app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость, без нее ответы сжимаются только gzip
+    brotli = None
+
+# Типы содержимого, которые имеет смысл сжимать; поток событий не сжимается, чтобы не задерживать события
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "text/")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """
+    Выбирает кодировку ответа по заголовку Accept-Encoding.
+
+    :param accept_encoding: Значение заголовка Accept-Encoding.
+    :param available: Поддерживаемые кодировки в порядке предпочтения сервера.
+    :return: Кодировка с наибольшим весом q (при равенстве — более предпочтительная) или None.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        # Промежуточные части сбрасываются (Z_SYNC_FLUSH), чтобы потоковый ответ не задерживался
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        return self._compressor.process(data) + (self._compressor.finish() if finish else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов brotli или gzip по заголовку Accept-Encoding.
+
+    Сжимаются ответы текстовых типов (JSON и т. п.) не меньше minimum_size байт; ответ, отданный
+    одной частью, получает точный Content-Length сжатого тела, потоковый ответ сжимается по частям.
+    Ответы с уже заданным Content-Encoding и поток событий не сжимаются.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None, gzip_level: Optional[int] = None,
+                 brotli_quality: Optional[int] = None):
+        """
+        :param app: Следующее ASGI-приложение.
+        :param minimum_size: Минимальный размер тела для сжатия (по умолчанию из настроек).
+        :param gzip_level: Уровень сжатия gzip (по умолчанию из настроек).
+        :param brotli_quality: Качество сжатия brotli (по умолчанию из настроек).
+        """
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.gzip_level = gzip_level or settings.COMPRESSION_GZIP_LEVEL
+        self.brotli_quality = brotli_quality or settings.COMPRESSION_BROTLI_QUALITY
+        self.encodings: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Заголовки отправляются вместе с первой частью тела, когда известно, сжимается ли ответ
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not self._compressible(headers) or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = self._compressor(encoding)
+                body = compressor.compress(body, finish=not more_body)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+            else:
+                body = compressor.compress(body, finish=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "").lower()
+        return ("content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+                and not content_type.startswith(EXCLUDED_TYPES))
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GzipCompressor(self.gzip_level)
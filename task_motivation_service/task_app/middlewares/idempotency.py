@@ -0,0 +1,159 @@
+import hashlib
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.database.database import async_session_maker
+from task_motivation_service.task_app.dependencies.auth_dep import decode_token
+from task_motivation_service.task_app.repositories.idempotency_repository import IdempotencyRepository
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyMiddleware:
+    """
+    Поддержка заголовка Idempotency-Key для POST-запросов на создание.
+
+    Первый запрос с ключом резервирует его и выполняется как обычно, ответ сохраняется.
+    Повтор с тем же ключом получает сохраненный ответ без обращения к предметным таблицам.
+    Пока исходный запрос выполняется, повтор получает 409; тот же ключ с другим телом — 422.
+    Ответы 5xx не сохраняются, и запрос можно повторить с тем же ключом.
+    Резерв без сохраненного ответа (например, после падения процесса) истекает через lease секунд.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str], ttl: Optional[float] = None,
+                 lease: Optional[float] = None):
+        """
+        :param app: Следующее ASGI-приложение.
+        :param paths: Пути POST-запросов, для которых поддерживается ключ идемпотентности.
+        :param ttl: Время хранения ключа в секундах.
+        :param lease: Время резерва ключа до сохранения ответа в секундах.
+        """
+        self.app = app
+        self.paths = frozenset(paths)
+        self.ttl = timedelta(seconds=ttl if ttl is not None else settings.IDEMPOTENCY_KEY_TTL)
+        self.lease = timedelta(seconds=lease if lease is not None else settings.IDEMPOTENCY_LEASE)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": "Слишком длинный ключ идемпотентности"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        # Ключ действует в пределах пути и пользователя (sub проверенного токена), а не значения куки
+        principal = self._principal(headers)
+        key = self._digest(scope["path"], principal, idempotency_key)
+        fingerprint = self._digest(body)
+
+        async with async_session_maker() as session:
+            repository = IdempotencyRepository(session)
+            reserved = await repository.reserve(key, fingerprint, self.lease)
+            stored = None if reserved else await repository.get_by_key(key)
+            await session.commit()
+
+        if not reserved:
+            await self._replay(stored, fingerprint, scope, receive, send)
+            return
+
+        status_code = 500
+        content_type = None
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message["headers"]).get("content-type")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, self._replay_body(body, receive), send_wrapper)
+        finally:
+            async with async_session_maker() as session:
+                repository = IdempotencyRepository(session)
+                if status_code < 500:
+                    await repository.save_response(key, status_code, content_type, b"".join(chunks),
+                                                   self.ttl)
+                else:
+                    await repository.release(key)
+                await session.commit()
+
+    async def _replay(self, stored, fingerprint: str, scope: Scope, receive: Receive, send: Send) -> None:
+        if stored is None or stored.status_code is None:
+            response = JSONResponse({"detail": "Запрос с этим ключом идемпотентности еще выполняется"},
+                                    status_code=409)
+        elif stored.fingerprint != fingerprint:
+            response = JSONResponse({"detail": "Ключ идемпотентности уже использован с другими данными"},
+                                    status_code=422)
+        else:
+            logger.info(f"Повтор запроса {scope['path']} по ключу идемпотентности, возвращен сохраненный ответ.")
+            response = Response(stored.body, status_code=stored.status_code, media_type=stored.content_type,
+                                headers={"Idempotent-Replayed": "true"})
+        await response(scope, receive, send)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay_body(body: bytes, receive: Receive) -> Receive:
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        return replay
+
+    @classmethod
+    def _principal(cls, headers: Headers) -> str:
+        token = cls._cookie(headers, "user_access_token")
+        if not token:
+            return ""
+        try:
+            subject = decode_token(token).get("sub")
+        except HTTPException:
+            return ""
+        return str(subject) if subject is not None else ""
+
+    @staticmethod
+    def _cookie(headers: Headers, name: str) -> str:
+        for part in headers.get("cookie", "").split(";"):
+            cookie_name, _, value = part.strip().partition("=")
+            if cookie_name == name:
+                return value
+        return ""
+
+    @staticmethod
+    def _digest(*parts) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else str(part).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
@@ -0,0 +1,29 @@
+"""task overdue sweep
+
+Revision ID: 0b5e8d2c4a71
+Revises: f2a7c6e18b49
+Create Date: 2026-10-19 14:51:39.208716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b5e8d2c4a71'
+down_revision: Union[str, None] = 'f2a7c6e18b49'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('overdue_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.create_index('ix_tasks_status_deadline', 'tasks', ['status', 'deadline', 'id'], unique=False,
+                    postgresql_where=sa.text('overdue_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_deadline', table_name='tasks')
+    op.drop_column('tasks', 'overdue_at')
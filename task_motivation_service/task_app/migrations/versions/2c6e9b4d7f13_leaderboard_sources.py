@@ -0,0 +1,30 @@
+"""leaderboard sources
+
+Revision ID: 2c6e9b4d7f13
+Revises: 8a5d3f1b6c94
+Create Date: 2026-10-19 21:05:22.194873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6e9b4d7f13'
+down_revision: Union[str, None] = '8a5d3f1b6c94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('directoryusers', sa.Column('structure_ids', postgresql.ARRAY(sa.Integer()),
+                                              server_default=sa.text("'{}'"), nullable=False))
+    op.create_index('ix_motivations_created_at', 'motivations', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_motivations_created_at', table_name='motivations')
+    op.drop_column('directoryusers', 'structure_ids')
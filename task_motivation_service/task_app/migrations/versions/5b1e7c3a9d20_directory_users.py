@@ -0,0 +1,38 @@
+"""directory users
+
+Revision ID: 5b1e7c3a9d20
+Revises: d3cd0b8b33cc
+Create Date: 2026-10-19 10:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c3a9d20'
+down_revision: Union[str, None] = 'd3cd0b8b33cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('directoryusers',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('first_name', sa.String(), nullable=False),
+    sa.Column('last_name', sa.String(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=32), nullable=False),
+    sa.Column('source_updated_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_directoryusers_source_updated_at', 'directoryusers', ['source_updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_directoryusers_source_updated_at', table_name='directoryusers')
+    op.drop_table('directoryusers')
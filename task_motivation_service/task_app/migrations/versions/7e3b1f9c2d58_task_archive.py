@@ -0,0 +1,62 @@
+"""task archive
+
+Revision ID: 7e3b1f9c2d58
+Revises: 0b5e8d2c4a71
+Create Date: 2026-10-19 16:12:05.441930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3b1f9c2d58'
+down_revision: Union[str, None] = '0b5e8d2c4a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('taskarchives',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.String(), nullable=False),
+    sa.Column('assigned_by', sa.Integer(), nullable=False),
+    sa.Column('assigned_to', sa.Integer(), nullable=False),
+    sa.Column('deadline', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('comment', sa.String(), nullable=False),
+    sa.Column('status', postgresql.ENUM('CREATED', 'IN_WORK', 'DONE', name='statusenum', create_type=False),
+              nullable=False),
+    sa.Column('overdue_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_taskarchives_assigned_to', 'taskarchives', ['assigned_to'], unique=False)
+    op.create_table('motivationarchives',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('comment', sa.String(), nullable=False),
+    sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_motivationarchives_task_id', 'motivationarchives', ['task_id'], unique=False)
+    op.create_index('ix_tasks_done_updated', 'tasks', ['updated_at', 'id'], unique=False,
+                    postgresql_where=sa.text("status = 'DONE'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_done_updated', table_name='tasks')
+    op.drop_index('ix_motivationarchives_task_id', table_name='motivationarchives')
+    op.drop_table('motivationarchives')
+    op.drop_index('ix_taskarchives_assigned_to', table_name='taskarchives')
+    op.drop_table('taskarchives')
@@ -0,0 +1,26 @@
+"""task workload index
+
+Revision ID: 8a5d3f1b6c94
+Revises: 4f9c1e7a3b62
+Create Date: 2026-10-19 20:41:09.836214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a5d3f1b6c94'
+down_revision: Union[str, None] = '4f9c1e7a3b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_assigned_to_status', 'tasks', ['assigned_to', 'status'], unique=False,
+                    postgresql_include=['deadline'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_assigned_to_status', table_name='tasks')
@@ -0,0 +1,56 @@
+"""outbox events
+
+Revision ID: a4d9e2f61b37
+Revises: 5b1e7c3a9d20
+Create Date: 2026-10-19 12:40:05.913377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e2f61b37'
+down_revision: Union[str, None] = '5b1e7c3a9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('directoryusers', sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True))
+    op.create_index('ix_directoryusers_updated_at', 'directoryusers', ['updated_at'], unique=False)
+    op.execute('CREATE SEQUENCE outboxevents_delivery_seq')
+    op.create_table('outboxevents',
+    sa.Column('event_type', sa.String(length=64), nullable=False),
+    sa.Column('aggregate_id', sa.Integer(), nullable=True),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    sa.Column('delivery_seq', sa.BigInteger(), nullable=True),
+    sa.Column('published_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outboxevents_unpublished', 'outboxevents', ['id'], unique=False,
+                    postgresql_where=sa.text('published_at IS NULL'))
+    op.create_table('consumeroffsets',
+    sa.Column('source', sa.String(length=64), nullable=False),
+    sa.Column('last_seq', sa.BigInteger(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('consumeroffsets')
+    op.drop_index('ix_outboxevents_unpublished', table_name='outboxevents')
+    op.drop_table('outboxevents')
+    op.execute('DROP SEQUENCE outboxevents_delivery_seq')
+    op.drop_index('ix_directoryusers_updated_at', table_name='directoryusers')
+    op.drop_column('directoryusers', 'deleted_at')
@@ -0,0 +1,26 @@
+"""job created by
+
+Revision ID: b6e1f3a9c284
+Revises: 2c6e9b4d7f13
+Create Date: 2026-10-20 10:16:02.348170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1f3a9c284'
+down_revision: Union[str, None] = '2c6e9b4d7f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('created_by', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'created_by')
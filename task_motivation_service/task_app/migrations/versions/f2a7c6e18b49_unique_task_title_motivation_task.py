@@ -0,0 +1,44 @@
+"""unique task title and motivation task
+
+Revision ID: f2a7c6e18b49
+Revises: c3f8a1d05e62
+Create Date: 2026-10-19 14:08:12.650117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c6e18b49'
+down_revision: Union[str, None] = 'c3f8a1d05e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Существующие дубли не дадут создать ограничения: к повторным названиям задач
+    # добавляется их id, а из нескольких оценок одной задачи остается последняя
+    op.execute("""
+        UPDATE tasks SET title = tasks.title || ' (#' || tasks.id || ')'
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY title ORDER BY id) AS position FROM tasks
+        ) AS ranked
+        WHERE ranked.id = tasks.id AND ranked.position > 1
+    """)
+    op.execute("""
+        DELETE FROM motivations
+        USING (
+            SELECT id, row_number() OVER (PARTITION BY task_id ORDER BY id DESC) AS position FROM motivations
+        ) AS ranked
+        WHERE ranked.id = motivations.id AND ranked.position > 1
+    """)
+    op.create_unique_constraint('tasks_title_key', 'tasks', ['title'])
+    op.create_unique_constraint('motivations_task_id_key', 'motivations', ['task_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('motivations_task_id_key', 'motivations', type_='unique')
+    op.drop_constraint('tasks_title_key', 'tasks', type_='unique')
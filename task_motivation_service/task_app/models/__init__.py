@@ -2,3 +2,9 @@ from task_motivation_service.task_app.database.database import Base
 from task_motivation_service.task_app.models.task_model import Task
 from task_motivation_service.task_app.models.meeteng_model import Meeting
 from task_motivation_service.task_app.models.motivation_model import Motivation
+from task_motivation_service.task_app.models.directory_model import DirectoryUser
+from task_motivation_service.task_app.models.outbox_model import OutboxEvent, ConsumerOffset
+from task_motivation_service.task_app.models.idempotency_model import IdempotencyKey
+from task_motivation_service.task_app.models.archive_model import TaskArchive, MotivationArchive
+from task_motivation_service.task_app.models.job_model import Job
+from task_motivation_service.task_app.models.revoked_token_model import RevokedToken
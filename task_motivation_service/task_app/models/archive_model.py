@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Enum, Index, Integer, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_motivation_service.task_app.database.database import Base
+from task_motivation_service.task_app.models.task_model import StatusEnum
+
+
+class TaskArchive(Base):
+    """
+    Архив завершенных задач.
+
+    Таблица секционирована по месяцу создания задачи (RANGE по created_at): секции создаются
+    при переносе задач, а старые секции отсоединяются, выгружаются в файлы и удаляются.
+    Первичный ключ секционированной таблицы обязан включать ключ секционирования.
+    """
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, primary_key=True)
+    title: Mapped[str]
+    content: Mapped[str]
+    assigned_by: Mapped[int]
+    assigned_to: Mapped[int]
+    deadline: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    comment: Mapped[str]
+    status: Mapped[StatusEnum] = mapped_column(Enum(StatusEnum, name='statusenum', create_type=False))
+    overdue_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    # Время переноса задачи в архив
+    archived_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_taskarchives_assigned_to', 'assigned_to'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+
+class MotivationArchive(Base):
+    """Архив мотиваций завершенных задач, секционированный по месяцу создания (RANGE по created_at)."""
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, primary_key=True)
+    task_id: Mapped[int]
+    rating: Mapped[int]
+    comment: Mapped[str]
+    archived_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_motivationarchives_task_id', 'task_id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import ARRAY, Integer, String, TIMESTAMP, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_motivation_service.task_app.database.database import Base
+
+
+class DirectoryUser(Base):
+    """
+    Локальная реплика справочника пользователей из сервиса пользователей.
+
+    Атрибуты:
+        id (int): Идентификатор пользователя в сервисе пользователей (не генерируется локально).
+        first_name (str): Имя пользователя.
+        last_name (str): Фамилия пользователя.
+        company_id (int): Идентификатор компании пользователя (может быть NULL).
+        status (str): Статус пользователя.
+        structure_ids (list[int]): Идентификаторы структур пользователя.
+        source_updated_at (datetime): Время последнего изменения записи в сервисе пользователей,
+            используется как курсор инкрементальной синхронизации.
+        deleted_at (datetime): Время удаления пользователя (NULL для действующих пользователей).
+    """
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    first_name: Mapped[str]
+    last_name: Mapped[str]
+    company_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    status: Mapped[str] = mapped_column(String(32))
+    structure_ids: Mapped[List[int]] = mapped_column(ARRAY(Integer), server_default=text("'{}'"))
+    source_updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        Index('ix_directoryusers_source_updated_at', 'source_updated_at', 'id'),
+        Index('ix_directoryusers_updated_at', 'updated_at'),
+    )
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
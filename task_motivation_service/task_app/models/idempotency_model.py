@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, LargeBinary, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_motivation_service.task_app.database.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Сохраненный результат запроса с заголовком Idempotency-Key.
+
+    Атрибуты:
+        key (str): Хэш ключа идемпотентности вместе с путем запроса и пользователем.
+        fingerprint (str): Хэш тела запроса, по которому выявляется повтор ключа с другими данными.
+        status_code (int): Код ответа (NULL, пока исходный запрос выполняется).
+        content_type (str): Тип содержимого сохраненного ответа.
+        body (bytes): Тело сохраненного ответа.
+        expires_at (datetime): Время, после которого ключ можно использовать повторно.
+    """
+
+    key: Mapped[str] = mapped_column(String(64), unique=True)
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[Optional[int]] = mapped_column(nullable=True)
+    content_type: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP)
+
+    __table_args__ = (
+        Index('ix_idempotencykeys_expires_at', 'expires_at'),
+    )
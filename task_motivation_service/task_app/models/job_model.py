@@ -0,0 +1,64 @@
+import enum
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Enum, Index, String, Text, TIMESTAMP, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_motivation_service.task_app.database.database import Base
+
+
+class JobStatusEnum(enum.Enum):
+    """
+    Перечисление состояний фоновой задачи.
+
+    Состояния:
+        PENDING: Ожидает выполнения.
+        RUNNING: Выполняется.
+        DONE: Успешно завершена.
+        FAILED: Завершена с ошибкой.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """
+    Фоновая задача, которая выполняется вне обработки запроса.
+
+    Атрибуты:
+        kind (str): Тип задачи, по которому выбирается обработчик.
+        status (JobStatusEnum): Текущее состояние.
+        payload (dict): Параметры задачи.
+        result (dict): Прогресс или результат выполнения.
+        error (str): Текст последней ошибки.
+        attempts (int): Количество запусков.
+        max_attempts (int): Максимальное количество запусков, после которого задача считается неудавшейся.
+        run_at (datetime): Время, раньше которого задача не запускается (отложенный повтор после ошибки).
+        started_at (datetime): Время последнего запуска.
+        finished_at (datetime): Время завершения.
+        created_by (int): Пользователь, поставивший задачу (None — системная задача).
+    """
+
+    kind: Mapped[str] = mapped_column(String(64))
+    status: Mapped[JobStatusEnum] = mapped_column(Enum(JobStatusEnum, name='jobstatusenum', create_type=True),
+                                                  default=JobStatusEnum.PENDING)
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict)
+    result: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(default=5)
+    run_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    created_by: Mapped[Optional[int]] = mapped_column(nullable=True)
+
+    __table_args__ = (
+        # Выбор очередной задачи: в индекс попадают только незавершенные
+        Index('ix_jobs_status_run_at', 'status', 'run_at', 'id',
+              postgresql_where=text("status IN ('PENDING', 'RUNNING')")),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from sqlalchemy import TIMESTAMP, func
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from task_motivation_service.task_app.database.database import Base
@@ -8,9 +8,14 @@ from task_motivation_service.task_app.database.database import Base
 
 class Motivation(Base):
 
-    task_id: Mapped[int] = mapped_column(ForeignKey('tasks.id'))
+    task_id: Mapped[int] = mapped_column(ForeignKey('tasks.id'), unique=True)
     rating: Mapped[int]  # Рейтинг выполнения задачи (например, от 1 до 5)
     comment: Mapped[str]  # Комментарий к оценке
 
     # Связь с моделью Task
     task: Mapped["Task"] = relationship("Task", back_populates="motivations")
+
+    __table_args__ = (
+        # Оценки за период для пересчета рейтингов
+        Index('ix_motivations_created_at', 'created_at'),
+    )
@@ -1,7 +1,8 @@
 import enum
 from datetime import datetime, timezone
+from typing import Optional
 
-from sqlalchemy import Enum, TIMESTAMP, func
+from sqlalchemy import Enum, Index, TIMESTAMP, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from task_motivation_service.task_app.database.database import Base
@@ -23,7 +24,7 @@ class StatusEnum(enum.Enum):
 
 class Task(Base):
 
-    title: Mapped[str]
+    title: Mapped[str] = mapped_column(unique=True)
     content: Mapped[str]
     assigned_by: Mapped[int]
     assigned_to: Mapped[int]
@@ -31,6 +32,17 @@ class Task(Base):
     comment: Mapped[str]
     status: Mapped[StatusEnum] = mapped_column(Enum(StatusEnum, name='statusenum', create_type=True),
                                                default=StatusEnum.CREATED)
+    # Время, когда задача была отмечена просроченной (NULL — не просрочена или еще не обработана)
+    overdue_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
 
     # Связь с моделью Motivation
     motivations: Mapped[list] = relationship("Motivation", back_populates="task")
+
+    __table_args__ = (
+        # Поиск незавершенных задач с наступившим сроком; отмеченные задачи в индекс не входят
+        Index('ix_tasks_status_deadline', 'status', 'deadline', 'id', postgresql_where=text('overdue_at IS NULL')),
+        # Поиск завершенных задач для переноса в архив
+        Index('ix_tasks_done_updated', 'updated_at', 'id', postgresql_where=text("status = 'DONE'")),
+        # Нагрузка исполнителей по статусам: покрывающий индекс для подсчета без чтения таблицы
+        Index('ix_tasks_assigned_to_status', 'assigned_to', 'status', postgresql_include=['deadline']),
+    )
@@ -0,0 +1,171 @@
+import gzip
+import re
+from datetime import date
+from typing import Iterable, List, Tuple
+
+from loguru import logger
+from sqlalchemy import delete as sqlalchemy_delete, func, insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from task_motivation_service.task_app.models.archive_model import MotivationArchive, TaskArchive
+from task_motivation_service.task_app.models.motivation_model import Motivation
+from task_motivation_service.task_app.models.task_model import Task
+from task_motivation_service.task_app.repositories.base_repository import BaseRepository
+
+# Ключ advisory-блокировки, под которой работает архивация (перенос строк и операции с секциями)
+ARCHIVE_LOCK_KEY = 727002
+
+# Секции называются <таблица>_<год>_<месяц>, например taskarchives_2025_01
+PARTITION_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    """Возвращает первый день месяца."""
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    """Возвращает первый день следующего месяца."""
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+class ArchiveRepository(BaseRepository):
+    """
+    Базовый репозиторий архивной таблицы, секционированной по месяцу создания записи.
+
+    Строки переносятся из рабочей таблицы source одним запросом (DELETE ... RETURNING внутри
+    INSERT ... SELECT), поэтому запись всегда находится ровно в одной из таблиц.
+    """
+    model = None
+    source = None
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__
+
+    async def try_lock(self) -> bool:
+        """
+        Пытается получить advisory-блокировку архивации до конца текущей транзакции.
+
+        :return: True, если блокировка получена.
+        """
+        result = await self._session.execute(select(func.pg_try_advisory_xact_lock(ARCHIVE_LOCK_KEY)))
+        return bool(result.scalar())
+
+    async def ensure_partitions(self, months: Iterable[date]) -> None:
+        """
+        Создает месячные секции архива, если их еще нет.
+
+        :param months: Даты, месяцы которых должны быть покрыты секциями.
+        """
+        for month in sorted({month_start(value) for value in months}):
+            partition = f"{self.table_name}_{month:%Y_%m}"
+            await self._session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {self.table_name} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+            ))
+
+    async def list_partitions(self) -> List[Tuple[str, date]]:
+        """
+        Возвращает секции архива с месяцами, которые они покрывают, от старых к новым.
+
+        :return: Список пар (имя секции, первый день месяца).
+        """
+        result = await self._session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": self.table_name},
+        )
+        partitions = []
+        for name in result.scalars().all():
+            match = PARTITION_SUFFIX.search(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    async def export_partition(self, partition: str, path: str) -> None:
+        """
+        Отсоединяет секцию, выгружает ее в сжатый CSV-файл и удаляет.
+
+        Все шаги выполняются в текущей транзакции: при ошибке выгрузки секция остается на месте.
+
+        :param partition: Имя секции.
+        :param path: Путь к файлу выгрузки (.csv.gz).
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        try:
+            await self._session.execute(text(f"ALTER TABLE {self.table_name} DETACH PARTITION {partition}"))
+            connection = await self._session.connection()
+            raw_connection = await connection.get_raw_connection()
+            with gzip.open(path, "wb") as file:
+                await raw_connection.driver_connection.copy_from_table(partition, output=file, format="csv",
+                                                                       header=True)
+            await self._session.execute(text(f"DROP TABLE {partition}"))
+            logger.info(f"Секция {partition} выгружена в {path} и удалена.")
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при выгрузке секции {partition}: {e}")
+            raise
+
+    async def _move(self, condition) -> int:
+        """
+        Переносит строки рабочей таблицы, подходящие под условие, в архив.
+
+        :param condition: Условие отбора строк рабочей таблицы.
+        :return: Количество перенесенных строк.
+        """
+        columns = [column.name for column in self.source.__table__.columns]
+        moved = (
+            sqlalchemy_delete(self.source.__table__)
+            .where(condition)
+            .returning(*self.source.__table__.columns)
+            .cte("moved")
+        )
+        result = await self._session.execute(
+            insert(self.model.__table__)
+            .from_select(columns, select(*[moved.c[name] for name in columns]))
+        )
+        return result.rowcount
+
+
+class TaskArchiveRepository(ArchiveRepository):
+    model = TaskArchive
+    source = Task
+
+    async def archive_tasks(self, task_ids: List[int]) -> int:
+        """
+        Переносит задачи в архив.
+
+        :param task_ids: Идентификаторы задач (мотивации задач должны быть перенесены раньше).
+        :return: Количество перенесенных задач.
+        """
+        return await self._move(Task.id.in_(task_ids))
+
+
+class MotivationArchiveRepository(ArchiveRepository):
+    model = MotivationArchive
+    source = Motivation
+
+    async def get_months(self, task_ids: List[int]) -> List[date]:
+        """
+        Возвращает месяцы создания мотиваций задач, чтобы заранее создать для них секции.
+
+        :param task_ids: Идентификаторы задач.
+        :return: Первые дни месяцев.
+        """
+        result = await self._session.execute(
+            select(func.date_trunc('month', Motivation.created_at)).where(Motivation.task_id.in_(task_ids)).distinct()
+        )
+        return [value.date() for value in result.scalars().all()]
+
+    async def archive_for_tasks(self, task_ids: List[int]) -> int:
+        """
+        Переносит в архив мотивации задач.
+
+        :param task_ids: Идентификаторы задач.
+        :return: Количество перенесенных мотиваций.
+        """
+        return await self._move(Motivation.task_id.in_(task_ids))
@@ -1,11 +1,14 @@
 from abc import abstractmethod, ABC
-from typing import List, TypeVar, Type
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Type
 from pydantic import BaseModel
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.future import select
-from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, func, insert
+from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, func, insert, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
+from task_motivation_service.task_app.core.loader import clear_loader, get_loader
+from task_motivation_service.task_app.core.loading import LoadingProfiles, load_options
 from task_motivation_service.task_app.database.database import Base
 
 T = TypeVar("T", bound=Base)
@@ -41,19 +44,30 @@ class SqlAlchemyRepository(AbstractRepository):
 
 class BaseRepository(SqlAlchemyRepository):
     model: Type[T] = None
+    # Профили загрузки связей, доступные через параметр include
+    loading_profiles: LoadingProfiles = {}
+    # Колонки, доступные для выборки через параметр fields
+    selectable_fields: Tuple[str, ...] = ()
 
-    async def find_one_or_none_by_id(self, data_id: int):
+    async def find_one_or_none_by_id(self, data_id: int, include: Sequence[str] = ()):
         """
         Ищет запись в базе данных по заданному идентификатору.
 
+        Поиски без include, выполненные в одном проходе цикла событий (например, через asyncio.gather),
+        объединяются в один запрос, а найденные записи запоминаются до конца запроса или до изменения
+        данных репозиторием.
+
         :param data_id: Идентификатор записи для поиска.
+        :param include: Профили загрузки связей (см. loading_profiles).
         :return: Найденная запись или None, если запись не найдена.
         :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
         """
         try:
-            query = select(self.model).filter_by(id=data_id)
-            result = await self._session.execute(query)
-            record = result.scalar_one_or_none()
+            if include:
+                records = await self.find_many_by_ids([data_id], include)
+                record = records.get(data_id)
+            else:
+                record = await get_loader(self._session, type(self), self.find_many_by_ids).load(data_id)
             log_message = f"Запись {self.model.__name__} с ID {data_id} {'найдена' if record else 'не найдена'}."
             logger.info(log_message)
             return record
@@ -61,6 +75,91 @@ class BaseRepository(SqlAlchemyRepository):
             logger.error(f"Ошибка при поиске записи с ID {data_id}: {e}")
             raise
 
+    async def find_many_by_ids(self, data_ids: Iterable[int], include: Sequence[str] = ()) -> Dict[int, T]:
+        """
+        Ищет записи по списку идентификаторов одним запросом (WHERE id = ANY(:ids)).
+
+        :param data_ids: Идентификаторы записей.
+        :param include: Профили загрузки связей.
+        :return: Словарь идентификатор -> запись для найденных записей.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        data_ids = list(dict.fromkeys(data_ids))
+        try:
+            query = select(self.model).where(
+                self.model.id == any_(bindparam("data_ids", data_ids, type_=ARRAY(self.model.id.type)))
+            ).options(*load_options(self.loading_profiles, include))
+            result = await self._session.execute(query)
+            records = {record.id: record for record in result.scalars().all()}
+            logger.info(f"Найдено {len(records)} из {len(data_ids)} записей {self.model.__name__} по ID.")
+            return records
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при поиске записей по ID {data_ids}: {e}")
+            raise
+
+    async def load_many(self, data_ids: List[int]) -> List[T | None]:
+        """
+        Возвращает записи по идентификаторам в том же порядке (None для ненайденных).
+
+        Использует тот же загрузчик, что и find_one_or_none_by_id: уже загруженные в запросе записи
+        повторно не запрашиваются, остальные загружаются одним запросом.
+
+        :param data_ids: Идентификаторы записей.
+        :return: Список записей.
+        """
+        return await get_loader(self._session, type(self), self.find_many_by_ids).load_many(data_ids)
+
+    def _clear_loader(self) -> None:
+        """Сбрасывает запомненные записи репозитория после изменения данных."""
+        clear_loader(self._session, type(self))
+
+    def _projection(self, fields: Sequence[str]) -> list:
+        """Колонки выборки: id и запрошенные поля без повторов."""
+        return [getattr(self.model, name) for name in dict.fromkeys(("id", *fields))]
+
+    async def find_fields_by_id(self, data_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Ищет запись по идентификатору и возвращает только запрошенные колонки.
+
+        Запрос выбирает лишь эти колонки, а результат собирается из строки выборки без создания
+        объекта модели.
+
+        :param data_id: Идентификатор записи для поиска.
+        :param fields: Имена колонок (id добавляется всегда).
+        :return: Словарь колонка -> значение или None, если запись не найдена.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        try:
+            query = select(*self._projection(fields)).where(self.model.id == data_id)
+            row = (await self._session.execute(query)).first()
+            logger.info(f"Запись {self.model.__name__} с ID {data_id} {'найдена' if row else 'не найдена'} "
+                        f"(поля: {', '.join(fields)}).")
+            return row._asdict() if row else None
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при поиске записи с ID {data_id}: {e}")
+            raise
+
+    async def find_all_fields(self, fields: Sequence[str], filters: BaseModel | None = None) -> List[Dict[str, Any]]:
+        """
+        Ищет все записи по заданным фильтрам и возвращает только запрошенные колонки.
+
+        :param fields: Имена колонок (id добавляется всегда).
+        :param filters: Фильтры для поиска записей (по умолчанию None).
+        :return: Список словарей колонка -> значение.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        logger.info(f"Поиск всех записей {self.model.__name__} по фильтрам: {filter_dict}, поля: {list(fields)}")
+        try:
+            query = select(*self._projection(fields)).filter_by(**filter_dict)
+            result = await self._session.execute(query)
+            records = [row._asdict() for row in result]
+            logger.info(f"Найдено {len(records)} записей.")
+            return records
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при поиске всех записей по фильтрам {filter_dict}: {e}")
+            raise
+
     async def find_one_or_none(self, filters: BaseModel):
         """
         Ищет одну запись в базе данных по заданным фильтрам.
@@ -82,18 +181,22 @@ class BaseRepository(SqlAlchemyRepository):
             logger.error(f"Ошибка при поиске записи по фильтрам {filter_dict}: {e}")
             raise
 
-    async def find_all(self, filters: BaseModel | None = None):
+    async def find_all(self, filters: BaseModel | None = None, include: Sequence[str] = ()):
         """
         Ищет все записи в базе данных, соответствующие заданным фильтрам.
 
         :param filters: Фильтры для поиска записей (по умолчанию None).
+        :param include: Профили загрузки связей (см. loading_profiles).
         :return: Список найденных записей.
         :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
         """
         filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
         logger.info(f"Поиск всех записей {self.model.__name__} по фильтрам: {filter_dict}")
         try:
-            query = select(self.model).filter_by(**filter_dict)
+            query = (
+                select(self.model).filter_by(**filter_dict)
+                .options(*load_options(self.loading_profiles, include))
+            )
             result = await self._session.execute(query)
             records = result.scalars().all()
             logger.info(f"Найдено {len(records)} записей.")
@@ -113,6 +216,7 @@ class BaseRepository(SqlAlchemyRepository):
         values_dict = values.model_dump(exclude_unset=True)
         logger.info(f"Добавление записи {self.model.__name__} с параметрами: {values_dict}")
         try:
+            self._clear_loader()
             new_instance = self.model(**values_dict)
             self._session.add(new_instance)
             logger.info(f"Запись {self.model.__name__} успешно добавлена.")
@@ -122,6 +226,36 @@ class BaseRepository(SqlAlchemyRepository):
             logger.error(f"Ошибка при добавлении записи: {e}")
             raise
 
+    async def insert_or_conflict(self, values: BaseModel, conflict_columns: List[str]):
+        """
+        Добавляет запись одним запросом INSERT ... ON CONFLICT DO NOTHING.
+
+        Заменяет проверку существования перед вставкой: конфликт по уникальному ограничению
+        определяется самой базой, без гонки между параллельными запросами.
+
+        :param values: Данные для добавления, представленные в виде Pydantic-модели.
+        :param conflict_columns: Колонки уникального ограничения, по которому определяется конфликт.
+        :return: Добавленная запись или None, если запись с такими значениями уже существует.
+        :raises SQLAlchemyError: Если возникает ошибка при добавлении записи.
+        """
+        values_dict = values.model_dump(exclude_unset=True)
+        logger.info(f"Добавление записи {self.model.__name__} без конфликта по {conflict_columns}: {values_dict}")
+        try:
+            self._clear_loader()
+            query = (
+                pg_insert(self.model)
+                .values(**values_dict)
+                .on_conflict_do_nothing(index_elements=conflict_columns)
+                .returning(self.model)
+            )
+            result = await self._session.execute(query)
+            record = result.scalar_one_or_none()
+            logger.info(f"Запись {self.model.__name__} {'добавлена' if record else 'уже существует'}.")
+            return record
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при добавлении записи: {e}")
+            raise
+
     async def add_many(self, instances: List[BaseModel]):
         """
         Добавляет несколько записей в базу данных.
@@ -133,6 +267,7 @@ class BaseRepository(SqlAlchemyRepository):
         values_list = [item.model_dump(exclude_unset=True) for item in instances]
         logger.info(f"Добавление нескольких записей {self.model.__name__}. Количество: {len(values_list)}")
         try:
+            self._clear_loader()
             new_instances = [self.model(**values) for values in values_list]
             self._session.add_all(new_instances)
             logger.info(f"Успешно добавлено {len(new_instances)} записей.")
@@ -156,6 +291,7 @@ class BaseRepository(SqlAlchemyRepository):
         logger.info(
             f"Обновление записей {self.model.__name__} по фильтру: {filter_dict} с параметрами: {values_dict}")
         try:
+            self._clear_loader()
             query = (
                 sqlalchemy_update(self.model)
                 .where(*[getattr(self.model, k) == v for k, v in filter_dict.items()])
@@ -185,6 +321,7 @@ class BaseRepository(SqlAlchemyRepository):
             logger.error("Нужен хотя бы один фильтр для удаления.")
             raise ValueError("Нужен хотя бы один фильтр для удаления.")
         try:
+            self._clear_loader()
             query = sqlalchemy_delete(self.model).filter_by(**filter_dict)
             result = await self._session.execute(query)
             logger.info(f"Удалено {result.rowcount} записей.")
@@ -194,6 +331,65 @@ class BaseRepository(SqlAlchemyRepository):
             logger.error(f"Ошибка при удалении записей: {e}")
             raise
 
+    async def update_returning(self, filters: BaseModel, values: BaseModel) -> List[T]:
+        """
+        Обновляет записи по заданным фильтрам и возвращает их новое состояние одним запросом (UPDATE ... RETURNING).
+
+        :param filters: Фильтры для поиска записей, которые нужно обновить.
+        :param values: Новые значения для обновления, представленные в виде Pydantic-модели.
+        :return: Список обновленных записей (пустой, если ничего не обновлено).
+        :raises SQLAlchemyError: Если возникает ошибка при обновлении записей.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True)
+        values_dict = values.model_dump(exclude_unset=True)
+        logger.info(
+            f"Обновление записей {self.model.__name__} по фильтру: {filter_dict} с параметрами: {values_dict}")
+        try:
+            self._clear_loader()
+            query = (
+                sqlalchemy_update(self.model)
+                .where(*[getattr(self.model, k) == v for k, v in filter_dict.items()])
+                .values(**values_dict)
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            result = await self._session.execute(query)
+            records = result.scalars().all()
+            logger.info(f"Обновлено {len(records)} записей.")
+            return records
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при обновлении записей: {e}")
+            raise
+
+    async def delete_returning(self, filters: BaseModel) -> List[dict]:
+        """
+        Удаляет записи по заданным фильтрам и возвращает их последнее состояние (DELETE ... RETURNING).
+
+        :param filters: Фильтры для поиска записей, которые нужно удалить.
+        :return: Список словарей со значениями колонок удаленных записей.
+        :raises ValueError: Если не указаны фильтры для удаления.
+        :raises SQLAlchemyError: Если возникает ошибка при удалении записей.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True)
+        logger.info(f"Удаление записей {self.model.__name__} по фильтру: {filter_dict}")
+        if not filter_dict:
+            logger.error("Нужен хотя бы один фильтр для удаления.")
+            raise ValueError("Нужен хотя бы один фильтр для удаления.")
+        try:
+            self._clear_loader()
+            query = (
+                sqlalchemy_delete(self.model.__table__)
+                .where(*[self.model.__table__.c[k] == v for k, v in filter_dict.items()])
+                .returning(*self.model.__table__.c)
+            )
+            result = await self._session.execute(query)
+            records = [dict(row) for row in result.mappings().all()]
+            logger.info(f"Удалено {len(records)} записей.")
+            return records
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при удалении записей: {e}")
+            raise
+
     async def count(self, filters: BaseModel | None = None):
         """
         Подсчитывает количество записей в базе данных по заданным фильтрам.
@@ -224,6 +420,7 @@ class BaseRepository(SqlAlchemyRepository):
         """
         logger.info(f"Массовое обновление записей {self.model.__name__}")
         try:
+            self._clear_loader()
             updated_count = 0
             for record in records:
                 record_dict = record.model_dump(exclude_unset=True)
@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import func, select, update as sqlalchemy_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from task_motivation_service.task_app.models.directory_model import DirectoryUser
+from task_motivation_service.task_app.repositories.base_repository import BaseRepository
+from task_motivation_service.task_app.schemas.directory_schema import SDirectoryUser
+
+
+class DirectoryUserRepository(BaseRepository):
+    model = DirectoryUser
+
+    async def upsert_many(self, records: List[SDirectoryUser]) -> int:
+        """
+        Вставляет или обновляет записи реплики одним запросом.
+
+        Более старая версия записи не перезаписывает более новую.
+
+        :param records: Записи справочника пользователей.
+        :return: Количество обработанных записей.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        if not records:
+            return 0
+        values = [record.model_dump() for record in records]
+        logger.info(f"Синхронизация {len(values)} записей {self.model.__name__}")
+        try:
+            self._clear_loader()
+            stmt = pg_insert(self.model).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[self.model.id],
+                set_={
+                    'first_name': stmt.excluded.first_name,
+                    'last_name': stmt.excluded.last_name,
+                    'company_id': stmt.excluded.company_id,
+                    'status': stmt.excluded.status,
+                    'structure_ids': stmt.excluded.structure_ids,
+                    'source_updated_at': stmt.excluded.source_updated_at,
+                    'updated_at': func.now(),
+                },
+                where=self.model.source_updated_at <= stmt.excluded.source_updated_at,
+            )
+            result = await self._session.execute(stmt)
+            await self._session.flush()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при синхронизации записей: {e}")
+            raise
+
+    async def get_sync_cursor(self) -> Optional[datetime]:
+        """
+        Возвращает время самого свежего изменения, уже отраженного в реплике.
+
+        :return: Курсор синхронизации или None, если реплика пуста.
+        """
+        result = await self._session.execute(select(func.max(self.model.source_updated_at)))
+        return result.scalar()
+
+    async def find_changed_locally(self, since: Optional[datetime]):
+        """
+        Ищет записи реплики, измененные в локальной таблице после указанного времени (включая удаленные).
+
+        :param since: Время локального изменения (None — все действующие записи).
+        :return: Список записей реплики.
+        """
+        query = select(self.model)
+        if since is None:
+            query = query.where(self.model.deleted_at.is_(None))
+        else:
+            query = query.where(self.model.updated_at > since)
+        result = await self._session.execute(query)
+        return result.scalars().all()
+
+    async def mark_deleted(self, user_id: int) -> int:
+        """
+        Помечает пользователя удаленным, чтобы все процессы исключили его из справочника.
+
+        :param user_id: Идентификатор пользователя.
+        :return: Количество обновленных записей.
+        """
+        self._clear_loader()
+        result = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id == user_id)
+            .values(deleted_at=func.now(), updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -0,0 +1,97 @@
+from datetime import timedelta
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import delete as sqlalchemy_delete, func, select, update as sqlalchemy_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from task_motivation_service.task_app.models.idempotency_model import IdempotencyKey
+from task_motivation_service.task_app.repositories.base_repository import BaseRepository
+
+
+class IdempotencyRepository(BaseRepository):
+    model = IdempotencyKey
+
+    async def reserve(self, key: str, fingerprint: str, lease: timedelta) -> bool:
+        """
+        Резервирует ключ идемпотентности за текущим запросом.
+
+        Просроченный ключ перезаписывается, действующий остается без изменений. Резерв действует
+        lease, а полный срок хранения ключ получает вместе с сохраненным ответом.
+
+        :param key: Хэш ключа идемпотентности.
+        :param fingerprint: Хэш тела запроса.
+        :param lease: Время резерва ключа до сохранения ответа.
+        :return: True, если ключ зарезервирован этим запросом.
+        """
+        stmt = pg_insert(self.model).values(key=key, fingerprint=fingerprint, expires_at=func.now() + lease)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.key],
+            set_={
+                'fingerprint': stmt.excluded.fingerprint,
+                'status_code': None,
+                'content_type': None,
+                'body': None,
+                'expires_at': stmt.excluded.expires_at,
+                'updated_at': func.now(),
+            },
+            where=self.model.expires_at < func.now(),
+        ).returning(self.model.id)
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def get_by_key(self, key: str) -> Optional[IdempotencyKey]:
+        """
+        Возвращает сохраненную запись ключа идемпотентности.
+
+        :param key: Хэш ключа идемпотентности.
+        :return: Запись или None, если ключ не найден.
+        """
+        result = await self._session.execute(select(self.model).where(self.model.key == key))
+        return result.scalar_one_or_none()
+
+    async def save_response(self, key: str, status_code: int, content_type: Optional[str], body: bytes,
+                            ttl: timedelta) -> None:
+        """
+        Сохраняет ответ на запрос, за которым зарезервирован ключ, и продлевает ключ на время хранения.
+
+        :param key: Хэш ключа идемпотентности.
+        :param status_code: Код ответа.
+        :param content_type: Тип содержимого ответа.
+        :param body: Тело ответа.
+        :param ttl: Время хранения ключа.
+        """
+        await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.key == key)
+            .values(status_code=status_code, content_type=content_type, body=body,
+                    expires_at=func.now() + ttl)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def release(self, key: str) -> None:
+        """
+        Снимает резерв ключа, чтобы запрос можно было повторить.
+
+        :param key: Хэш ключа идемпотентности.
+        """
+        await self._session.execute(
+            sqlalchemy_delete(self.model)
+            .where(self.model.key == key)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def purge_expired(self) -> int:
+        """
+        Удаляет просроченные ключи идемпотентности.
+
+        :return: Количество удаленных ключей.
+        """
+        result = await self._session.execute(
+            sqlalchemy_delete(self.model)
+            .where(self.model.expires_at < func.now())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            logger.info(f"Удалено {result.rowcount} просроченных ключей идемпотентности.")
+        return result.rowcount
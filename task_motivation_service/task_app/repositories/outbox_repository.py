@@ -0,0 +1,178 @@
+import json
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from loguru import logger
+from sqlalchemy import delete as sqlalchemy_delete, func, insert, select, text, update as sqlalchemy_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from task_motivation_service.task_app.core.pubsub import EVENTS_CHANNEL, NOTIFY_PAYLOAD_LIMIT
+from task_motivation_service.task_app.models.outbox_model import ConsumerOffset, OutboxEvent, delivery_seq
+from task_motivation_service.task_app.repositories.base_repository import BaseRepository
+
+# Ключ advisory-блокировки, под которой работает ретранслятор outbox
+OUTBOX_RELAY_LOCK_KEY = 727001
+
+
+class OutboxRepository(BaseRepository):
+    model = OutboxEvent
+
+    async def add_event(self, event_type: str, aggregate_id: Optional[int], payload: dict,
+                        audience: Iterable[int] = ()) -> None:
+        """
+        Записывает событие в outbox в текущей транзакции.
+
+        :param event_type: Тип события.
+        :param aggregate_id: Идентификатор измененной сущности.
+        :param payload: Данные события (JSON-сериализуемый словарь).
+        :param audience: Пользователи, которым событие отправляется в канал уведомлений.
+        """
+        await self.add_events([
+            {"event_type": event_type, "aggregate_id": aggregate_id, "payload": payload, "audience": audience}
+        ])
+
+    async def add_events(self, events: List[dict]) -> None:
+        """
+        Записывает несколько событий в outbox одним запросом в текущей транзакции.
+
+        События с непустым audience дополнительно публикуются в канал NOTIFY; Postgres доставляет
+        их слушателям только после фиксации транзакции, поэтому откаченные изменения не уходят клиентам.
+
+        :param events: Словари с ключами event_type, aggregate_id, payload и необязательным audience.
+        """
+        if not events:
+            return
+        logger.info(f"События outbox: {', '.join(event['event_type'] for event in events)}")
+        rows = [{key: event[key] for key in ("event_type", "aggregate_id", "payload")} for event in events]
+        result = await self._session.execute(
+            insert(self.model).returning(self.model.id, sort_by_parameter_order=True), rows
+        )
+        messages = []
+        for event_id, event in zip(result.scalars().all(), events):
+            audience = sorted(set(event.get("audience") or ()))
+            if audience:
+                messages.append(self._notify_message(event_id, event, audience))
+        if messages:
+            await self._session.execute(
+                text("SELECT pg_notify(:channel, message) FROM unnest(CAST(:messages AS text[])) AS message"),
+                {"channel": EVENTS_CHANNEL, "messages": messages},
+            )
+
+    @staticmethod
+    def _notify_message(event_id: int, event: dict, audience: List[int]) -> str:
+        message = {"id": event_id, "event_type": event["event_type"], "aggregate_id": event["aggregate_id"],
+                   "users": audience, "payload": event["payload"]}
+        data = json.dumps(message, ensure_ascii=False, default=str)
+        if len(data.encode()) > NOTIFY_PAYLOAD_LIMIT:
+            # Крупные данные в уведомление не помещаются — клиент получит только факт изменения
+            message["payload"] = None
+            data = json.dumps(message, ensure_ascii=False, default=str)
+        return data
+
+    async def try_lock_relay(self) -> bool:
+        """
+        Пытается захватить блокировку ретранслятора на соединение сессии.
+
+        Блокировка переживает фиксацию транзакций и снимается unlock_relay или при разрыве соединения,
+        поэтому сессия должна быть привязана к выделенному соединению.
+
+        :return: True, если блокировка получена и этот процесс может публиковать события.
+        """
+        result = await self._session.execute(select(func.pg_try_advisory_lock(OUTBOX_RELAY_LOCK_KEY)))
+        return bool(result.scalar())
+
+    async def unlock_relay(self) -> None:
+        """Снимает блокировку ретранслятора."""
+        await self._session.execute(select(func.pg_advisory_unlock(OUTBOX_RELAY_LOCK_KEY)))
+
+    async def claim_batch(self, limit: int) -> List[OutboxEvent]:
+        """
+        Выбирает пачку неопубликованных событий в порядке номеров доставки.
+
+        Номер доставки назначается событию один раз, в порядке id: событие, доставка которого
+        не подтверждена, отправляется повторно с тем же номером, и получатель отсекает его по смещению.
+        Вызывается только под блокировкой ретранслятора.
+
+        :param limit: Максимальный размер пачки.
+        :return: События пачки, упорядоченные по номеру доставки.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        try:
+            fresh = (
+                select(self.model.id)
+                .where(self.model.published_at.is_(None), self.model.delivery_seq.is_(None))
+                .order_by(self.model.id)
+                .limit(limit)
+                .subquery()
+            )
+            numbered = select(fresh.c.id, delivery_seq.next_value().label("seq")).subquery()
+            await self._session.execute(
+                sqlalchemy_update(self.model)
+                .where(self.model.id == numbered.c.id)
+                .values(delivery_seq=numbered.c.seq)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self._session.execute(
+                select(self.model)
+                .where(self.model.published_at.is_(None), self.model.delivery_seq.is_not(None))
+                .order_by(self.model.delivery_seq)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при выборке событий outbox: {e}")
+            raise
+
+    async def mark_published(self, event_ids: List[int]) -> None:
+        """Отмечает события опубликованными."""
+        await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id.in_(event_ids))
+            .values(published_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def prune_published(self, older_than: timedelta) -> int:
+        """
+        Удаляет давно опубликованные события.
+
+        :param older_than: Возраст публикации, после которого событие удаляется.
+        :return: Количество удаленных событий.
+        """
+        result = await self._session.execute(
+            sqlalchemy_delete(self.model)
+            .where(self.model.published_at < datetime.utcnow() - older_than)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+class ConsumerOffsetRepository(BaseRepository):
+    model = ConsumerOffset
+
+    async def lock_offset(self, source: str) -> int:
+        """
+        Возвращает смещение источника, блокируя его строку до конца транзакции.
+
+        :param source: Имя сервиса-источника.
+        :return: Последний обработанный номер доставки.
+        """
+        await self._session.execute(
+            pg_insert(self.model).values(source=source, last_seq=0).on_conflict_do_nothing(
+                index_elements=[self.model.source]
+            )
+        )
+        result = await self._session.execute(
+            select(self.model.last_seq).where(self.model.source == source).with_for_update()
+        )
+        return result.scalar_one()
+
+    async def set_offset(self, source: str, last_seq: int) -> None:
+        """Сдвигает смещение источника."""
+        await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.source == source)
+            .values(last_seq=last_seq)
+            .execution_options(synchronize_session=False)
+        )
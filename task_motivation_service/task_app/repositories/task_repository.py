@@ -1,20 +1,237 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import (ARRAY, Integer, any_, bindparam, case, delete as sqlalchemy_delete, func, literal, or_, select,
+                        tuple_, update as sqlalchemy_update)
+from sqlalchemy.orm import selectinload
+
 from task_motivation_service.task_app.models import Task
-from task_motivation_service.task_app.models.meeteng_model import Meeting, Participant
+from task_motivation_service.task_app.models.meeteng_model import Meeting, Participant, meeting_participant
 from task_motivation_service.task_app.models.motivation_model import Motivation
+from task_motivation_service.task_app.models.task_model import StatusEnum
 from task_motivation_service.task_app.repositories.base_repository import BaseRepository
 
 
 class TaskRepository(BaseRepository):
     model = Task
+    selectable_fields = ('id', 'title', 'content', 'assigned_by', 'assigned_to', 'deadline', 'comment', 'status',
+                         'overdue_at', 'created_at', 'updated_at')
+
+    async def update_task_returning(self, task_id: int, values: BaseModel) -> Optional[Task]:
+        """
+        Обновляет задачу и возвращает ее новое состояние.
+
+        Если меняется статус или срок, отметка просрочки снимается, чтобы обходчик сроков
+        заново оценил задачу; при прочих изменениях отметка сохраняется.
+
+        :param task_id: Идентификатор задачи.
+        :param values: Новые значения, представленные в виде Pydantic-модели.
+        :return: Обновленная задача или None, если задача не найдена.
+        """
+        values_dict = values.model_dump(exclude_unset=True)
+        changed = [getattr(self.model, column).is_distinct_from(values_dict[column])
+                   for column in ('status', 'deadline') if column in values_dict]
+        if changed:
+            # В SET справа видны прежние значения строки
+            values_dict['overdue_at'] = case((or_(*changed), None), else_=self.model.overdue_at)
+        logger.info(f"Обновление задачи {task_id} с параметрами: {values_dict}")
+        self._clear_loader()
+        result = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id == task_id)
+            .values(**values_dict)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def reassign_open_tasks(self, user_id: int) -> int:
+        """
+        Передает незавершенные задачи пользователя их постановщикам.
+
+        :param user_id: Идентификатор исполнителя.
+        :return: Количество переназначенных задач.
+        """
+        self._clear_loader()
+        result = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.assigned_to == user_id, self.model.status != StatusEnum.DONE)
+            .values(assigned_to=self.model.assigned_by)
+            .execution_options(synchronize_session=False)
+        )
+        logger.info(f"Переназначено {result.rowcount} задач пользователя {user_id}.")
+        return result.rowcount
+
+    async def count_workload(self, user_ids: Iterable[int]) -> List:
+        """
+        Подсчитывает задачи исполнителей по статусам одним запросом GROUP BY assigned_to, status.
+
+        Просроченные задачи считаются в том же проходе (count(*) FILTER); колонки запроса покрываются
+        индексом ix_tasks_assigned_to_status, поэтому таблица не читается.
+
+        :param user_ids: Идентификаторы исполнителей.
+        :return: Строки (assigned_to, status, total, overdue).
+        """
+        overdue = func.count().filter(self.model.status != StatusEnum.DONE, self.model.deadline < func.now())
+        result = await self._session.execute(
+            select(self.model.assigned_to, self.model.status, func.count().label("total"), overdue.label("overdue"))
+            .where(self.model.assigned_to == any_(bindparam("user_ids", list(user_ids), type_=ARRAY(Integer))))
+            .group_by(self.model.assigned_to, self.model.status)
+        )
+        return result.all()
+
+    async def get_audience(self, task_id: int) -> List[int]:
+        """
+        Возвращает пользователей, которых касаются изменения задачи: постановщика и исполнителя.
+
+        :param task_id: Идентификатор задачи.
+        :return: Идентификаторы пользователей (пустой список, если задача не найдена).
+        """
+        result = await self._session.execute(
+            select(self.model.assigned_by, self.model.assigned_to).where(self.model.id == task_id)
+        )
+        row = result.one_or_none()
+        return list(row) if row else []
+
+    async def mark_overdue_batch(self, after: Optional[Tuple[datetime, int]], limit: int) -> List:
+        """
+        Отмечает просроченными очередную пачку незавершенных задач с наступившим сроком.
+
+        Пачка выбирается по ключу (deadline, id) после курсора. Строки, заблокированные другим
+        процессом, пропускаются (SKIP LOCKED), поэтому несколько обработчиков не мешают друг другу.
+
+        :param after: Курсор (deadline, id) последней обработанной задачи или None.
+        :param limit: Размер пачки.
+        :return: Строки отмеченных задач (id, assigned_by, assigned_to, deadline), упорядоченные по ключу.
+        """
+        candidates = (
+            select(self.model.id)
+            .where(
+                self.model.status.in_((StatusEnum.CREATED, StatusEnum.IN_WORK)),
+                self.model.overdue_at.is_(None),
+                self.model.deadline <= func.now(),
+            )
+            .order_by(self.model.deadline, self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after is not None:
+            deadline, task_id = after
+            candidates = candidates.where(
+                tuple_(self.model.deadline, self.model.id) > tuple_(literal(deadline, self.model.deadline.type), task_id)
+            )
+        self._clear_loader()
+        result = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id.in_(candidates.scalar_subquery()))
+            .values(overdue_at=func.now())
+            .returning(self.model.id, self.model.assigned_by, self.model.assigned_to, self.model.deadline)
+            .execution_options(synchronize_session=False)
+        )
+        return sorted(result.all(), key=lambda row: (row.deadline, row.id))
+
+    async def lock_archivable(self, months: int, limit: int) -> List:
+        """
+        Выбирает и блокирует пачку завершенных задач, не менявшихся дольше указанного числа месяцев.
+
+        Строки, заблокированные другими транзакциями (например, редактируемые задачи), пропускаются.
+
+        :param months: Возраст последнего изменения задачи в месяцах.
+        :param limit: Размер пачки.
+        :return: Строки (id, created_at) выбранных задач.
+        """
+        result = await self._session.execute(
+            select(self.model.id, self.model.created_at)
+            .where(
+                self.model.status == StatusEnum.DONE,
+                self.model.updated_at < func.now() - func.make_interval(0, months),
+            )
+            .order_by(self.model.updated_at, self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.all()
 
 
 class MotivationRepository(BaseRepository):
     model = Motivation
 
+    async def find_ratings_since(self, period: timedelta) -> List:
+        """
+        Возвращает оценки за период вместе с исполнителями оцененных задач.
+
+        :param period: Длительность периода, отсчитываемого от текущего времени базы.
+        :return: Строки (id оценки, исполнитель задачи, оценка).
+        """
+        result = await self._session.execute(
+            select(self.model.id, Task.assigned_to, self.model.rating)
+            .join(Task, Task.id == self.model.task_id)
+            .where(self.model.created_at >= func.now() - period)
+        )
+        return result.all()
+
+    async def rating_stats(self, user_ids: Iterable[int], period: timedelta) -> List:
+        """
+        Считает среднюю оценку и количество оценок исполнителей за период одним запросом.
+
+        :param user_ids: Идентификаторы исполнителей.
+        :param period: Длительность периода, отсчитываемого от текущего времени базы.
+        :return: Строки (исполнитель, средняя оценка, количество оценок) только для исполнителей с оценками.
+        """
+        result = await self._session.execute(
+            select(Task.assigned_to, func.avg(self.model.rating), func.count())
+            .join(Task, Task.id == self.model.task_id)
+            .where(Task.assigned_to == any_(bindparam("user_ids", list(user_ids), type_=ARRAY(Integer))),
+                   self.model.created_at >= func.now() - period)
+            .group_by(Task.assigned_to)
+        )
+        return result.all()
+
 
 class MeetingRepository(BaseRepository):
     model = Meeting
+    loading_profiles = {
+        "participants": lambda: [selectinload(Meeting.participants)],
+    }
+
+    async def get_audience(self, meeting_id: int) -> List[int]:
+        """
+        Возвращает пользователей, которых касаются изменения встречи: организатора и участников.
+
+        :param meeting_id: Идентификатор встречи.
+        :return: Идентификаторы пользователей.
+        """
+        participants = (
+            select(Participant.user_id)
+            .join(meeting_participant, meeting_participant.c.participant_id == Participant.id)
+            .where(meeting_participant.c.meeting_id == meeting_id)
+        )
+        organiser = select(self.model.organisation_by).where(self.model.id == meeting_id)
+        result = await self._session.execute(organiser.union(participants))
+        return list(result.scalars().all())
 
 
 class ParticipantRepository(BaseRepository):
     model = Participant
+
+    async def delete_by_user(self, user_id: int) -> int:
+        """
+        Удаляет участия пользователя во встречах вместе со связями.
+
+        :param user_id: Идентификатор пользователя.
+        :return: Количество удаленных участников.
+        """
+        self._clear_loader()
+        participant_ids = select(self.model.id).where(self.model.user_id == user_id).scalar_subquery()
+        await self._session.execute(
+            sqlalchemy_delete(meeting_participant).where(meeting_participant.c.participant_id.in_(participant_ids))
+        )
+        result = await self._session.execute(
+            sqlalchemy_delete(self.model)
+            .where(self.model.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        logger.info(f"Удалено {result.rowcount} участников пользователя {user_id}.")
+        return result.rowcount
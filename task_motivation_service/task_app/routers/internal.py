@@ -0,0 +1,47 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.dependencies.internal_dep import verify_internal_token
+from task_motivation_service.task_app.dependencies.repository_dep import (get_session_with_commit,
+                                                                          get_session_without_commit)
+from task_motivation_service.task_app.schemas.event_schema import SEventBatch, SEventBatchResult
+from task_motivation_service.task_app.schemas.task_schema import SUserPerformance
+from task_motivation_service.task_app.services import event_handlers  # noqa: F401  регистрация обработчиков
+from task_motivation_service.task_app.services.outbox import EventConsumer
+from task_motivation_service.task_app.services.task_service import TaskService
+
+router = APIRouter(dependencies=[Depends(verify_internal_token)])
+
+
+@router.post("/events")
+async def ingest_events(
+    batch: SEventBatch,
+    session: AsyncSession = Depends(get_session_with_commit)
+) -> SEventBatchResult:
+    """
+    Прием пачки событий от сервиса пользователей.
+
+    :param batch: Пачка событий с именем источника.
+    :param session: Асинхронная сессия базы данных.
+    :return: Количество обработанных событий и смещение источника.
+    """
+    return await EventConsumer(session).consume(batch)
+
+
+@router.get("/performance")
+async def get_performance(
+    user_ids: List[int] = Query(min_length=1, max_length=settings.WORKLOAD_MAX_USERS,
+                                description="Идентификаторы исполнителей"),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> List[SUserPerformance]:
+    """
+    Показатели исполнителей для сервиса пользователей: нагрузка по задачам и средняя оценка за период.
+
+    :param user_ids: Идентификаторы исполнителей (?user_ids=1&user_ids=2).
+    :param session: Асинхронная сессия базы данных.
+    :return: Показатели исполнителей в порядке идентификаторов.
+    """
+    return await TaskService(session).get_performance(user_ids)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_motivation_service.task_app.dependencies.auth_dep import get_current_user_info
+from task_motivation_service.task_app.dependencies.repository_dep import get_session_without_commit
+from task_motivation_service.task_app.exceptions.task_meet_exceptions import JobNotFoundException
+from task_motivation_service.task_app.repositories.job_repository import JobRepository
+from task_motivation_service.task_app.schemas.job_schema import SJob
+
+router = APIRouter()
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: int,
+    user_data: dict = Depends(get_current_user_info),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> SJob:
+    """
+    Получение состояния фоновой задачи.
+
+    Задачу видит только поставивший ее пользователь; системные задачи через API недоступны.
+
+    :param job_id: Идентификатор задачи.
+    :param user_data: Данные текущего пользователя.
+    :param session: Асинхронная сессия базы данных.
+    :return: Состояние, прогресс и результат задачи.
+    """
+    job = await JobRepository(session).find_one_or_none_by_id(job_id)
+    if not job or job.created_by is None or str(job.created_by) != str(user_data["id"]):
+        raise JobNotFoundException
+    return SJob.model_validate(job)
@@ -1,11 +1,14 @@
-from typing import List
+from typing import List, Tuple
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from task_motivation_service.task_app.core.loading import to_schema
+from task_motivation_service.task_app.dependencies.include_dep import include_param
 from task_motivation_service.task_app.dependencies.repository_dep import (get_session_with_commit,
                                                                           get_session_without_commit)
-from task_motivation_service.task_app.schemas.meeting_schema import SMeetingCreate, SMeetingUpdate
+from task_motivation_service.task_app.repositories.task_repository import MeetingRepository
+from task_motivation_service.task_app.schemas.meeting_schema import SMeeting, SMeetingCreate, SMeetingUpdate
 from task_motivation_service.task_app.schemas.meeting_schema import SParticipant
 from task_motivation_service.task_app.services.meeting_service import MeetingService
 
@@ -42,8 +45,7 @@ async def update_meeting(
     Возвращает обновленную встречу.
     """
     service = MeetingService(session)
-    await service.update_meeting(meeting_id, meeting)
-    return await service.get_meeting_by_id(meeting_id)
+    return await service.update_meeting(meeting_id, meeting)
 
 
 @router.delete("/meetings/{meeting_id}")
@@ -62,27 +64,36 @@ async def delete_meeting(meeting_id: int, session: AsyncSession = Depends(get_se
 
 
 @router.get("/meetings/{meeting_id}")
-async def get_meeting(meeting_id: int, session: AsyncSession = Depends(get_session_without_commit)):
+async def get_meeting(
+        meeting_id: int,
+        include: Tuple[str, ...] = Depends(include_param(MeetingRepository.loading_profiles)),
+        session: AsyncSession = Depends(get_session_without_commit)
+) -> SMeeting:
     """
     Получает информацию о встрече по идентификатору.
 
     - **meeting_id**: Идентификатор встречи, которую нужно получить.
+    - **include**: Связи, которые нужно загрузить (participants).
     - **session**: Сессия базы данных, которая будет использоваться для выполнения операции.
 
     Возвращает данные о встрече.
     """
     service = MeetingService(session)
-    return await service.get_meeting_by_id(meeting_id)
+    return to_schema(SMeeting, await service.get_meeting_by_id(meeting_id, include))
 
 
 @router.get("/meetings/")
-async def get_all_meetings(session: AsyncSession = Depends(get_session_without_commit)):
+async def get_all_meetings(
+        include: Tuple[str, ...] = Depends(include_param(MeetingRepository.loading_profiles)),
+        session: AsyncSession = Depends(get_session_without_commit)
+) -> List[SMeeting]:
     """
     Получает список всех встреч.
 
+    - **include**: Связи, которые нужно загрузить (participants).
     - **session**: Сессия базы данных, которая будет использоваться для выполнения операции.
 
     Возвращает список всех встреч.
     """
     service = MeetingService(session)
-    return await service.get_all_meetings()
+    return [to_schema(SMeeting, meeting) for meeting in await service.get_all_meetings(include)]
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from task_motivation_service.task_app.core.config import settings
 from task_motivation_service.task_app.dependencies.auth_dep import get_current_user_info
 from task_motivation_service.task_app.dependencies.repository_dep import (get_session_with_commit,
                                                                           get_session_without_commit)
-from task_motivation_service.task_app.schemas.motivation_schema import SMotivationCreate, SMotivationUpdate
+from task_motivation_service.task_app.schemas.motivation_schema import (SLeaderboard, SMotivationCreate,
+                                                                        SMotivationUpdate)
 from task_motivation_service.task_app.services.motivation_service import MotivationService
 
 router = APIRouter()
@@ -46,8 +50,7 @@ async def update_motivation(
     Возвращает обновленную мотивацию.
     """
     service = MotivationService(session)
-    await service.update_motivation(motivation_id, motivation_data)
-    return await service.get_motivation_by_id(motivation_id)
+    return await service.update_motivation(motivation_id, motivation_data)
 
 
 @router.delete("/delete/{motivation_id}")
@@ -84,6 +87,27 @@ async def get_all_motivations(
     return motivations
 
 
+@router.get("/leaderboard/{kind}/{scope_id}")
+async def get_leaderboard(
+    kind: Literal["company", "structure"],
+    scope_id: int,
+    limit: int = Query(default=settings.LEADERBOARD_SIZE, ge=1, le=settings.LEADERBOARD_SIZE,
+                       description="Количество мест"),
+    current_user: dict = Depends(get_current_user_info),
+) -> SLeaderboard:
+    """
+    Получает рейтинг пользователей компании или структуры по средней оценке за период.
+
+    - **kind**: Тип области рейтинга: company или structure.
+    - **scope_id**: Идентификатор компании или структуры.
+    - **limit**: Количество мест.
+    - **current_user**: Информация о текущем пользователе.
+
+    Возвращает места рейтинга по убыванию средней оценки.
+    """
+    return MotivationService.get_leaderboard(kind, scope_id, limit)
+
+
 @router.get("/{motivation_id}")
 async def get_motivation(
     motivation_id: int,
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from task_motivation_service.task_app.dependencies.auth_dep import decode_token, get_access_token
+from task_motivation_service.task_app.services.notifications import stream_events
+
+router = APIRouter()
+
+
+@router.get("/stream")
+async def notifications_stream(token: str = Depends(get_access_token)) -> StreamingResponse:
+    """
+    Подписка на изменения задач, оценок и встреч текущего пользователя (Server-Sent Events).
+
+    Событие содержит тип (task.created, task.updated, task.overdue, motivation.*, meeting.*)
+    и измененные данные, поэтому клиенту не нужно периодически запрашивать списки задач.
+
+    Поток закрывается, когда токен истекает или отзывается.
+
+    :param token: Access-токен текущего пользователя.
+    :return: Поток событий text/event-stream.
+    """
+    return StreamingResponse(
+        stream_events(decode_token(token)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends
+from typing import List, Tuple
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from task_motivation_service.task_app.core.config import settings
 from task_motivation_service.task_app.dependencies.auth_dep import get_current_user_info
-from task_motivation_service.task_app.dependencies.repository_dep import get_session_with_commit
-from task_motivation_service.task_app.schemas.task_schema import STaskCreate, STaskUpdate
+from task_motivation_service.task_app.dependencies.include_dep import fields_param
+from task_motivation_service.task_app.dependencies.repository_dep import (get_session_with_commit,
+                                                                          get_session_without_commit)
+from task_motivation_service.task_app.repositories.task_repository import TaskRepository
+from task_motivation_service.task_app.schemas.task_schema import STaskCreate, STaskUpdate, SUserWorkload
 from task_motivation_service.task_app.services.task_service import TaskService
 import logging
 
@@ -11,6 +17,8 @@ logging.basicConfig(level=logging.INFO)
 
 router = APIRouter()
 
+task_fields = fields_param(TaskRepository.selectable_fields)
+
 
 @router.post("/create")
 async def create_task(
@@ -72,32 +80,70 @@ async def delete_task(
 
 @router.get("/all")
 async def get_all_tasks(
-
+    fields: Tuple[str, ...] = Depends(task_fields),
     session: AsyncSession = Depends(get_session_with_commit)
 ):
     """
     Получение списка всех задач.
+    :param fields: Поля ответа (по умолчанию все).
     :param session: Асинхронная сессия базы данных.
     :return: Список всех задач.
     """
     logging.info("Получен запрос на получение всех задач.")
     service = TaskService(session)
-    tasks = await service.get_all_tasks()
+    tasks = await service.get_all_tasks(fields)
     return tasks
 
 
+@router.get("/workload")
+async def get_workload(
+    user_ids: List[int] = Query(min_length=1, max_length=settings.WORKLOAD_MAX_USERS,
+                                description="Идентификаторы исполнителей"),
+    current_user: dict = Depends(get_current_user_info),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> List[SUserWorkload]:
+    """
+    Получение нагрузки исполнителей: количество задач по статусам и просроченных задач.
+
+    :param user_ids: Идентификаторы исполнителей (?user_ids=1&user_ids=2).
+    :param current_user: Данные текущего пользователя.
+    :param session: Асинхронная сессия базы данных.
+    :return: Нагрузка исполнителей.
+    """
+    service = TaskService(session)
+    return await service.get_workload(user_ids)
+
+
+@router.get("/detail/{task_id}")
+async def get_task_details(
+    task_id: int,
+    session: AsyncSession = Depends(get_session_with_commit)
+):
+    """
+    Получение задачи с именами постановщика и исполнителя.
+
+    :param task_id: Идентификатор задачи.
+    :param session: Асинхронная сессия базы данных.
+    :return: Данные задачи с именами пользователей.
+    """
+    service = TaskService(session)
+    return await service.get_task_details(task_id)
+
+
 @router.get("/{task_id}")
 async def get_task_by_id(
     task_id: int,
+    fields: Tuple[str, ...] = Depends(task_fields),
     session: AsyncSession = Depends(get_session_with_commit)
 ):
     """
     Получение задачи по идентификатору.
 
     :param task_id: Идентификатор задачи.
+    :param fields: Поля ответа (по умолчанию все).
     :param session: Асинхронная сессия базы данных.
     :return: Данные задачи.
     """
     service = TaskService(session)
-    task = await service.get_task_by_id(task_id)
+    task = await service.get_task_by_id(task_id, fields)
     return task
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict
+
+
+class SDirectoryUser(BaseModel):
+    id: int = Field(description="Идентификатор пользователя")
+    first_name: str = Field(description="Имя пользователя")
+    last_name: str = Field(description="Фамилия пользователя")
+    company_id: Optional[int] = Field(default=None, description="Идентификатор компании")
+    status: str = Field(description="Статус пользователя")
+    structure_ids: List[int] = Field(default_factory=list, description="Идентификаторы структур пользователя")
+    source_updated_at: datetime = Field(validation_alias=AliasChoices("source_updated_at", "updated_at"),
+                                       description="Время изменения в сервисе пользователей")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SDirectoryPage(BaseModel):
+    items: List[SDirectoryUser] = Field(description="Измененные пользователи")
+    has_more: bool = Field(description="Есть ли еще изменения после последней записи")
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from task_motivation_service.task_app.models.job_model import JobStatusEnum
+
+
+class SJob(BaseModel):
+    id: int = Field(description="Идентификатор задачи")
+    kind: str = Field(description="Тип задачи")
+    status: JobStatusEnum = Field(description="Состояние: pending, running, done или failed")
+    result: Optional[dict] = Field(default=None, description="Прогресс или результат выполнения")
+    error: Optional[str] = Field(default=None, description="Текст последней ошибки")
+    attempts: int = Field(description="Количество запусков")
+    created_at: datetime = Field(description="Время постановки в очередь")
+    started_at: Optional[datetime] = Field(default=None, description="Время последнего запуска")
+    finished_at: Optional[datetime] = Field(default=None, description="Время завершения")
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -20,11 +20,6 @@ class SMeetingUpdate(BaseModel):
     end_at: Optional[datetime] = Field(description="Окончание встречи")
 
 
-class SMeeting(SMeetingBase):
-    id: int = Field(description="Идентификатор встречи")
-    participants: list
-
-    model_config = ConfigDict(from_attributes=True)
 
 
 class SMeetingSearch(BaseModel):
@@ -36,5 +31,17 @@ class SParticipant(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SParticipantResponse(SParticipant):
+    id: int = Field(description="Идентификатор участника")
+
+
+class SMeeting(SMeetingBase):
+    id: int = Field(description="Идентификатор встречи")
+    participants: List[SParticipantResponse] = Field(default_factory=list,
+                                                     description="Участники (загружаются при include=participants)")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class SParticipantSearch(BaseModel):
     id: int = Field(description="Идентификатор участника встречи")
@@ -1,3 +1,5 @@
+from typing import List, Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -19,3 +21,18 @@ class SMotivationSearch(BaseModel):
 class SMotivationSearchID(BaseModel):
     id: int = Field(description="Идентификатор оценки задачи")
 
+
+
+class SLeaderboardEntry(BaseModel):
+    rank: int = Field(description="Место в рейтинге")
+    user_id: int = Field(description="Идентификатор пользователя")
+    name: Optional[str] = Field(default=None, description="Имя и фамилия пользователя")
+    average: float = Field(description="Средняя оценка за период")
+    ratings: int = Field(description="Количество оценок за период")
+
+
+class SLeaderboard(BaseModel):
+    kind: Literal["company", "structure"] = Field(description="Тип области рейтинга")
+    scope_id: int = Field(description="Идентификатор компании или структуры")
+    period_days: int = Field(description="Период рейтинга в днях")
+    entries: List[SLeaderboardEntry] = Field(description="Места рейтинга по убыванию средней оценки")
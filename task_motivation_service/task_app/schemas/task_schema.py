@@ -1,6 +1,6 @@
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -26,3 +26,15 @@ class STaskUpdate(BaseModel):
 
 class STaskSearchID(BaseModel):
     id: int
+
+
+class SUserWorkload(BaseModel):
+    user_id: int = Field(description="Идентификатор исполнителя")
+    total: int = Field(description="Всего задач")
+    overdue: int = Field(description="Незавершенных задач с прошедшим сроком")
+    by_status: Dict[str, int] = Field(description="Количество задач по статусам")
+
+
+class SUserPerformance(SUserWorkload):
+    rating_average: Optional[float] = Field(default=None, description="Средняя оценка за период")
+    ratings: int = Field(default=0, description="Количество оценок за период")
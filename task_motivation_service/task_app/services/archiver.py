@@ -0,0 +1,84 @@
+import os
+from datetime import date
+
+from loguru import logger
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.database.database import async_session_maker
+from task_motivation_service.task_app.repositories.archive_repository import (MotivationArchiveRepository,
+                                                                              TaskArchiveRepository, next_month)
+from task_motivation_service.task_app.repositories.task_repository import TaskRepository
+
+
+def months_ago(today: date, months: int) -> date:
+    """Возвращает первый день месяца, отстоящего от текущего на указанное число месяцев."""
+    index = today.year * 12 + today.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class TaskArchiver:
+    """
+    Архивация завершенных задач.
+
+    Рабочие таблицы tasks и motivations содержат только актуальные данные: завершенные задачи,
+    не менявшиеся ARCHIVE_AFTER_MONTHS месяцев, вместе с мотивациями пачками переносятся
+    в секционированные по месяцу создания архивные таблицы. Секции старше ARCHIVE_RETENTION_MONTHS
+    отсоединяются, выгружаются в сжатые CSV-файлы и удаляются.
+    """
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+
+    async def archive_once(self) -> int:
+        """
+        Переносит в архив все подходящие задачи и выгружает устаревшие секции.
+
+        :return: Количество перенесенных задач.
+        """
+        total = 0
+        while True:
+            moved = await self._archive_batch()
+            total += moved
+            if moved < self.batch_size:
+                break
+        await self._export_expired()
+        if total:
+            logger.info(f"Перенесено в архив {total} задач.")
+        return total
+
+    async def _archive_batch(self) -> int:
+        """Переносит одну пачку задач в отдельной транзакции."""
+        async with async_session_maker() as session:
+            task_archive = TaskArchiveRepository(session)
+            motivation_archive = MotivationArchiveRepository(session)
+            if not await task_archive.try_lock():
+                return 0
+            rows = await TaskRepository(session).lock_archivable(settings.ARCHIVE_AFTER_MONTHS, self.batch_size)
+            if not rows:
+                return 0
+            task_ids = [row.id for row in rows]
+            await task_archive.ensure_partitions(row.created_at for row in rows)
+            await motivation_archive.ensure_partitions(await motivation_archive.get_months(task_ids))
+            await motivation_archive.archive_for_tasks(task_ids)
+            moved = await task_archive.archive_tasks(task_ids)
+            await session.commit()
+        return moved
+
+    async def _export_expired(self) -> None:
+        """Выгружает и удаляет секции, целиком вышедшие за срок хранения."""
+        border = months_ago(date.today(), settings.ARCHIVE_RETENTION_MONTHS)
+        os.makedirs(settings.ARCHIVE_EXPORT_DIR, exist_ok=True)
+        for repository_class in (MotivationArchiveRepository, TaskArchiveRepository):
+            async with async_session_maker() as session:
+                repository = repository_class(session)
+                if not await repository.try_lock():
+                    return
+                for partition, month in await repository.list_partitions():
+                    if next_month(month) > border:
+                        break
+                    path = os.path.join(settings.ARCHIVE_EXPORT_DIR, f"{partition}.csv.gz")
+                    await repository.export_partition(partition, path)
+                await session.commit()
+
+
+task_archiver = TaskArchiver()
@@ -0,0 +1,52 @@
+from loguru import logger
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.database.database import async_session_maker
+from task_motivation_service.task_app.repositories.outbox_repository import OutboxRepository
+from task_motivation_service.task_app.repositories.task_repository import TaskRepository
+
+
+class DeadlineSweeper:
+    """
+    Фоновая обработка просроченных задач.
+
+    Незавершенные задачи с наступившим сроком отмечаются (overdue_at) пачками по ключу (deadline, id),
+    для каждой записывается событие task.overdue. Каждая пачка — отдельная короткая транзакция,
+    а выбор строк с SKIP LOCKED позволяет запускать обработку одновременно на всех процессах.
+    """
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or settings.DEADLINE_SWEEP_BATCH
+
+    async def sweep_once(self) -> int:
+        """
+        Отмечает все задачи, просроченные к моменту запуска.
+
+        :return: Количество отмеченных задач.
+        """
+        total = 0
+        cursor = None
+        while True:
+            async with async_session_maker() as session:
+                rows = await TaskRepository(session).mark_overdue_batch(cursor, self.batch_size)
+                await OutboxRepository(session).add_events([
+                    {
+                        "event_type": "task.overdue",
+                        "aggregate_id": row.id,
+                        "payload": {"id": row.id, "assigned_by": row.assigned_by, "assigned_to": row.assigned_to,
+                                    "deadline": row.deadline.isoformat()},
+                        "audience": (row.assigned_by, row.assigned_to),
+                    }
+                    for row in rows
+                ])
+                await session.commit()
+            total += len(rows)
+            if len(rows) < self.batch_size:
+                break
+            cursor = (rows[-1].deadline, rows[-1].id)
+        if total:
+            logger.info(f"Отмечено просроченными {total} задач.")
+        return total
+
+
+deadline_sweeper = DeadlineSweeper()
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_motivation_service.task_app.database.database import async_session_maker
+from task_motivation_service.task_app.models.job_model import Job
+from task_motivation_service.task_app.repositories.directory_repository import DirectoryUserRepository
+from task_motivation_service.task_app.repositories.revoked_token_repository import RevokedTokenRepository
+from task_motivation_service.task_app.repositories.task_repository import ParticipantRepository, TaskRepository
+from task_motivation_service.task_app.schemas.directory_schema import SDirectoryUser
+from task_motivation_service.task_app.schemas.event_schema import SEvent
+from task_motivation_service.task_app.services.jobs import enqueue_job, job_handler
+from task_motivation_service.task_app.services.outbox import event_handler
+
+USER_CLEANUP_JOB = "user.cleanup"
+
+
+@event_handler("user.created")
+@event_handler("user.updated")
+async def apply_user_change(session: AsyncSession, event: SEvent) -> None:
+    """Обновляет запись пользователя в реплике справочника."""
+    await DirectoryUserRepository(session).upsert_many([SDirectoryUser.model_validate(event.payload)])
+
+
+@event_handler("user.deleted")
+async def apply_user_deletion(session: AsyncSession, event: SEvent) -> None:
+    """
+    Убирает удаленного пользователя из справочника.
+
+    Очистка связанных данных может затронуть много строк, поэтому выполняется фоновой задачей,
+    которая ставится в очередь в той же транзакции, что и смещение получателя.
+    """
+    user_id = event.aggregate_id
+    await DirectoryUserRepository(session).mark_deleted(user_id)
+    await enqueue_job(session, USER_CLEANUP_JOB, {"user_id": user_id})
+
+
+@event_handler("token.revoked")
+async def apply_token_revocation(session: AsyncSession, event: SEvent) -> None:
+    """Сохраняет отзыв токена; в память процессов сервиса он попадает при синхронизации отзывов."""
+    expires_at = datetime.fromtimestamp(int(event.payload["exp"]), tz=timezone.utc)
+    await RevokedTokenRepository(session).revoke([(event.payload["jti"], expires_at)])
+
+
+@job_handler(USER_CLEANUP_JOB)
+async def cleanup_deleted_user(job: Job) -> dict:
+    """Удаляет участия пользователя во встречах и возвращает его незавершенные задачи постановщикам."""
+    user_id = job.payload["user_id"]
+    async with async_session_maker() as session:
+        participants = await ParticipantRepository(session).delete_by_user(user_id)
+        tasks = await TaskRepository(session).reassign_open_tasks(user_id)
+        await session.commit()
+    return {"participants": participants, "tasks": tasks}
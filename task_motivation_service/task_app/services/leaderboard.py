@@ -0,0 +1,188 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.database.database import async_session_maker
+from task_motivation_service.task_app.repositories.task_repository import MotivationRepository
+from task_motivation_service.task_app.services.user_directory import UserDirectory, user_directory
+
+# Область рейтинга: ("company", id компании) или ("structure", id структуры)
+Scope = Tuple[str, int]
+# Ключ места в рейтинге: (-средняя оценка, -количество оценок, id пользователя); меньший ключ — выше место
+RankKey = Tuple[float, int, int]
+
+
+class Leaderboard:
+    """
+    Рейтинги пользователей по средней оценке за период в разрезе компаний и структур.
+
+    Для каждой области хранится отсортированный массив ключей лучших size пользователей, поэтому
+    чтение рейтинга — срез массива. События об оценках меняют сумму и количество оценок исполнителя
+    и положение его ключа в массивах его компании и структур. Периодический пересчет по базе
+    исправляет то, что событиями не передается: истечение периода, смену исполнителя задачи,
+    перевод пользователя между структурами.
+    """
+
+    def __init__(self, size: int, directory: UserDirectory = user_directory):
+        """
+        :param size: Количество мест в рейтинге области.
+        :param directory: Справочник пользователей, из которого берутся компания и структуры пользователя.
+        """
+        self.size = size
+        self.directory = directory
+        self._ratings: Dict[int, Tuple[int, int]] = {}  # id оценки -> (исполнитель, оценка)
+        self._stats: Dict[int, List[int]] = {}  # пользователь -> [сумма оценок, количество оценок]
+        self._scopes: Dict[int, Tuple[Scope, ...]] = {}
+        self._members: Dict[Scope, Set[int]] = defaultdict(set)
+        self._top: Dict[Scope, List[RankKey]] = {}
+        # События, пришедшие во время пересчета: применяются повторно к новому состоянию
+        self._pending: Optional[List[dict]] = None
+
+    def top(self, kind: str, scope_id: int, limit: Optional[int] = None) -> List[Tuple[int, float, int]]:
+        """
+        Возвращает лучших пользователей области.
+
+        :param kind: Тип области ("company" или "structure").
+        :param scope_id: Идентификатор компании или структуры.
+        :param limit: Количество мест (не больше размера рейтинга).
+        :return: Список (id пользователя, средняя оценка, количество оценок) по убыванию места.
+        """
+        keys = self._top.get((kind, scope_id), [])
+        return [(user_id, -average, -count) for average, count, user_id in keys[:limit]]
+
+    def add(self, motivation_id: int, user_id: int, rating: int) -> None:
+        """Учитывает оценку исполнителя (повторная оценка с тем же id заменяет прежнюю)."""
+        self.remove(motivation_id)
+        self._ratings[motivation_id] = (user_id, rating)
+        self._change(user_id, rating, 1)
+
+    def remove(self, motivation_id: int) -> None:
+        """Исключает оценку; оценки вне периода в рейтинге не учтены, и их удаление ничего не меняет."""
+        record = self._ratings.pop(motivation_id, None)
+        if record is not None:
+            user_id, rating = record
+            self._change(user_id, -rating, -1)
+
+    def apply_event(self, message: dict) -> None:
+        """
+        Применяет событие об оценке, доставленное всем процессам сервиса.
+
+        :param message: Сообщение pub/sub (event_type, aggregate_id, payload).
+        """
+        event_type = message.get("event_type", "")
+        if not event_type.startswith("motivation."):
+            return
+        if self._pending is not None:
+            self._pending.append(message)
+        payload = message.get("payload")
+        motivation_id = message["aggregate_id"]
+        if event_type == "motivation.deleted":
+            self.remove(motivation_id)
+        elif payload is None:
+            # Слишком большое сообщение доставляется без данных — оценку учтет пересчет
+            return
+        elif event_type == "motivation.updated":
+            record = self._ratings.get(motivation_id)
+            if record is not None:
+                self.add(motivation_id, record[0], payload["rating"])
+        elif event_type == "motivation.created" and payload.get("assigned_to") is not None:
+            self.add(motivation_id, payload["assigned_to"], payload["rating"])
+
+    def begin_rebuild(self) -> None:
+        """Начинает пересчет: события до его завершения запоминаются для повторного применения."""
+        self._pending = []
+
+    def cancel_rebuild(self) -> None:
+        """Отменяет пересчет, не завершенный из-за ошибки."""
+        self._pending = None
+
+    def rebuild(self, ratings: Iterable[Tuple[int, int, int]]) -> None:
+        """
+        Заменяет состояние рейтингов пересчитанным по оценкам за период.
+
+        :param ratings: Оценки (id оценки, исполнитель, оценка).
+        """
+        self._ratings = {motivation_id: (user_id, rating) for motivation_id, user_id, rating in ratings}
+        self._stats = {}
+        for user_id, rating in self._ratings.values():
+            stats = self._stats.setdefault(user_id, [0, 0])
+            stats[0] += rating
+            stats[1] += 1
+        self._scopes = {user_id: self._scopes_of(user_id) for user_id in self._stats}
+        self._members = defaultdict(set)
+        for user_id, scopes in self._scopes.items():
+            for scope in scopes:
+                self._members[scope].add(user_id)
+        self._top = {scope: heapq.nsmallest(self.size, map(self._key, members))
+                     for scope, members in self._members.items()}
+        pending, self._pending = self._pending or [], None
+        for message in pending:
+            self.apply_event(message)
+
+    def _key(self, user_id: int) -> RankKey:
+        total, count = self._stats[user_id]
+        return -total / count, -count, user_id
+
+    def _scopes_of(self, user_id: int) -> Tuple[Scope, ...]:
+        entry = self.directory.get(user_id)
+        if entry is None:
+            return ()
+        company = (("company", entry.company_id),) if entry.company_id is not None else ()
+        return company + tuple(("structure", structure_id) for structure_id in entry.structure_ids)
+
+    def _change(self, user_id: int, rating_delta: int, count_delta: int) -> None:
+        old = self._key(user_id) if user_id in self._stats else None
+        stats = self._stats.setdefault(user_id, [0, 0])
+        stats[0] += rating_delta
+        stats[1] += count_delta
+        if stats[1] > 0:
+            new = self._key(user_id)
+            scopes = self._scopes.setdefault(user_id, self._scopes_of(user_id))
+        else:
+            new = None
+            del self._stats[user_id]
+            scopes = self._scopes.pop(user_id, ())
+        for scope in scopes:
+            self._reposition(scope, user_id, old, new)
+
+    def _reposition(self, scope: Scope, user_id: int, old: Optional[RankKey], new: Optional[RankKey]) -> None:
+        members = self._members[scope]
+        top = self._top.setdefault(scope, [])
+        if new is None:
+            members.discard(user_id)
+        else:
+            members.add(user_id)
+        if old is not None:
+            index = bisect_left(top, old)
+            if index < len(top) and top[index] == old:
+                del top[index]
+        if new is not None and (len(top) < self.size or new < top[-1]):
+            insort(top, new)
+            del top[self.size:]
+        if len(top) < min(self.size, len(members)):
+            # Пользователь опустился ниже последнего места — место занимает следующий из участников области
+            self._top[scope] = heapq.nsmallest(self.size, map(self._key, members))
+        elif not members:
+            del self._members[scope], self._top[scope]
+
+
+leaderboard = Leaderboard(size=settings.LEADERBOARD_SIZE)
+
+
+async def refresh_leaderboards(board: Leaderboard = leaderboard) -> None:
+    """Пересчитывает рейтинги по оценкам за период из базы."""
+    board.begin_rebuild()
+    try:
+        async with async_session_maker() as session:
+            ratings = await MotivationRepository(session).find_ratings_since(
+                timedelta(days=settings.LEADERBOARD_PERIOD_DAYS))
+    except Exception:
+        board.cancel_rebuild()
+        raise
+    board.rebuild(ratings)
+    logger.info(f"Рейтинги пересчитаны: {len(ratings)} оценок за {settings.LEADERBOARD_PERIOD_DAYS} дн.")
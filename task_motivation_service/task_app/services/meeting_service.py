@@ -1,13 +1,18 @@
+from typing import Sequence
+
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound
 
 from task_motivation_service.task_app.exceptions.task_meet_exceptions import MeetingNotFoundException, \
-    ParticipantNotFoundException
+    ParticipantNotFoundException, UserNotFoundException
 from task_motivation_service.task_app.models import Meeting
 from task_motivation_service.task_app.models.meeteng_model import Participant
+from task_motivation_service.task_app.repositories.outbox_repository import OutboxRepository
 from task_motivation_service.task_app.repositories.task_repository import MeetingRepository, ParticipantRepository
 from task_motivation_service.task_app.schemas.meeting_schema import SMeetingCreate, SMeetingUpdate, SMeetingSearch
 from task_motivation_service.task_app.schemas.meeting_schema import SParticipantSearch, SParticipant
+from task_motivation_service.task_app.services.user_directory import user_directory
 
 
 class MeetingService:
@@ -19,6 +24,7 @@ class MeetingService:
         """
         self.repository = MeetingRepository(session)
         self.participant_repository = ParticipantRepository(session)
+        self.outbox = OutboxRepository(session)
 
     async def create_meeting(self, meeting_data: SMeetingCreate):
         """
@@ -27,24 +33,35 @@ class MeetingService:
         - **meeting_data**: Данные о встрече, которые будут добавлены.
 
         Возвращает созданную встречу.
+        Вызывает исключение UserNotFoundException, если организатора нет в справочнике пользователей.
         """
+        if user_directory.missing((meeting_data.organisation_by,)):
+            raise UserNotFoundException
 
         meeting = await self.repository.add(values=meeting_data)
+        await self.outbox.add_event("meeting.created", meeting.id,
+                                    {"id": meeting.id, **meeting_data.model_dump(mode="json")},
+                                    audience=(meeting.organisation_by,))
         return meeting
 
-    async def update_meeting(self, meeting_id: int, meeting_data: SMeetingUpdate) -> None:
+    async def update_meeting(self, meeting_id: int, meeting_data: SMeetingUpdate) -> Meeting:
         """
         Обновляет существующую встречу по идентификатору.
 
         - **meeting_id**: Идентификатор встречи, которую нужно обновить.
         - **meeting_data**: Новые данные о встрече.
 
+        Возвращает обновленную встречу.
         Вызывает исключение NoResultFound, если встреча с данным идентификатором не найдена.
         """
 
-        updated_count = await self.repository.update(filters=SMeetingSearch(id=meeting_id), values=meeting_data)
-        if updated_count == 0:
+        meetings = await self.repository.update_returning(filters=SMeetingSearch(id=meeting_id), values=meeting_data)
+        if not meetings:
             raise MeetingNotFoundException
+        meeting = meetings[0]
+        await self.outbox.add_event("meeting.updated", meeting_id, jsonable_encoder(meeting.to_dict()),
+                                    audience=await self.repository.get_audience(meeting_id))
+        return meeting
 
     async def delete_meeting(self, meeting_id: int) -> None:
         """
@@ -54,31 +71,36 @@ class MeetingService:
 
         Вызывает исключение NoResultFound, если встреча с данным идентификатором не найдена.
         """
-        deleted_count = await self.repository.delete(filters=SMeetingSearch(id=meeting_id))
-        if deleted_count == 0:
+        audience = await self.repository.get_audience(meeting_id)
+        deleted = await self.repository.delete_returning(filters=SMeetingSearch(id=meeting_id))
+        if not deleted:
             raise MeetingNotFoundException
+        await self.outbox.add_event("meeting.deleted", meeting_id, jsonable_encoder(deleted[0]), audience=audience)
 
-    async def get_meeting_by_id(self, meeting_id: int) -> Meeting:
+    async def get_meeting_by_id(self, meeting_id: int, include: Sequence[str] = ()) -> Meeting:
         """
         Получает информацию о встрече по идентификатору.
 
         - **meeting_id**: Идентификатор встречи, которую нужно получить.
+        - **include**: Загружаемые связи (participants).
 
         Возвращает объект Meeting, если встреча найдена.
         Вызывает исключение NoResultFound, если встреча не найдена.
         """
-        meeting = await self.repository.find_one_or_none_by_id(meeting_id)
+        meeting = await self.repository.find_one_or_none_by_id(meeting_id, include)
         if not meeting:
             raise MeetingNotFoundException
         return meeting
 
-    async def get_all_meetings(self) -> list[Meeting]:
+    async def get_all_meetings(self, include: Sequence[str] = ()) -> list[Meeting]:
         """
         Получает список всех встреч.
 
+        - **include**: Загружаемые связи (participants).
+
         Возвращает список объектов Meeting.
         """
-        return await self.repository.find_all()
+        return await self.repository.find_all(include=include)
 
 
 class ParticipantService:
@@ -92,7 +114,11 @@ class ParticipantService:
         - **participant_data**: Данные о участнике, которые будут добавлены.
 
         Возвращает созданного участника.
+        Вызывает исключение UserNotFoundException, если пользователя нет в справочнике пользователей.
         """
+        if user_directory.missing((participant_data.user_id,)):
+            raise UserNotFoundException
+
         participant = await self.repository.add(values=participant_data)
         return participant
 
@@ -1,10 +1,17 @@
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from task_motivation_service.task_app.core.config import settings
 from task_motivation_service.task_app.exceptions.task_meet_exceptions import (MotivationNotFoundException,
                                                                               MotivationAlreadyExistsException)
-from task_motivation_service.task_app.repositories.task_repository import MotivationRepository
-from task_motivation_service.task_app.schemas.motivation_schema import (SMotivationCreate, SMotivationSearch,
+from task_motivation_service.task_app.repositories.archive_repository import MotivationArchiveRepository
+from task_motivation_service.task_app.repositories.outbox_repository import OutboxRepository
+from task_motivation_service.task_app.repositories.task_repository import MotivationRepository, TaskRepository
+from task_motivation_service.task_app.schemas.motivation_schema import (SLeaderboard, SLeaderboardEntry,
+                                                                        SMotivationCreate, SMotivationSearch,
                                                                         SMotivationUpdate, SMotivationSearchID)
+from task_motivation_service.task_app.services.leaderboard import leaderboard
+from task_motivation_service.task_app.services.user_directory import user_directory
 
 
 class MotivationService:
@@ -16,6 +23,8 @@ class MotivationService:
         """
         self.session = session
         self.motivation_repo = MotivationRepository(session)
+        self.task_repo = TaskRepository(session)
+        self.outbox = OutboxRepository(session)
 
     async def create_motivation(self, motivation_data: SMotivationCreate):
         """
@@ -24,13 +33,16 @@ class MotivationService:
         :param motivation_data: Данные для создания мотивации.
         :raises MotivationAlreadyExistsException: Если мотивация для данной задачи уже существует.
         """
-        existing_motivation = await self.motivation_repo.find_one_or_none(
-            filters=SMotivationSearch(task_id=motivation_data.task_id)
-        )
-        if existing_motivation:
+        motivation = await self.motivation_repo.insert_or_conflict(values=motivation_data,
+                                                                   conflict_columns=['task_id'])
+        if motivation is None:
             raise MotivationAlreadyExistsException
 
-        await self.motivation_repo.add(values=motivation_data)
+        # Исполнитель задачи в событии нужен рейтингам: оценка учитывается в его средней
+        audience = await self.task_repo.get_audience(motivation.task_id)
+        payload = {"id": motivation.id, **motivation_data.model_dump(mode="json"),
+                   "assigned_to": audience[1] if audience else None}
+        await self.outbox.add_event("motivation.created", motivation.id, payload, audience=audience)
         return {'message': 'Оценка успешно создана'}
 
     async def update_motivation(self, motivation_id: int, motivation_data: SMotivationUpdate):
@@ -39,12 +51,17 @@ class MotivationService:
 
         :param motivation_id: Идентификатор мотивации для обновления.
         :param motivation_data: Новые данные мотивации.
+        :return: Обновленная мотивация.
         :raises MotivationNotFoundException: Если мотивация не найдена или данные не обновлены.
         """
-        rowcount = await self.motivation_repo.update(filters=SMotivationSearchID(id=motivation_id),
-                                                     values=motivation_data)
-        if rowcount == 0:
+        motivations = await self.motivation_repo.update_returning(filters=SMotivationSearchID(id=motivation_id),
+                                                                  values=motivation_data)
+        if not motivations:
             raise MotivationNotFoundException
+        motivation = motivations[0]
+        await self.outbox.add_event("motivation.updated", motivation_id, jsonable_encoder(motivation.to_dict()),
+                                    audience=await self.task_repo.get_audience(motivation.task_id))
+        return motivation
 
     async def delete_motivation(self, motivation_id: int):
         """
@@ -53,9 +70,11 @@ class MotivationService:
         :param motivation_id: Идентификатор мотивации для удаления.
         :raises MotivationNotFoundException: Если мотивация не найдена или не удалена.
         """
-        rowcount = await self.motivation_repo.delete(filters=SMotivationSearchID(id=motivation_id))
-        if rowcount == 0:
+        deleted = await self.motivation_repo.delete_returning(filters=SMotivationSearchID(id=motivation_id))
+        if not deleted:
             raise MotivationNotFoundException
+        await self.outbox.add_event("motivation.deleted", motivation_id, jsonable_encoder(deleted[0]),
+                                    audience=await self.task_repo.get_audience(deleted[0]["task_id"]))
 
     async def get_all_motivations(self):
         """
@@ -67,20 +86,22 @@ class MotivationService:
 
     async def get_motivation_by_id(self, motivation_id: int):
         """
-        Получение мотивации по ее идентификатору.
+        Получение мотивации по ее идентификатору (с поиском в архиве).
 
         :param motivation_id: Идентификатор мотивации.
         :return: Данные мотивации.
         :raises MotivationNotFoundException: Если мотивация не найдена.
         """
         motivation = await self.motivation_repo.find_one_or_none_by_id(motivation_id)
+        if not motivation:
+            motivation = await MotivationArchiveRepository(self.session).find_one_or_none_by_id(motivation_id)
         if not motivation:
             raise MotivationNotFoundException
         return motivation
 
     async def get_motivation_by_taskid(self, task_id: int):
         """
-        Получение мотивации по ее идентификатору.
+        Получение мотивации по идентификатору задачи (с поиском в архиве).
 
         :param task_id: Идентификатор задачи.
         :return: Данные мотивации.
@@ -89,6 +110,30 @@ class MotivationService:
         motivation = await self.motivation_repo.find_one_or_none(
             filters=SMotivationSearch(task_id=task_id)
         )
+        if not motivation:
+            motivation = await MotivationArchiveRepository(self.session).find_one_or_none(
+                filters=SMotivationSearch(task_id=task_id)
+            )
         if not motivation:
             raise MotivationNotFoundException
         return motivation
+
+    @staticmethod
+    def get_leaderboard(kind: str, scope_id: int, limit: int) -> SLeaderboard:
+        """
+        Получение рейтинга пользователей компании или структуры по средней оценке за период.
+
+        Рейтинг читается из памяти процесса, к базе данных запрос не обращается.
+
+        :param kind: Тип области ("company" или "structure").
+        :param scope_id: Идентификатор компании или структуры.
+        :param limit: Количество мест.
+        :return: Рейтинг с именами пользователей.
+        """
+        entries = [
+            SLeaderboardEntry(rank=rank, user_id=user_id, name=user_directory.get_name(user_id), average=average,
+                              ratings=count)
+            for rank, (user_id, average, count) in enumerate(leaderboard.top(kind, scope_id, limit), start=1)
+        ]
+        return SLeaderboard(kind=kind, scope_id=scope_id, period_days=settings.LEADERBOARD_PERIOD_DAYS,
+                            entries=entries)
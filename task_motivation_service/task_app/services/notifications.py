@@ -0,0 +1,85 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Optional
+
+import asyncpg
+from loguru import logger
+
+from task_motivation_service.task_app.core.config import database_url, settings
+from task_motivation_service.task_app.core.pubsub import EVENTS_CHANNEL, LocalBroker, broker
+from task_motivation_service.task_app.services.revocation import token_denylist
+
+
+class NotificationListener:
+    """
+    Слушатель канала Postgres LISTEN/NOTIFY, передающий события в pub/sub процесса.
+
+    Каждый процесс держит одно выделенное соединение (вне пула), поэтому событие, зафиксированное
+    в любом процессе, доходит до подписчиков всех процессов.
+    """
+
+    def __init__(self, broker: LocalBroker = broker, channel: str = EVENTS_CHANNEL):
+        self.broker = broker
+        self.channel = channel
+        self._connection: Optional[asyncpg.Connection] = None
+
+    async def ensure_connected(self) -> None:
+        """Подключается к каналу, если соединения нет или оно было потеряно."""
+        if self._connection is not None and not self._connection.is_closed():
+            return
+        self._connection = await asyncpg.connect(database_url.replace("postgresql+asyncpg://", "postgresql://"))
+        await self._connection.add_listener(self.channel, self._on_notification)
+        logger.info(f"Подписка на канал уведомлений {self.channel} установлена.")
+
+    async def close(self) -> None:
+        """Закрывает соединение слушателя."""
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.error(f"Некорректное уведомление в канале {channel}: {payload[:200]}")
+            return
+        self.broker.publish(message.pop("users", ()), message)
+
+
+notification_listener = NotificationListener()
+
+
+async def stream_events(claims: dict, broker: LocalBroker = broker) -> AsyncIterator[str]:
+    """
+    Поток событий пользователя в формате Server-Sent Events.
+
+    При отсутствии событий отправляется комментарий-heartbeat, чтобы прокси не закрывали соединение.
+    Перед каждой отправкой проверяются срок действия и отзыв токена, с которым открыт поток:
+    истекший или отозванный токен закрывает поток, и клиент переподключается с новым.
+
+    :param claims: Полезная нагрузка проверенного access-токена подписчика.
+    :param broker: Pub/sub процесса.
+    """
+    user_id = int(claims["sub"])
+    expires_at = float(claims["exp"])
+    jti = claims.get("jti")
+    queue = broker.subscribe(user_id)
+    try:
+        yield f"retry: {int(settings.SSE_RETRY_MS)}\n\n"
+        while True:
+            timeout = min(settings.SSE_HEARTBEAT_INTERVAL, expires_at - time.time())
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                message = None
+            if expires_at <= time.time() or (jti and token_denylist.is_revoked(jti)):
+                logger.info(f"Поток событий пользователя {user_id} закрыт: токен истек или отозван.")
+                return
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(message, ensure_ascii=False)
+            yield f"id: {message['id']}\nevent: {message['event_type']}\ndata: {data}\n\n"
+    finally:
+        broker.unsubscribe(user_id, queue)
@@ -1,9 +1,48 @@
+from datetime import timedelta
+from typing import Dict, Iterable, List, Sequence
+
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from task_motivation_service.task_app.core.cache import TTLCache, pop_after_commit
+from task_motivation_service.task_app.core.config import settings
 from task_motivation_service.task_app.exceptions.task_meet_exceptions import (TaskAlreadyExistsException,
-                                                                              TaskNotFoundException)
-from task_motivation_service.task_app.repositories.task_repository import TaskRepository
-from task_motivation_service.task_app.schemas.task_schema import STaskCreate, STaskSearch, STaskUpdate, STaskSearchID
+                                                                              TaskNotFoundException,
+                                                                              UserNotFoundException)
+from task_motivation_service.task_app.models.task_model import StatusEnum
+from task_motivation_service.task_app.repositories.archive_repository import TaskArchiveRepository
+from task_motivation_service.task_app.repositories.outbox_repository import OutboxRepository
+from task_motivation_service.task_app.repositories.task_repository import MotivationRepository, TaskRepository
+from task_motivation_service.task_app.schemas.task_schema import (STaskCreate, STaskUpdate, STaskSearchID,
+                                                                  SUserPerformance, SUserWorkload)
+from task_motivation_service.task_app.services.user_directory import user_directory
+
+
+# Нагрузка исполнителей: идентификатор пользователя -> счетчики задач. Короткое время жизни ограничивает
+# устаревание при изменениях в других процессах; изменения в этом процессе сбрасывают запись после коммита
+workload_cache: TTLCache[SUserWorkload] = TTLCache(maxsize=settings.WORKLOAD_CACHE_SIZE,
+                                                   ttl=settings.WORKLOAD_CACHE_TTL)
+
+
+def summarize_workload(user_ids: Iterable[int], rows: Iterable) -> Dict[int, SUserWorkload]:
+    """
+    Собирает нагрузку исполнителей из строк (assigned_to, status, total, overdue).
+
+    :param user_ids: Идентификаторы исполнителей; у исполнителей без задач все счетчики нулевые.
+    :param rows: Строки запроса TaskRepository.count_workload.
+    :return: Словарь идентификатор пользователя -> нагрузка.
+    """
+    workloads = {
+        user_id: SUserWorkload(user_id=user_id, total=0, overdue=0,
+                               by_status={status.value: 0 for status in StatusEnum})
+        for user_id in user_ids
+    }
+    for user_id, status, total, overdue in rows:
+        workload = workloads[user_id]
+        workload.by_status[status.value] = total
+        workload.total += total
+        workload.overdue += overdue
+    return workloads
 
 
 class TaskService:
@@ -15,6 +54,7 @@ class TaskService:
         """
         self.session = session
         self.task_repo = TaskRepository(session)
+        self.outbox = OutboxRepository(session)
 
     async def create_task(self, task_data: STaskCreate):
         """
@@ -22,25 +62,36 @@ class TaskService:
 
         :param task_data: Данные для создания задачи.
         :raises TaskAlreadyExistsException: Если задача с таким именем уже существует.
+        :raises UserNotFoundException: Если постановщика или исполнителя нет в справочнике пользователей.
         """
-        existing_task = await self.task_repo.find_one_or_none(filters=STaskSearch(title=task_data.title))
-        if existing_task:
+        if user_directory.missing((task_data.assigned_by, task_data.assigned_to)):
+            raise UserNotFoundException
+
+        task = await self.task_repo.insert_or_conflict(values=task_data, conflict_columns=['title'])
+        if task is None:
             raise TaskAlreadyExistsException
+        pop_after_commit(self.session, workload_cache, task.assigned_to)
 
-        await self.task_repo.add(values=task_data)
+        await self.outbox.add_event("task.created", task.id, {"id": task.id, **task_data.model_dump(mode="json")},
+                                    audience=(task.assigned_by, task.assigned_to))
         return {"message": "Задача успешно создана"}
 
     async def update_task(self, task_id: int, task_data: STaskUpdate):
         """
         Обновление данных задачи по ее идентификатору.
 
-        :param task_id: Идентификатор компании для обновления.
-        :param task_data: Новые данные компании.
-        :raises CompanyNotFoundException: Если компания не найдена или данные не обновлены.
+        :param task_id: Идентификатор задачи для обновления.
+        :param task_data: Новые данные задачи.
+        :return: Обновленная задача.
+        :raises TaskNotFoundException: Если задача не найдена или данные не обновлены.
         """
-        rowcount = await self.task_repo.update(filters=STaskSearchID(id=task_id), values=task_data)
-        if rowcount == 0:
+        task = await self.task_repo.update_task_returning(task_id, task_data)
+        if task is None:
             raise TaskNotFoundException
+        pop_after_commit(self.session, workload_cache, task.assigned_to)
+        await self.outbox.add_event("task.updated", task_id, jsonable_encoder(task.to_dict()),
+                                    audience=(task.assigned_by, task.assigned_to))
+        return task
 
     async def delete_task(self, task_id: int):
         """
@@ -49,28 +100,96 @@ class TaskService:
         :param task_id: Идентификатор задачи для удаления.
         :raises TaskNotFoundException: Если задача не найдена или не удалена.
         """
-        rowcount = await self.task_repo.delete(filters=STaskSearchID(id=task_id))
-        if rowcount == 0:
+        deleted = await self.task_repo.delete_returning(filters=STaskSearchID(id=task_id))
+        if not deleted:
             raise TaskNotFoundException
+        pop_after_commit(self.session, workload_cache, deleted[0]["assigned_to"])
+        await self.outbox.add_event("task.deleted", task_id, jsonable_encoder(deleted[0]),
+                                    audience=(deleted[0]["assigned_by"], deleted[0]["assigned_to"]))
 
-    async def get_all_tasks(self):
+    async def get_all_tasks(self, fields: Sequence[str] = ()):
         """
         Получение списка всех задач.
 
+        :param fields: Колонки ответа (по умолчанию задачи целиком).
         :return: Список всех задач.
         """
+        if fields:
+            return await self.task_repo.find_all_fields(fields)
         tasks = await self.task_repo.find_all()
         return tasks
 
-    async def get_task_by_id(self, task_id: int):
+    async def get_workload(self, user_ids: Sequence[int]) -> List[SUserWorkload]:
+        """
+        Получение нагрузки исполнителей: количество задач по статусам и просроченных задач.
+
+        Нагрузка, которой нет в кэше, подсчитывается одним запросом для всех таких исполнителей.
+
+        :param user_ids: Идентификаторы исполнителей.
+        :return: Нагрузка исполнителей в порядке идентификаторов.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        workloads = {user_id: workload_cache.get(user_id) for user_id in user_ids}
+        missing = [user_id for user_id, workload in workloads.items() if workload is None]
+        if missing:
+            counted = summarize_workload(missing, await self.task_repo.count_workload(missing))
+            for user_id, workload in counted.items():
+                workload_cache.set(user_id, workload)
+            workloads.update(counted)
+        return [workloads[user_id] for user_id in user_ids]
+
+    async def get_performance(self, user_ids: Sequence[int]) -> List[SUserPerformance]:
+        """
+        Получение показателей исполнителей: нагрузки по задачам и средней оценки за период рейтингов.
+
+        :param user_ids: Идентификаторы исполнителей.
+        :return: Показатели исполнителей в порядке идентификаторов.
+        """
+        workloads = await self.get_workload(user_ids)
+        ratings = {
+            user_id: (float(average), count)
+            for user_id, average, count in await MotivationRepository(self.session).rating_stats(
+                [workload.user_id for workload in workloads], timedelta(days=settings.LEADERBOARD_PERIOD_DAYS))
+        }
+        performance = []
+        for workload in workloads:
+            average, count = ratings.get(workload.user_id, (None, 0))
+            performance.append(SUserPerformance(**workload.model_dump(), rating_average=average, ratings=count))
+        return performance
+
+    async def get_task_by_id(self, task_id: int, fields: Sequence[str] = ()):
         """
         Получение задачи по ее идентификатору.
 
+        Задача, которой нет в рабочей таблице, ищется в архиве.
+
         :param task_id: Идентификатор задачи.
+        :param fields: Колонки ответа (по умолчанию задача целиком).
         :return: Данные задачи.
         :raises TaskNotFoundException: Если задача не найдена.
         """
-        task = await self.task_repo.find_one_or_none_by_id(task_id)
+        if fields:
+            task = await self.task_repo.find_fields_by_id(task_id, fields)
+            if not task:
+                task = await TaskArchiveRepository(self.session).find_fields_by_id(task_id, fields)
+        else:
+            task = await self.task_repo.find_one_or_none_by_id(task_id)
+            if not task:
+                task = await TaskArchiveRepository(self.session).find_one_or_none_by_id(task_id)
         if not task:
             raise TaskNotFoundException
         return task
+
+    async def get_task_details(self, task_id: int) -> dict:
+        """
+        Получение задачи с именами постановщика и исполнителя из справочника пользователей.
+
+        :param task_id: Идентификатор задачи.
+        :return: Данные задачи с полями assigned_by_name и assigned_to_name.
+        :raises TaskNotFoundException: Если задача не найдена.
+        """
+        task = await self.get_task_by_id(task_id)
+        details = task.to_dict()
+        details['assigned_by_name'] = user_directory.get_name(task.assigned_by)
+        details['assigned_to_name'] = user_directory.get_name(task.assigned_to)
+        return details
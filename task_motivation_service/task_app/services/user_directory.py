@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.database.database import async_session_maker
+from task_motivation_service.task_app.repositories.directory_repository import DirectoryUserRepository
+from task_motivation_service.task_app.schemas.directory_schema import SDirectoryPage, SDirectoryUser
+
+
+class DirectoryEntry(NamedTuple):
+    """Компактная запись справочника пользователей в памяти процесса."""
+    id: int
+    first_name: str
+    last_name: str
+    company_id: Optional[int]
+    status: str
+    structure_ids: Tuple[int, ...] = ()
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+
+class UserDirectory:
+    """
+    Справочник пользователей в памяти процесса.
+
+    Заполняется из таблицы реплики при старте и поддерживается в актуальном состоянии
+    синхронизацией, поэтому проверка существования и получение имени — поиск в словаре.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, DirectoryEntry] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._entries
+
+    def get(self, user_id: int) -> Optional[DirectoryEntry]:
+        """Возвращает запись пользователя или None."""
+        return self._entries.get(user_id)
+
+    def get_name(self, user_id: int) -> Optional[str]:
+        """Возвращает полное имя пользователя или None."""
+        entry = self._entries.get(user_id)
+        return entry.full_name if entry else None
+
+    def missing(self, user_ids: Iterable[int]) -> List[int]:
+        """
+        Возвращает идентификаторы, которых нет в справочнике.
+
+        Пока справочник ни разу не был загружен, проверка не выполняется.
+        """
+        if not self.ready:
+            return []
+        return [user_id for user_id in user_ids if user_id not in self._entries]
+
+    def apply(self, records: Iterable[SDirectoryUser]) -> None:
+        """Применяет записи реплики к справочнику в памяти."""
+        for record in records:
+            self._entries[record.id] = DirectoryEntry(
+                id=record.id,
+                first_name=record.first_name,
+                last_name=record.last_name,
+                company_id=record.company_id,
+                status=record.status,
+                structure_ids=tuple(record.structure_ids),
+            )
+
+    def remove(self, user_id: int) -> None:
+        """Удаляет пользователя из справочника."""
+        self._entries.pop(user_id, None)
+
+
+user_directory = UserDirectory()
+
+
+class UserDirectorySync:
+    """
+    Инкрементальная синхронизация реплики справочника с сервисом пользователей.
+
+    Сервис пользователей -> таблица реплики (sync_once), таблица реплики -> память процесса (refresh).
+    Через таблицу изменения, в том числе удаления из событий, доходят до всех процессов.
+    """
+
+    def __init__(self, directory: UserDirectory = user_directory):
+        self.directory = directory
+        self.base_url = settings.USER_SERVICE_URL
+        self._watermark: Optional[datetime] = None
+
+    async def load(self) -> None:
+        """Загружает справочник в память из локальной таблицы реплики."""
+        await self.refresh()
+        if len(self.directory):
+            self.directory.ready = True
+        logger.info(f"Справочник пользователей загружен из реплики: {len(self.directory)} записей.")
+
+    async def refresh(self) -> None:
+        """Применяет к памяти процесса записи реплики, измененные с прошлого обновления."""
+        since = self._watermark - timedelta(seconds=settings.USER_DIRECTORY_SYNC_OVERLAP) if self._watermark else None
+        async with async_session_maker() as session:
+            records = await DirectoryUserRepository(session).find_changed_locally(since)
+        for record in records:
+            if record.deleted_at is not None:
+                self.directory.remove(record.id)
+            else:
+                self.directory.apply((SDirectoryUser.model_validate(record),))
+            if self._watermark is None or record.updated_at > self._watermark:
+                self._watermark = record.updated_at
+
+    async def sync_once(self) -> int:
+        """
+        Забирает изменения из сервиса пользователей постранично и сохраняет их в реплику.
+
+        Курсор — время последнего изменения в реплике. Запрос начинается немного раньше курсора,
+        чтобы не потерять записи из транзакций, зафиксированных позже их времени изменения;
+        повторно полученные записи применяются идемпотентно.
+
+        :return: Количество полученных записей.
+        """
+        async with async_session_maker() as session:
+            repository = DirectoryUserRepository(session)
+            cursor = await repository.get_sync_cursor()
+            since = cursor - timedelta(seconds=settings.USER_DIRECTORY_SYNC_OVERLAP) if cursor else None
+            after_id = 0
+            total = 0
+            headers = {"X-Internal-Token": settings.INTERNAL_API_TOKEN}
+            async with httpx.AsyncClient(base_url=self.base_url, headers=headers) as client:
+                while True:
+                    params = {"after_id": after_id, "limit": settings.USER_DIRECTORY_SYNC_BATCH}
+                    if since is not None:
+                        params["since"] = since.isoformat()
+                    response = await client.get("/internal/users/changes", params=params)
+                    response.raise_for_status()
+                    page = SDirectoryPage.model_validate(response.json())
+                    if page.items:
+                        await repository.upsert_many(page.items)
+                        await session.commit()
+                        total += len(page.items)
+                        last = page.items[-1]
+                        since, after_id = last.source_updated_at, last.id
+                    if not page.has_more:
+                        break
+        self.directory.ready = True
+        if total:
+            logger.info(f"Синхронизировано {total} записей справочника пользователей.")
+        return total
+
+
+user_directory_sync = UserDirectorySync()
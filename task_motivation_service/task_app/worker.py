@@ -0,0 +1,30 @@
+"""
+Отдельный процесс обработки фоновых задач.
+
+Запуск: python -m task_motivation_service.task_app.worker
+Вместе с ним в приложении можно отключить встроенный обработчик (JOB_WORKER_IN_APP=false),
+чтобы тяжелые задачи не выполнялись в процессах, обслуживающих запросы.
+"""
+import asyncio
+import signal
+
+from loguru import logger
+
+from task_motivation_service.task_app.services import event_handlers  # noqa: F401  регистрация обработчиков
+from task_motivation_service.task_app.services.jobs import job_worker
+
+
+async def main() -> None:
+    """Запускает обработчик фоновых задач и останавливает его по SIGINT/SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    job_worker.start()
+    await stop.wait()
+    logger.info("Получен сигнал остановки, завершение текущих задач...")
+    await job_worker.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
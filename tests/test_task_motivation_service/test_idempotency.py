@@ -0,0 +1,54 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+from starlette.datastructures import Headers
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.middlewares.idempotency import IdempotencyMiddleware
+
+
+@pytest.fixture
+def counting_app():
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, paths=["/items/create"])
+    app.state.calls = 0
+
+    @app.post("/items/create")
+    async def create_item(item: dict):
+        app.state.calls += 1
+        return {"number": app.state.calls, **item}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_response(counting_app):
+    async with AsyncClient(transport=ASGITransport(app=counting_app), base_url="http://localhost") as client:
+        headers = {"Idempotency-Key": "create-item-1"}
+        first = await client.post("/items/create", json={"name": "a"}, headers=headers)
+        second = await client.post("/items/create", json={"name": "a"}, headers=headers)
+        conflict = await client.post("/items/create", json={"name": "b"}, headers=headers)
+        without_key = await client.post("/items/create", json={"name": "a"})
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert conflict.status_code == 422
+    assert without_key.json()["number"] == 2
+    assert counting_app.state.calls == 2
+
+
+def test_idempotency_key_is_scoped_by_token_subject():
+    def cookie(sub: str, exp: float) -> Headers:
+        token = jwt.encode({"sub": sub, "exp": int(exp), "jti": f"{sub}-{exp}"}, settings.SECRET_KEY,
+                           algorithm=settings.ALGORITHM)
+        return Headers({"cookie": f"user_access_token={token}"})
+
+    # Новый токен того же пользователя дает тот же ключ, поддельный или истекший — анонимный
+    assert IdempotencyMiddleware._principal(cookie("7", time.time() + 600)) == "7"
+    assert IdempotencyMiddleware._principal(cookie("7", time.time() + 900)) == "7"
+    assert IdempotencyMiddleware._principal(cookie("7", time.time() - 10)) == ""
+    assert IdempotencyMiddleware._principal(Headers({"cookie": "user_access_token=forged"})) == ""
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from task_motivation_service.task_app.schemas.directory_schema import SDirectoryUser
+from task_motivation_service.task_app.services.leaderboard import Leaderboard
+from task_motivation_service.task_app.services.user_directory import UserDirectory
+
+
+def make_board(size: int = 2) -> Leaderboard:
+    directory = UserDirectory()
+    directory.apply(
+        SDirectoryUser(id=user_id, first_name="Имя", last_name=str(user_id), company_id=1, status="user",
+                       structure_ids=structure_ids, source_updated_at=datetime(2026, 1, 1))
+        for user_id, structure_ids in ((1, [10]), (2, [10]), (3, [20]))
+    )
+    return Leaderboard(size=size, directory=directory)
+
+
+def event(event_type: str, motivation_id: int, **payload) -> dict:
+    return {"event_type": event_type, "aggregate_id": motivation_id, "payload": payload}
+
+
+def test_rebuild_keeps_top_by_average_per_scope():
+    board = make_board()
+    board.rebuild([(1, 1, 5), (2, 2, 4), (3, 2, 4), (4, 3, 3)])
+
+    assert board.top("company", 1) == [(1, 5.0, 1), (2, 4.0, 2)]
+    assert board.top("structure", 20) == [(3, 3.0, 1)]
+    assert board.top("structure", 99) == []
+
+
+def test_events_reposition_users_and_refill_dropped_places():
+    board = make_board()
+    board.rebuild([(1, 1, 5), (2, 2, 4), (3, 3, 3)])
+
+    board.apply_event(event("motivation.created", 5, task_id=7, rating=5, comment="отлично", assigned_to=3))
+    assert board.top("company", 1) == [(1, 5.0, 1), (3, 4.0, 2)]
+
+    board.apply_event(event("motivation.updated", 1, rating=1))
+    assert board.top("company", 1) == [(3, 4.0, 2), (2, 4.0, 1)]
+
+    board.apply_event(event("motivation.deleted", 5))
+    assert board.top("company", 1) == [(2, 4.0, 1), (3, 3.0, 1)]
+    assert board.top("structure", 10) == [(2, 4.0, 1), (1, 1.0, 1)]
+
+
+def test_events_during_rebuild_are_replayed():
+    board = make_board()
+    board.begin_rebuild()
+    board.apply_event(event("motivation.created", 2, task_id=8, rating=4, comment="хорошо", assigned_to=2))
+    board.rebuild([(1, 1, 3)])
+
+    assert board.top("company", 1) == [(2, 4.0, 1), (1, 3.0, 1)]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from task_motivation_service.task_app.core.pubsub import LocalBroker
+from task_motivation_service.task_app.services import notifications
+from task_motivation_service.task_app.services.notifications import NotificationListener, stream_events
+
+
+@pytest.mark.asyncio
+async def test_broker_delivers_only_to_audience():
+    broker = LocalBroker(queue_size=2)
+    first = broker.subscribe(1)
+    second = broker.subscribe(2)
+
+    assert broker.publish([1], {"id": 1}) == 1
+    assert first.get_nowait() == {"id": 1}
+    assert second.empty()
+
+    for number in range(3):
+        broker.publish([2], {"id": number})
+    assert [second.get_nowait()["id"] for _ in range(2)] == [1, 2]
+
+    broker.unsubscribe(1, first)
+    broker.unsubscribe(2, second)
+    assert broker.subscriptions == 0
+
+
+@pytest.mark.asyncio
+async def test_notification_reaches_stream():
+    broker = LocalBroker()
+    listener = NotificationListener(broker=broker)
+    stream = stream_events({"sub": "5", "exp": time.time() + 600}, broker=broker)
+
+    assert (await stream.__anext__()).startswith("retry:")
+    next_chunk = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    listener._on_notification(None, 0, "task_events", json.dumps(
+        {"id": 10, "event_type": "task.updated", "aggregate_id": 3, "users": [5], "payload": {"id": 3}}))
+    chunk = await asyncio.wait_for(next_chunk, timeout=1)
+
+    assert chunk.startswith("id: 10\nevent: task.updated\n")
+    assert json.loads(chunk.split("data: ", 1)[1])["payload"] == {"id": 3}
+    await stream.aclose()
+    assert broker.subscriptions == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_closes_when_token_expires_or_is_revoked(monkeypatch):
+    broker = LocalBroker()
+    expiring = stream_events({"sub": "5", "exp": time.time() + 0.05}, broker=broker)
+    assert (await expiring.__anext__()).startswith("retry:")
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(expiring.__anext__(), timeout=1)
+
+    revoked = set()
+    monkeypatch.setattr(notifications.token_denylist, "is_revoked", lambda jti: jti in revoked)
+    monkeypatch.setattr(notifications.settings, "SSE_HEARTBEAT_INTERVAL", 0.01)
+    stream = stream_events({"sub": "5", "exp": time.time() + 600, "jti": "abc"}, broker=broker)
+    assert (await stream.__anext__()).startswith("retry:")
+    assert await stream.__anext__() == ": keep-alive\n\n"
+    revoked.add("abc")
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(stream.__anext__(), timeout=1)
+    assert broker.subscriptions == 0
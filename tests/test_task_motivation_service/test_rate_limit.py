@@ -0,0 +1,85 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.core.proxy import client_ip, parse_networks
+from task_motivation_service.task_app.core.rate_limit import RatePolicy, TokenBucketStore
+from task_motivation_service.task_app.middlewares.rate_limit import RateLimitMiddleware, RouteLimit
+
+
+def make_token(user_id: str, jti: str) -> str:
+    return jwt.encode({"sub": user_id, "jti": jti, "exp": int(time.time()) + 600, "type": "access"},
+                      settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def make_scope(peer: str, forwarded: str = "") -> dict:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"type": "http", "client": (peer, 50000), "headers": headers}
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_over_time():
+    timer = FakeTimer()
+    store = TokenBucketStore(maxsize=10, timer=timer)
+    policy = RatePolicy(rate=2.0, burst=2)
+
+    assert await store.acquire("client", policy) == 0
+    assert await store.acquire("client", policy) == 0
+    assert await store.acquire("client", policy) == pytest.approx(0.5)
+
+    timer.now = 0.5
+    assert await store.acquire("client", policy) == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_middleware_returns_429():
+    app = FastAPI()
+    store = TokenBucketStore(maxsize=10, timer=FakeTimer())
+    app.add_middleware(RateLimitMiddleware, store=store,
+                       default=RouteLimit(user=RatePolicy(1.0, 1), ip=RatePolicy(1.0, 3)),
+                       routes={"/health": None})
+
+    @app.get("/items")
+    async def items():
+        return []
+
+    @app.get("/health")
+    async def health():
+        return {}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://localhost") as client:
+        first = await client.get("/items", cookies={"user_access_token": make_token("1", "a")})
+        # Новый токен того же пользователя расходует ту же корзину
+        limited = await client.get("/items", cookies={"user_access_token": make_token("1", "b")})
+        other_user = await client.get("/items", cookies={"user_access_token": make_token("2", "c")})
+        limited_ip = await client.get("/items", cookies={"user_access_token": make_token("3", "d")})
+        health = await client.get("/health")
+
+    assert first.status_code == 200
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "1"
+    assert other_user.status_code == 200
+    assert limited_ip.status_code == 429
+    assert health.status_code == 200
+
+
+def test_client_ip_trusts_forwarded_for_only_from_proxy():
+    proxies = parse_networks("127.0.0.1, 10.0.0.0/8")
+
+    assert client_ip(make_scope("127.0.0.1", "203.0.113.5"), proxies) == "203.0.113.5"
+    # Адрес, подставленный клиентом в начало цепочки, пропускается
+    assert client_ip(make_scope("127.0.0.1", "1.2.3.4, 203.0.113.5, 10.0.0.2"), proxies) == "203.0.113.5"
+    assert client_ip(make_scope("198.51.100.7", "203.0.113.5"), proxies) == "198.51.100.7"
+    assert client_ip(make_scope("127.0.0.1"), proxies) == "127.0.0.1"
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_motivation_service.task_app.models.job_model import JobStatusEnum
+from task_motivation_service.task_app.repositories.job_repository import JobRepository
+from task_motivation_service.task_app.services import jobs
+from task_motivation_service.task_app.services.jobs import JobWorker, enqueue_job, job_handler
+
+
+@pytest.mark.asyncio
+async def test_job_worker_runs_and_fails_jobs(async_session: AsyncSession):
+
+    @job_handler("test.echo")
+    async def echo(job):
+        return {"echo": job.payload["value"]}
+
+    @job_handler("test.fail")
+    async def fail(job):
+        raise RuntimeError("boom")
+
+    try:
+        echo_id = await enqueue_job(async_session, "test.echo", {"value": 1})
+        fail_id = await enqueue_job(async_session, "test.fail", {}, max_attempts=1)
+        await async_session.commit()
+
+        worker = JobWorker(concurrency=1)
+        while await worker.run_once():
+            pass
+    finally:
+        jobs._handlers.pop("test.echo")
+        jobs._handlers.pop("test.fail")
+
+    repository = JobRepository(async_session)
+    echo_job = await repository.find_one_or_none_by_id(echo_id)
+    assert echo_job.status == JobStatusEnum.DONE
+    assert echo_job.result == {"echo": 1}
+
+    failed_job = await repository.find_one_or_none_by_id(fail_id)
+    assert failed_job.status == JobStatusEnum.FAILED
+    assert failed_job.error == "boom"
+    assert failed_job.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_run_cannot_finish_reclaimed_job(async_session: AsyncSession):
+    repository = JobRepository(async_session)
+    job_id = await enqueue_job(async_session, "test.reclaimed", {}, created_by=7)
+    await async_session.commit()
+
+    first = await repository.claim_next(["test.reclaimed"], timedelta(seconds=60))
+    await async_session.commit()
+    # Первый запуск считается брошенным, и задачу захватывает другой обработчик
+    second = await repository.claim_next(["test.reclaimed"], timedelta(seconds=0))
+    await async_session.commit()
+    assert (first.id, second.id) == (job_id, job_id)
+    assert (first.attempts, second.attempts) == (1, 2)
+
+    assert not await repository.finish(job_id, 1, {"stale": True})
+    assert not await repository.fail(job_id, 1, "stale", timedelta(seconds=1))
+    assert await repository.finish(job_id, 2, {"fresh": True})
+    await async_session.commit()
+    async_session.expire_all()
+
+    job = await repository.find_one_or_none_by_id(job_id)
+    assert job.status == JobStatusEnum.DONE
+    assert job.result == {"fresh": True}
+    assert job.created_by == 7
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_motivation_service.task_app.repositories.directory_repository import DirectoryUserRepository
+from task_motivation_service.task_app.repositories.outbox_repository import OutboxRepository
+from task_motivation_service.task_app.schemas.event_schema import SEvent, SEventBatch
+from task_motivation_service.task_app.services import event_handlers  # noqa: F401
+from task_motivation_service.task_app.services.outbox import EventConsumer
+
+
+def make_batch(seq: int, event_type: str, user_id: int) -> SEventBatch:
+    payload = {"id": user_id, "first_name": "Ivan", "last_name": "Ivanov", "company_id": None,
+               "status": "user", "updated_at": "2025-01-01T10:00:00"}
+    event = SEvent(id=seq, seq=seq, event_type=event_type, aggregate_id=user_id, payload=payload,
+                   created_at="2025-01-01T10:00:00")
+    return SEventBatch(source="test_source", events=[event])
+
+
+@pytest.mark.asyncio
+async def test_consume_events_skips_processed(async_session: AsyncSession):
+    consumer = EventConsumer(async_session)
+
+    result = await consumer.consume(make_batch(1, "user.created", 501))
+    assert result.accepted == 1
+    assert result.last_seq == 1
+
+    repeated = await consumer.consume(make_batch(1, "user.created", 501))
+    assert repeated.accepted == 0
+    assert repeated.last_seq == 1
+
+    user = await DirectoryUserRepository(async_session).find_one_or_none_by_id(501)
+    assert user.first_name == "Ivan"
+
+    await consumer.consume(make_batch(2, "user.deleted", 501))
+    await async_session.refresh(user)
+    assert user.deleted_at is not None
+    await async_session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_assigns_delivery_seq(async_session: AsyncSession):
+    repository = OutboxRepository(async_session)
+    await repository.add_event("task.created", 1, {"id": 1})
+    await repository.add_event("task.deleted", 1, {"id": 1})
+
+    events = await repository.claim_batch(10)
+    assert [event.event_type for event in events] == ["task.created", "task.deleted"]
+    assert events[0].delivery_seq < events[1].delivery_seq
+    await async_session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_resends_unconfirmed_events_with_same_seq(async_session: AsyncSession):
+    repository = OutboxRepository(async_session)
+    await repository.add_event("task.created", 2, {"id": 2})
+    first = await repository.claim_batch(10)
+    seqs = [event.delivery_seq for event in first]
+
+    # Доставка не подтверждена: новое событие получает следующий номер, старое — прежний
+    await repository.add_event("task.updated", 2, {"id": 2})
+    again = await repository.claim_batch(10)
+    assert [event.delivery_seq for event in again][:len(seqs)] == seqs
+    assert again[-1].event_type == "task.updated"
+    assert again[-1].delivery_seq > seqs[-1]
+
+    await repository.mark_published([event.id for event in again])
+    assert await repository.claim_batch(10) == []
+    await async_session.rollback()
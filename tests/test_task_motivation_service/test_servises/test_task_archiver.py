@@ -0,0 +1,66 @@
+import csv
+import gzip
+import os
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.repositories.archive_repository import (PARTITION_SUFFIX, TaskArchiveRepository,
+                                                                              next_month)
+from task_motivation_service.task_app.schemas.task_schema import STaskCreate
+from task_motivation_service.task_app.services.archiver import TaskArchiver, months_ago
+from task_motivation_service.task_app.services.task_service import TaskService
+
+
+def test_partition_month_bounds():
+    assert next_month(date(2025, 12, 1)) == date(2026, 1, 1)
+    assert next_month(date(2025, 3, 1)) == date(2025, 4, 1)
+    assert months_ago(date(2026, 1, 15), 1) == date(2025, 12, 1)
+    assert months_ago(date(2026, 10, 19), 24) == date(2024, 10, 1)
+    assert PARTITION_SUFFIX.search("taskarchives_2025_01").groups() == ("2025", "01")
+    assert PARTITION_SUFFIX.search("taskarchives_default") is None
+
+
+@pytest.mark.asyncio
+async def test_archive_done_task_and_export_expired_partition(async_session: AsyncSession, mocked_authenticated_client,
+                                                              monkeypatch, tmp_path):
+    service = TaskService(session=async_session)
+    await service.create_task(STaskCreate(title="Archived long ago",
+                                          content="This is a test task.",
+                                          assigned_by=1,
+                                          assigned_to=2,
+                                          deadline="2019-03-31T17:00:00",
+                                          comment="Comment",
+                                          status="DONE"))
+    await async_session.execute(text(
+        "UPDATE tasks SET created_at = '2019-03-10', updated_at = '2019-03-20' WHERE title = 'Archived long ago'"
+    ))
+    task_id = (await async_session.execute(text("SELECT id FROM tasks WHERE title = 'Archived long ago'"))).scalar()
+    await async_session.commit()
+    monkeypatch.setattr(settings, "ARCHIVE_EXPORT_DIR", str(tmp_path))
+
+    # Срок хранения с запасом: задача переносится в архив, но секция еще не выгружается
+    monkeypatch.setattr(settings, "ARCHIVE_RETENTION_MONTHS", 1200)
+    assert await TaskArchiver(batch_size=10).archive_once() >= 1
+
+    task = await TaskService(session=async_session).get_task_by_id(task_id)
+    assert task.title == "Archived long ago"
+    remaining = await async_session.execute(text("SELECT count(*) FROM tasks WHERE id = :id"), {"id": task_id})
+    assert remaining.scalar() == 0
+    await async_session.rollback()
+
+    monkeypatch.setattr(settings, "ARCHIVE_RETENTION_MONTHS", 24)
+    await TaskArchiver(batch_size=10).archive_once()
+
+    path = os.path.join(tmp_path, "taskarchives_2019_03.csv.gz")
+    with gzip.open(path, "rt", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["title"] for row in rows if int(row["id"]) == task_id] == ["Archived long ago"]
+    partitions = [name for name, _ in await TaskArchiveRepository(async_session).list_partitions()]
+    assert "taskarchives_2019_03" not in partitions
+    with pytest.raises(HTTPException):
+        await TaskService(session=async_session).get_task_by_id(task_id)
@@ -61,7 +61,9 @@ async def test_update_task(async_session: AsyncSession, mocked_authenticated_cli
     await service.create_task(task_data)
 
     update_data = STaskUpdate(comment="Comment test", status="IN_WORK")
-    await service.update_task(9, update_data)
+    returned_task = await service.update_task(9, update_data)
+    assert returned_task.id == 9
+    assert returned_task.comment == update_data.comment
 
     updated_task = await service.get_task_by_id(9)
     assert updated_task.comment == update_data.comment
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_motivation_service.task_app.schemas.task_schema import STaskCreate, STaskUpdate
+from task_motivation_service.task_app.services.deadline_sweeper import DeadlineSweeper
+from task_motivation_service.task_app.services.task_service import TaskService
+
+
+@pytest.mark.asyncio
+async def test_sweep_marks_overdue_tasks_once(async_session: AsyncSession, mocked_authenticated_client):
+    service = TaskService(session=async_session)
+    for number in range(3):
+        await service.create_task(STaskCreate(title=f"Overdue {number}",
+                                              content="This is a test task.",
+                                              assigned_by=1,
+                                              assigned_to=2,
+                                              deadline="2020-01-01T10:00:00+00:00",
+                                              comment="Comment",
+                                              status="IN_WORK"))
+    await async_session.commit()
+
+    sweeper = DeadlineSweeper(batch_size=2)
+    assert await sweeper.sweep_once() >= 3
+    assert await sweeper.sweep_once() == 0
+
+    tasks = await service.get_all_tasks()
+    overdue = [task for task in tasks if task.title.startswith("Overdue")]
+    for task in overdue:
+        await async_session.refresh(task)
+        assert task.overdue_at is not None
+
+
+@pytest.mark.asyncio
+async def test_status_change_clears_overdue_mark(async_session: AsyncSession, mocked_authenticated_client):
+    service = TaskService(session=async_session)
+    await service.create_task(STaskCreate(title="Overdue reopened",
+                                          content="This is a test task.",
+                                          assigned_by=1,
+                                          assigned_to=2,
+                                          deadline="2020-01-01T10:00:00+00:00",
+                                          comment="Comment",
+                                          status="IN_WORK"))
+    await async_session.commit()
+    await DeadlineSweeper(batch_size=10).sweep_once()
+
+    task = next(task for task in await service.get_all_tasks() if task.title == "Overdue reopened")
+    await async_session.refresh(task)
+    assert task.overdue_at is not None
+
+    # Правка комментария без смены статуса отметку не снимает
+    task = await service.update_task(task.id, STaskUpdate(comment="Still overdue", status="IN_WORK"))
+    assert task.overdue_at is not None
+
+    task = await service.update_task(task.id, STaskUpdate(comment="Reopened", status="CREATED"))
+    assert task.overdue_at is None
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from task_motivation_service.task_app.core.config import settings
+from task_motivation_service.task_app.core.revocation import TokenDenylist
+from task_motivation_service.task_app.dependencies import auth_dep
+
+
+def make_token(exp: float) -> str:
+    return jwt.encode({"sub": "7", "exp": int(exp), "type": "access"}, settings.SECRET_KEY,
+                      algorithm=settings.ALGORITHM)
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth_dep._verified_tokens.clear()
+    yield
+    auth_dep._verified_tokens.clear()
+
+
+def test_decode_token_skips_verification_for_cached_token(monkeypatch):
+    token = make_token(time.time() + 600)
+    assert auth_dep.decode_token(token)["sub"] == "7"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("подпись проверена повторно")
+
+    monkeypatch.setattr(auth_dep.jwt, "decode", fail)
+    assert auth_dep.decode_token(token)["sub"] == "7"
+    assert len(auth_dep._verified_tokens) == 1
+
+
+def test_decode_token_rejects_expired_and_invalid_tokens():
+    with pytest.raises(HTTPException):
+        auth_dep.decode_token(make_token(time.time() - 10))
+    with pytest.raises(HTTPException):
+        auth_dep.decode_token("not-a-token")
+    assert len(auth_dep._verified_tokens) == 0
+
+
+def test_decode_token_rejects_revoked_cached_token(monkeypatch):
+    token = jwt.encode({"sub": "7", "exp": int(time.time() + 600), "jti": "revoked-jti"}, settings.SECRET_KEY,
+                       algorithm=settings.ALGORITHM)
+    assert auth_dep.decode_token(token)["jti"] == "revoked-jti"
+
+    monkeypatch.setattr(auth_dep, "token_denylist", TokenDenylist(capacity=10, error_rate=0.01))
+    auth_dep.token_denylist.add("revoked-jti", time.time() + 600)
+    with pytest.raises(HTTPException):
+        auth_dep.decode_token(token)
@@ -0,0 +1,18 @@
+from task_motivation_service.task_app.models.task_model import StatusEnum
+from task_motivation_service.task_app.services.task_service import summarize_workload
+
+
+def test_summarize_workload_groups_rows_by_user():
+    rows = [
+        (1, StatusEnum.CREATED, 2, 1),
+        (1, StatusEnum.DONE, 5, 0),
+        (2, StatusEnum.IN_WORK, 3, 3),
+    ]
+    workloads = summarize_workload([1, 2, 3], rows)
+
+    assert workloads[1].total == 7
+    assert workloads[1].overdue == 1
+    assert workloads[1].by_status == {"created": 2, "in_work": 0, "done": 5}
+    assert workloads[2].by_status["in_work"] == 3
+    assert workloads[3].total == 0
+    assert workloads[3].by_status == {"created": 0, "in_work": 0, "done": 0}
@@ -0,0 +1,68 @@
+import json
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from user_team_service.user_app.core.cache import TTLCache, apply_invalidation, pop_after_commit, shared_cache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+    cache.set("feed", [1, 2])
+    assert cache.get("feed") == [1, 2]
+
+    timer.now = 5.0
+    assert cache.get("feed") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+
+
+def test_pop_after_commit_waits_for_commit():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set(1, "feed")
+    cache.set(2, "feed")
+    with Session(create_engine("sqlite://")) as session:
+        session.execute(text("select 1"))
+        pop_after_commit(session, cache, 1)
+        assert cache.get(1) == "feed"
+        session.commit()
+        assert cache.get(1) is None
+
+        session.execute(text("select 1"))
+        pop_after_commit(session, cache, 2)
+        session.rollback()
+        session.commit()
+    assert cache.get(2) == "feed"
+
+
+def test_invalidation_message_pops_shared_cache_entry():
+    cache = shared_cache("test_feed", TTLCache(maxsize=10, ttl=60))
+    cache.set(1, "page 1")
+    cache.set(2, "page 2")
+
+    apply_invalidation(json.dumps({"cache": "test_feed", "key": 1}))
+    apply_invalidation(json.dumps({"cache": "unknown", "key": 2}))
+    apply_invalidation("not json")
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "page 2"
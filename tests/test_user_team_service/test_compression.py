@@ -0,0 +1,55 @@
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from user_team_service.user_app.middlewares.compression import CompressionMiddleware, negotiate_encoding
+
+ITEMS = [{"id": i, "name": f"Пользователь {i}"} for i in range(200)]
+
+
+def make_client() -> TestClient:
+    async def items(request):
+        return JSONResponse(ITEMS)
+
+    async def small(request):
+        return PlainTextResponse("ok")
+
+    async def stream(request):
+        return StreamingResponse(iter([b"x" * 600, b"y" * 600]), media_type="text/plain")
+
+    app = Starlette(routes=[Route("/items", items), Route("/small", small), Route("/stream", stream)])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+def test_negotiate_encoding_respects_weights_and_server_preference():
+    assert negotiate_encoding("gzip, br", ("br", "gzip")) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br;q=0, *", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("identity", ("br", "gzip")) is None
+    assert negotiate_encoding("", ("gzip",)) is None
+
+
+def test_large_responses_are_compressed_and_small_ones_are_not():
+    client = make_client()
+
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == ITEMS
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+    response = client.get("/items", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_compressed_in_parts():
+    response = make_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == b"x" * 600 + b"y" * 600
@@ -0,0 +1,18 @@
+import pytest
+
+from user_team_service.user_app.dependencies import internal_dep
+from user_team_service.user_app.dependencies.internal_dep import verify_internal_token
+from user_team_service.user_app.exceptions.auth_exceptions import ForbiddenException
+
+
+def test_internal_token_is_required(monkeypatch):
+    monkeypatch.setattr(internal_dep.settings, "INTERNAL_API_TOKEN", "secret")
+    verify_internal_token("secret")
+    for token in (None, "", "other"):
+        with pytest.raises(type(ForbiddenException)):
+            verify_internal_token(token)
+
+    # Пустой секрет в настройках не открывает доступ
+    monkeypatch.setattr(internal_dep.settings, "INTERNAL_API_TOKEN", "")
+    with pytest.raises(type(ForbiddenException)):
+        verify_internal_token("")
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from user_team_service.user_app.core.loader import DataLoader
+
+
+class RecordingBatchLoad:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, keys):
+        self.calls.append(list(keys))
+        if self.fail:
+            raise RuntimeError("db error")
+        return {key: f"record-{key}" for key in keys if key != 404}
+
+
+@pytest.mark.asyncio
+async def test_loader_batches_keys_from_one_tick():
+    batch_load = RecordingBatchLoad()
+    loader = DataLoader(batch_load)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(404))
+
+    assert results == ["record-1", "record-2", "record-1", None]
+    assert batch_load.calls == [[1, 2, 404]]
+
+
+@pytest.mark.asyncio
+async def test_loader_memoizes_until_cleared():
+    batch_load = RecordingBatchLoad()
+    loader = DataLoader(batch_load)
+
+    assert await loader.load_many([3, 4]) == ["record-3", "record-4"]
+    assert await loader.load(3) == "record-3"
+    assert batch_load.calls == [[3, 4]]
+
+    loader.clear()
+    await loader.load(3)
+    assert batch_load.calls == [[3, 4], [3]]
+
+
+@pytest.mark.asyncio
+async def test_loader_does_not_memoize_errors():
+    batch_load = RecordingBatchLoad(fail=True)
+    loader = DataLoader(batch_load)
+
+    with pytest.raises(RuntimeError):
+        await loader.load(5)
+    batch_load.fail = False
+    assert await loader.load(5) == "record-5"
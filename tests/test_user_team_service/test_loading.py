@@ -0,0 +1,34 @@
+import pytest
+from fastapi import HTTPException
+
+from user_team_service.user_app.core.loading import to_schema
+from user_team_service.user_app.dependencies.include_dep import fields_param, include_param
+from user_team_service.user_app.models import News, User
+from user_team_service.user_app.repositories.auth_repository import UsersRepository
+from user_team_service.user_app.repositories.teams_repository import NewsRepository
+from user_team_service.user_app.schemas.news_schema import SNewsDetail
+
+
+def test_include_param_parses_and_rejects_unknown_names():
+    dependency = include_param(NewsRepository.loading_profiles)
+    assert dependency(include=None) == ()
+    assert dependency(include="author, author") == ("author",)
+    with pytest.raises(HTTPException) as error:
+        dependency(include="author,comments")
+    assert error.value.status_code == 400
+
+
+def test_to_schema_reads_only_loaded_relationships():
+    news = News(id=1, title="Новость", content="c" * 60, author_id=2, company_id=3)
+    assert to_schema(SNewsDetail, news).author is None
+
+    news.author = User(id=2, first_name="Иван", last_name="Иванов")
+    assert to_schema(SNewsDetail, news).author.first_name == "Иван"
+
+
+def test_fields_param_does_not_expose_password():
+    dependency = fields_param(UsersRepository.selectable_fields)
+    assert dependency(fields="email,first_name") == ("email", "first_name")
+    with pytest.raises(HTTPException) as error:
+        dependency(fields="email,password")
+    assert error.value.status_code == 400
@@ -0,0 +1,83 @@
+from user_team_service.user_app.core.proxy import client_ip, parse_networks
+from user_team_service.user_app.services.login_throttle import LoginThrottle
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_login_throttle_blocks_email_after_limit():
+    timer = FakeTimer()
+    throttle = LoginThrottle(window=60, max_per_email=3, max_per_ip=100, maxsize=10, timer=timer)
+    for _ in range(3):
+        assert throttle.retry_after("User@Mail.ru", "10.0.0.1") == 0
+        throttle.register_failure("User@Mail.ru", "10.0.0.1")
+
+    wait = throttle.retry_after("user@mail.ru", "10.0.0.2")
+    assert wait > 0
+    assert throttle.retry_after("other@mail.ru", "10.0.0.1") == 0
+
+    timer.now += wait
+    assert throttle.retry_after("user@mail.ru", "10.0.0.2") == 0
+
+
+def test_login_throttle_blocks_ip_across_emails():
+    timer = FakeTimer()
+    throttle = LoginThrottle(window=60, max_per_email=100, max_per_ip=2, maxsize=10, timer=timer)
+    throttle.register_failure("a@mail.ru", "10.0.0.1")
+    throttle.register_failure("b@mail.ru", "10.0.0.1")
+
+    assert throttle.retry_after("c@mail.ru", "10.0.0.1") > 0
+    assert throttle.retry_after("c@mail.ru", "10.0.0.2") == 0
+
+
+def test_login_throttle_delay_grows_and_resets():
+    throttle = LoginThrottle(window=60, max_per_email=10, max_per_ip=100, maxsize=10, timer=FakeTimer())
+    assert throttle.delay("user@mail.ru") == 0
+    throttle.register_failure("user@mail.ru", "10.0.0.1")
+    first = throttle.delay("user@mail.ru")
+    throttle.register_failure("user@mail.ru", "10.0.0.1")
+    assert throttle.delay("user@mail.ru") == 2 * first
+
+    throttle.reset("user@mail.ru")
+    assert throttle.delay("user@mail.ru") == 0
+    assert throttle.retry_after("user@mail.ru", "10.0.0.1") == 0
+
+
+def test_login_throttle_separates_clients_behind_proxy():
+    timer = FakeTimer()
+    throttle = LoginThrottle(window=60, max_per_email=100, max_per_ip=2, maxsize=10, timer=timer)
+    proxies = parse_networks("172.28.0.10")
+
+    def forwarded(address: str) -> str:
+        scope = {"type": "http", "client": ("172.28.0.10", 40000),
+                 "headers": [(b"x-forwarded-for", address.encode())]}
+        return client_ip(scope, proxies)
+
+    for email in ("a@mail.ru", "b@mail.ru"):
+        throttle.register_failure(email, forwarded("203.0.113.5"))
+
+    assert throttle.retry_after("c@mail.ru", forwarded("203.0.113.5")) > 0
+    assert throttle.retry_after("c@mail.ru", forwarded("198.51.100.7")) == 0
+
+
+def test_login_throttle_counts_attempt_before_password_check():
+    throttle = LoginThrottle(window=60, max_per_email=3, max_per_ip=3, maxsize=10, timer=FakeTimer())
+    # Одновременная серия: каждая попытка учитывается до проверки пароля, поэтому лишние отклоняются сразу
+    results = [throttle.acquire("user@mail.ru", "10.0.0.1") for _ in range(5)]
+    assert results[:3] == [0, 0, 0]
+    assert all(wait > 0 for wait in results[3:])
+
+
+def test_login_throttle_success_returns_attempt():
+    throttle = LoginThrottle(window=60, max_per_email=3, max_per_ip=2, maxsize=10, timer=FakeTimer())
+    for email in ("a@mail.ru", "b@mail.ru", "c@mail.ru"):
+        assert throttle.acquire(email, "10.0.0.1") == 0
+        throttle.register_success(email, "10.0.0.1")
+
+    assert throttle.delay("a@mail.ru") == 0
+    assert throttle.retry_after("d@mail.ru", "10.0.0.1") == 0
@@ -0,0 +1,48 @@
+import json
+
+from user_team_service.user_app.models.structure_model import RoleEnum
+from user_team_service.user_app.schemas.company_schemas import SOrgChart
+from user_team_service.user_app.services.org_chart import build_org_chart, serialize_org_chart
+
+
+def member(member_id, structure_id, manager_id, role=RoleEnum.EMPLOYEE):
+    return member_id, structure_id, manager_id, role, member_id + 100, "Имя", "Фамилия", f"{member_id}@mail.ru"
+
+
+def test_build_org_chart_nests_members_under_managers_of_same_structure():
+    structures = [(1, "Разработка"), (2, "Продажи")]
+    members = [
+        member(12, 1, 10),
+        member(10, 1, None, RoleEnum.MANAGER),
+        member(11, 1, 10),
+        member(20, 2, 10, RoleEnum.MANAGER),
+        member(21, 2, 20),
+        member(22, 2, 22),
+    ]
+    chart = build_org_chart(5, "Компания", 3, structures, members)
+
+    development, sales = chart["structures"]
+    assert [node["id"] for node in development["members"]] == [10]
+    assert development["members"][0]["role"] == "manager"
+    assert [node["id"] for node in development["members"][0]["subordinates"]] == [12, 11]
+    # Менеджер из другой структуры и ссылка на себя не вкладывают участника
+    assert [node["id"] for node in sales["members"]] == [20, 22]
+    assert sales["members"][0]["manager_id"] == 10
+    assert [node["id"] for node in sales["members"][0]["subordinates"]] == [21]
+
+
+def test_build_org_chart_keeps_members_of_manager_cycle():
+    members = [member(10, 1, None), member(11, 1, 12), member(12, 1, 11), member(13, 1, 12)]
+    chart = build_org_chart(5, "Компания", 1, [(1, "Разработка")], members)
+
+    top = chart["structures"][0]["members"]
+    assert [node["id"] for node in top] == [10, 11]
+    assert [node["id"] for node in top[1]["subordinates"]] == [12]
+    assert [node["id"] for node in top[1]["subordinates"][0]["subordinates"]] == [13]
+    SOrgChart.model_validate(json.loads(serialize_org_chart(chart)))
+
+
+def test_serialized_org_chart_matches_schema():
+    chart = build_org_chart(5, "Компания", 1, [(1, "Разработка")], [member(10, 1, None)])
+    parsed = SOrgChart.model_validate(json.loads(serialize_org_chart(chart)))
+    assert parsed.structures[0].members[0].email == "10@mail.ru"
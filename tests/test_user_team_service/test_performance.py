@@ -0,0 +1,36 @@
+import asyncio
+
+import httpx
+
+from user_team_service.user_app.services import task_service
+from user_team_service.user_app.services.task_service import TaskService
+
+
+def patch_client(monkeypatch, handler):
+    client = httpx.AsyncClient
+
+    def make_client(**kwargs):
+        return client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(task_service.httpx, "AsyncClient", make_client)
+
+
+async def test_get_performance_batches_requests_and_returns_partial_results(monkeypatch):
+    monkeypatch.setattr(task_service.settings, "PERFORMANCE_BATCH_SIZE", 2)
+    monkeypatch.setattr(task_service.settings, "PERFORMANCE_CONCURRENCY", 2)
+    monkeypatch.setattr(task_service.settings, "PERFORMANCE_DEADLINE", 0.2)
+    batches = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        user_ids = [int(user_id) for user_id in request.url.params.get_list("user_ids")]
+        batches.append(user_ids)
+        if 5 in user_ids:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=[{"user_id": user_id, "total": user_id} for user_id in user_ids])
+
+    patch_client(monkeypatch, handler)
+    performance, missing = await TaskService(session=None).get_performance([1, 2, 3, 4, 5, 1])
+
+    assert sorted(batches) == [[1, 2], [3, 4], [5]]
+    assert sorted(performance) == [1, 2, 3, 4]
+    assert missing == [5]
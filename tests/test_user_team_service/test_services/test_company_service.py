@@ -70,7 +70,8 @@ async def test_delete_company(async_session: AsyncSession, authenticated_client_
     company_data = SCompanyCreate(name="Test Company")
     await service.create_company(company_data)
 
-    await service.delete_company(4)
+    job_id = await service.delete_company(4)
+    assert isinstance(job_id, int)
 
     with pytest.raises(HTTPException):
         await service.get_company_by_id(4)
@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -63,7 +65,11 @@ async def test_delete_structure(async_session: AsyncSession, authenticated_clien
 
     response = await service.delete_structure(3)
 
-    assert response['message'] == 'Данные успешно удалены!'
+    assert response['message'] == 'Структура удалена, данные удаляются в фоне.'
+    assert isinstance(response['job_id'], int)
+
+    with pytest.raises(HTTPException):
+        await service.get_structure(3)
 
 
 @pytest.mark.asyncio
@@ -237,3 +243,40 @@ async def test_get_all_structure_members(add_results, async_session, authenticat
     assert len(response) == 2
 
 
+
+
+class FakeMemberRepository:
+    """Участники: идентификатор -> идентификатор менеджера."""
+
+    def __init__(self, managers):
+        self.managers = managers
+        self.updated = []
+
+    async def find_one_or_none_by_id(self, member_id):
+        return SimpleNamespace(id=member_id, manager_id=self.managers[member_id])
+
+    async def manager_chain_contains(self, manager_id, member_id):
+        while manager_id is not None:
+            if manager_id == member_id:
+                return True
+            manager_id = self.managers[manager_id]
+        return False
+
+    async def update(self, filters, values):
+        self.updated.append((filters.id, values.manager_id))
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_update_structure_member_rejects_manager_cycle():
+    service = StructureService(session=None)
+    service.member_repo = FakeMemberRepository({1: None, 2: 1, 3: 2})
+
+    for member_id, manager_id in ((1, 3), (1, 1)):
+        with pytest.raises(HTTPException) as exc_info:
+            await service.update_structure_member(
+                member_id, SstrMembers(user_id=10, structure_id=1, manager_id=manager_id, role="employee"))
+        assert exc_info.value.status_code == 409
+
+    await service.update_structure_member(3, SstrMembers(user_id=10, structure_id=1, manager_id=1, role="employee"))
+    assert service.member_repo.updated == [(3, 1)]
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+from jose import jwt
+
+from user_team_service.user_app.core.config import settings
+from user_team_service.user_app.dependencies import auth_dep
+from user_team_service.user_app.middlewares.rate_limit import RateLimitMiddleware
+
+
+def make_token(exp: float, jti: str = "token-1") -> str:
+    return jwt.encode({"sub": "7", "exp": int(exp), "jti": jti, "type": "access"}, settings.SECRET_KEY,
+                      algorithm=settings.ALGORITHM)
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth_dep._verified_tokens.clear()
+    yield
+    auth_dep._verified_tokens.clear()
+
+
+def test_rate_limit_principal_skips_verification_for_cached_token(monkeypatch):
+    token = make_token(time.time() + 600)
+    assert RateLimitMiddleware._principal(token) == "7"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("подпись проверена повторно")
+
+    monkeypatch.setattr(auth_dep.jwt, "decode", fail)
+    assert RateLimitMiddleware._principal(token) == "7"
+    assert len(auth_dep._verified_tokens) == 1
+
+
+def test_read_token_claims_rejects_invalid_expired_and_revoked_tokens(monkeypatch):
+    assert auth_dep.read_token_claims("not-a-token") is None
+    assert auth_dep.read_token_claims(make_token(time.time() - 10)) is None
+
+    token = make_token(time.time() + 600, jti="revoked")
+    assert auth_dep.read_token_claims(token)["sub"] == "7"
+    monkeypatch.setattr(auth_dep.token_denylist, "is_revoked", lambda jti: jti == "revoked")
+    assert auth_dep.read_token_claims(token) is None
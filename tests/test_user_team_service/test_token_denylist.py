@@ -0,0 +1,43 @@
+from user_team_service.user_app.core.revocation import BloomFilter, TokenDenylist
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{number}" for number in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{number}" in bloom for number in range(10000))
+    assert false_positives < 300
+
+
+def test_denylist_revokes_until_expiration():
+    timer = FakeTimer()
+    denylist = TokenDenylist(capacity=10, error_rate=0.01, timer=timer)
+    denylist.add("revoked", expires_at=1060.0)
+
+    assert denylist.is_revoked("revoked")
+    assert not denylist.is_revoked("active")
+
+    timer.now = 1060.0
+    assert not denylist.is_revoked("revoked")
+    assert denylist.prune() == 1
+    assert len(denylist) == 0
+
+
+def test_denylist_grows_past_capacity():
+    denylist = TokenDenylist(capacity=2, error_rate=0.01, timer=FakeTimer())
+    for number in range(5):
+        denylist.add(f"jti-{number}", expires_at=2000.0)
+
+    assert denylist.capacity == 8
+    assert all(denylist.is_revoked(f"jti-{number}") for number in range(5))
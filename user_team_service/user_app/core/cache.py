@@ -0,0 +1,141 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from loguru import logger
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+# Канал Postgres LISTEN/NOTIFY, через который сброс кэша доходит до всех процессов сервиса
+CACHE_CHANNEL = "user_cache_invalidations"
+
+
+class TTLCache(Generic[V]):
+    """
+    Кэш в памяти процесса с ограничением по размеру (LRU) и времени жизни записей.
+
+    Предназначен для небольших горячих наборов данных; не потокобезопасен и рассчитан на
+    использование из одного цикла событий.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        """
+        :param maxsize: Максимальное количество записей.
+        :param ttl: Время жизни записи в секундах.
+        :param timer: Источник времени (для тестов).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """Возвращает значение по ключу или default, если записи нет или она устарела."""
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        expires_at, value = item
+        if expires_at <= self._timer():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение; при переполнении вытесняется давно не использованная запись."""
+        self._data[key] = (self._timer() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удаляет запись по ключу."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        self._data.clear()
+
+
+def pop_after_commit(session: AsyncSession, cache: TTLCache, key: Hashable) -> None:
+    """
+    Удаляет запись из кэша после фиксации транзакции сессии.
+
+    Если удалить запись до коммита, параллельный запрос успеет прочитать еще не измененные данные
+    и снова положить их в кэш. При откате транзакции запись не удаляется.
+
+    :param session: Сессия, в которой изменяются данные.
+    :param cache: Кэш.
+    :param key: Ключ записи.
+    """
+    session.info.setdefault("cache_invalidations", []).append((cache, key))
+
+
+# Кэши, сбрасываемые во всех процессах, по имени
+_shared_caches: Dict[str, TTLCache] = {}
+
+
+def shared_cache(name: str, cache: TTLCache[V]) -> TTLCache[V]:
+    """
+    Регистрирует кэш, записи которого сбрасываются во всех процессах сервиса (см. pop_everywhere).
+
+    :param name: Имя кэша в сообщениях канала CACHE_CHANNEL.
+    :param cache: Кэш.
+    :return: Тот же кэш.
+    """
+    _shared_caches[name] = cache
+    return cache
+
+
+async def pop_everywhere(session: AsyncSession, name: str, key: Hashable) -> None:
+    """
+    Удаляет запись общего кэша после фиксации транзакции во всех процессах сервиса.
+
+    В текущем процессе запись удаляется после коммита (pop_after_commit), остальные процессы
+    получают NOTIFY, который Postgres доставляет только после коммита этой же транзакции.
+    Пока слушатель процесса переподключается, запись устаревает не позже TTL кэша.
+
+    :param session: Сессия, в которой изменяются данные.
+    :param name: Имя кэша, зарегистрированного через shared_cache.
+    :param key: Ключ записи (сериализуемый в JSON).
+    """
+    pop_after_commit(session, _shared_caches[name], key)
+    await session.execute(text("SELECT pg_notify(:channel, :payload)"),
+                          {"channel": CACHE_CHANNEL, "payload": json.dumps({"cache": name, "key": key})})
+
+
+def apply_invalidation(payload: str) -> None:
+    """
+    Удаляет запись общего кэша по сообщению канала CACHE_CHANNEL.
+
+    :param payload: JSON с именем кэша и ключом записи.
+    """
+    try:
+        message = json.loads(payload)
+        cache = _shared_caches[message["cache"]]
+    except (ValueError, KeyError, TypeError):
+        logger.error(f"Некорректное сообщение сброса кэша: {payload[:200]}")
+        return
+    cache.pop(message.get("key"))
+
+
+@event.listens_for(Session, "after_commit")
+def _pop_committed(session: Session) -> None:
+    for cache, key in session.info.pop("cache_invalidations", ()):
+        cache.pop(key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    # Откат точки сохранения не отменяет изменений внешней транзакции
+    if previous_transaction.parent is None:
+        session.info.pop("cache_invalidations", None)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import Extra
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,6 +14,96 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
 
+    # Межсервисное взаимодействие
+    TASK_SERVICE_URL: str = "http://service2:8002"
+    # Общий секрет межсервисных запросов (/internal); без него внутренние эндпоинты недоступны
+    INTERNAL_API_TOKEN: str
+
+    # Транзакционный outbox
+    SERVICE_NAME: str = "user_team_service"
+    OUTBOX_RELAY_INTERVAL: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_RETENTION_DAYS: int = 7
+
+    # Ключи идемпотентности
+    IDEMPOTENCY_KEY_TTL: float = 86400.0
+    # Резерв ключа на время выполнения запроса; истекает, если ответ так и не был сохранен
+    IDEMPOTENCY_LEASE: float = 60.0
+    IDEMPOTENCY_PURGE_INTERVAL: float = 3600.0
+
+    # Лента новостей
+    NEWS_FEED_PAGE_SIZE: int = 20
+    NEWS_FEED_CACHE_SIZE: int = 1024
+    NEWS_FEED_CACHE_TTL: float = 30.0
+    # Проверка соединения слушателя сброса кэшей (LISTEN/NOTIFY)
+    CACHE_LISTENER_CHECK_INTERVAL: float = 5.0
+
+    # Оргструктура компании (кэш по версии оргструктуры)
+    ORG_CHART_CACHE_SIZE: int = 64
+    ORG_CHART_CACHE_TTL: float = 3600.0
+
+    # Отчет об эффективности структуры: пачки запросов к сервису задач
+    PERFORMANCE_BATCH_SIZE: int = 50
+    PERFORMANCE_CONCURRENCY: int = 4
+    PERFORMANCE_DEADLINE: float = 3.0
+
+    # Фоновые задачи
+    JOB_WORKER_IN_APP: bool = True
+    JOB_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_HEARTBEAT_INTERVAL: float = 30.0
+    JOB_STALE_AFTER: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_DELAY: float = 10.0
+    JOB_SHUTDOWN_TIMEOUT: float = 30.0
+
+    # Остановка процесса: ожидание открытых запросов перед остановкой приложения
+    SHUTDOWN_DRAIN_TIMEOUT: float = 15.0
+
+    # Фоновое удаление компаний и структур
+    PURGE_BATCH_SIZE: int = 500
+    PURGE_BATCH_PAUSE: float = 0.1
+
+    # Периодическая сверка счетчиков численности и подчиненных с данными таблиц
+    HEADCOUNT_RECONCILE_INTERVAL: float = 3600.0
+
+    # Прокси, которым разрешено передавать адрес клиента в X-Forwarded-For (адреса и подсети через запятую)
+    TRUSTED_PROXIES: str = "127.0.0.1"
+
+    # Ограничение частоты запросов (корзина токенов)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_USER_RATE: float = 10.0
+    RATE_LIMIT_USER_BURST: int = 40
+    RATE_LIMIT_IP_RATE: float = 30.0
+    RATE_LIMIT_IP_BURST: int = 100
+    RATE_LIMIT_MAX_BUCKETS: int = 100000
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+
+    # Защита входа от перебора. Счетчики хранятся в памяти процесса: с N процессами gunicorn
+    # (WEB_CONCURRENCY) перебор может сделать до N * LOGIN_MAX_FAILURES_* попыток за окно
+    LOGIN_FAILURE_WINDOW: float = 900.0
+    LOGIN_MAX_FAILURES_PER_EMAIL: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 50
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000
+    LOGIN_DELAY_BASE: float = 0.25
+    LOGIN_DELAY_MAX: float = 5.0
+
+    # Кэш проверенных JWT
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # Отзыв токенов
+    TOKEN_DENYLIST_CAPACITY: int = 100000
+    TOKEN_DENYLIST_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 2.0
+    TOKEN_REVOCATION_SYNC_OVERLAP: float = 5.0
+    TOKEN_REVOCATION_PURGE_INTERVAL: float = 3600.0
+
+    # Сжатие ответов (brotli, если установлен пакет brotli, иначе gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
     model_config = SettingsConfigDict(
         env_file=(".env", ".test.env"),
         extra=Extra.allow
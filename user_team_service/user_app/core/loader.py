@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BatchLoad = Callable[[List[Any]], Awaitable[Dict[Any, Any]]]
+
+
+class DataLoader:
+    """
+    Группировка и запоминание запросов записей по ключу в рамках одной сессии (одного запроса).
+
+    Ключи, запрошенные в одном проходе цикла событий, загружаются одним вызовом batch_load;
+    результат запоминается, и повторный запрос того же ключа не обращается к базе. Загрузчики
+    одной сессии выполняют запросы по очереди, так как сессия не допускает параллельных запросов.
+    """
+
+    def __init__(self, batch_load: BatchLoad, lock: Optional[asyncio.Lock] = None):
+        """
+        :param batch_load: Корутина, возвращающая словарь ключ -> запись для списка ключей.
+        :param lock: Блокировка, общая для загрузчиков одной сессии.
+        """
+        self._batch_load = batch_load
+        self._lock = lock or asyncio.Lock()
+        self._memo: Dict[Any, asyncio.Future] = {}
+        self._queue: List[Any] = []
+        self._dispatches: set = set()
+
+    async def load(self, key: Any) -> Any:
+        """
+        Возвращает запись по ключу (None, если записи нет).
+
+        :param key: Ключ записи.
+        """
+        future = self._memo.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._memo[key] = future
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # Запрос уходит после того, как остальные корутины этого прохода добавят свои ключи
+                loop.call_soon(self._schedule)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[Any]) -> List[Any]:
+        """Возвращает записи по списку ключей в том же порядке."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self) -> None:
+        """Забывает загруженные записи (после изменения данных)."""
+        self._memo = {key: future for key, future in self._memo.items() if not future.done()}
+
+    def _schedule(self) -> None:
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        futures = [self._memo[key] for key in keys]
+        try:
+            async with self._lock:
+                records = await self._batch_load(keys)
+        except Exception as e:
+            for key, future in zip(keys, futures):
+                # Ошибка не запоминается: следующий запрос ключа повторит загрузку
+                if self._memo.get(key) is future:
+                    del self._memo[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(records.get(key))
+
+
+def get_loader(session: AsyncSession, name: Hashable, batch_load: BatchLoad) -> DataLoader:
+    """
+    Возвращает загрузчик, привязанный к сессии; сессия создается на запрос, поэтому и загрузчик живет один запрос.
+
+    :param session: Сессия базы данных.
+    :param name: Имя загрузчика внутри сессии (например, класс репозитория).
+    :param batch_load: Функция пакетной загрузки для нового загрузчика.
+    """
+    loaders: Dict[Hashable, DataLoader] = session.info.setdefault("loaders", {})
+    loader = loaders.get(name)
+    if loader is None:
+        lock = session.info.setdefault("loader_lock", asyncio.Lock())
+        loader = loaders[name] = DataLoader(batch_load, lock)
+    return loader
+
+
+def clear_loader(session: AsyncSession, name: Hashable) -> None:
+    """Сбрасывает запомненные записи загрузчика сессии, если он создан."""
+    loader = session.info.get("loaders", {}).get(name)
+    if loader is not None:
+        loader.clear()
@@ -0,0 +1,50 @@
+import ipaddress
+from typing import Sequence, Tuple, Union
+
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from user_team_service.user_app.core.config import settings
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_networks(value: str) -> Tuple[Network, ...]:
+    """Разбирает список адресов и подсетей через запятую (например, "127.0.0.1,172.28.0.0/16")."""
+    return tuple(ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip())
+
+
+# Прокси (nginx), которым разрешено передавать адрес клиента в X-Forwarded-For
+trusted_proxies = parse_networks(settings.TRUSTED_PROXIES)
+
+
+def is_trusted(address: str, networks: Sequence[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(scope: Scope, networks: Sequence[Network] = None) -> str:
+    """
+    Возвращает адрес клиента запроса.
+
+    X-Forwarded-For учитывается, только если соединение пришло от доверенного прокси: иначе
+    заголовок мог задать сам клиент. Цепочка разбирается справа налево, и адресом клиента
+    считается первый адрес, не принадлежащий доверенным прокси.
+
+    :param scope: ASGI scope запроса.
+    :param networks: Доверенные прокси (по умолчанию из TRUSTED_PROXIES).
+    :return: IP-адрес клиента или пустая строка, если адрес неизвестен.
+    """
+    networks = trusted_proxies if networks is None else networks
+    client = scope.get("client")
+    peer = client[0] if client else ""
+    if not is_trusted(peer, networks):
+        return peer
+    hops = [hop.strip() for hop in Headers(scope=scope).get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not is_trusted(hop, networks):
+            return hop
+    return hops[0] if hops else peer
@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from loguru import logger
+
+
+class RatePolicy(NamedTuple):
+    """Параметры корзины токенов: скорость пополнения (токенов в секунду) и емкость (допустимый всплеск)."""
+    rate: float
+    burst: int
+
+
+class TokenBucketStore:
+    """
+    Корзины токенов в памяти процесса.
+
+    Состояние корзины — два числа (остаток токенов и время последнего обновления); пополнение
+    вычисляется лениво при обращении, поэтому проверка — несколько арифметических операций
+    и поиск в словаре. Давно не использовавшиеся корзины вытесняются при превышении maxsize.
+    """
+
+    def __init__(self, maxsize: int, timer: Callable[[], float] = time.monotonic):
+        """
+        :param maxsize: Максимальное количество хранимых корзин.
+        :param timer: Источник времени в секундах.
+        """
+        self.maxsize = maxsize
+        self.timer = timer
+        self._buckets: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        """
+        Забирает токен из корзины.
+
+        :param key: Ключ корзины (клиент и правило).
+        :param policy: Параметры корзины.
+        :return: 0, если токен получен, иначе время в секундах до появления токена.
+        """
+        now = self.timer()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(policy.burst), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(policy.burst), bucket[0] + (now - bucket[1]) * policy.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / policy.rate
+
+
+# Пополнение и списание выполняются атомарно на стороне Redis
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucketStore:
+    """
+    Корзины токенов в Redis, общие для всех процессов и экземпляров сервиса.
+
+    Каждая проверка — один вызов скрипта (сетевой запрос), поэтому общее хранилище стоит
+    включать, только когда важна точность лимита на все экземпляры. При недоступности Redis
+    запрос пропускается (лимит не должен становиться точкой отказа).
+    """
+
+    def __init__(self, client, prefix: str):
+        """
+        :param client: Клиент redis.asyncio.
+        :param prefix: Префикс ключей, чтобы сервисы не делили корзины.
+        """
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        try:
+            wait = await self._script(keys=[f"{self.prefix}:{key}"], args=[policy.rate, policy.burst, time.time()])
+        except Exception as e:
+            logger.error(f"Ошибка ограничения частоты запросов в Redis: {e}")
+            return 0.0
+        return float(wait)
+
+
+def create_bucket_store(maxsize: int, redis_url: Optional[str], prefix: str):
+    """
+    Создает хранилище корзин: общее в Redis, если указан адрес и установлен пакет redis,
+    иначе в памяти процесса.
+
+    :param maxsize: Максимальное количество корзин в памяти процесса.
+    :param redis_url: Адрес Redis или None.
+    :param prefix: Префикс ключей Redis.
+    :return: Хранилище корзин.
+    """
+    if redis_url:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("Пакет redis не установлен, ограничение частоты запросов работает в памяти процесса.")
+        else:
+            return RedisTokenBucketStore(redis_asyncio.from_url(redis_url), prefix)
+    return TokenBucketStore(maxsize)
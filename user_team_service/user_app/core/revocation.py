@@ -0,0 +1,101 @@
+import hashlib
+import math
+import time
+from typing import Callable, Dict
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: компактное множество с ложноположительными, но без ложноотрицательных ответов.
+
+    Позиции битов вычисляются двойным хэшированием по одному дайджесту blake2b.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        :param capacity: Ожидаемое количество элементов.
+        :param error_rate: Допустимая доля ложноположительных ответов при заполнении до capacity.
+        """
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        for number in range(self.hashes):
+            yield (first + number * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenDenylist:
+    """
+    Отозванные токены в памяти процесса.
+
+    Почти все проверяемые токены не отозваны, и для них достаточно фильтра Блума (несколько
+    операций с битами); точное множество с временем истечения проверяется только при совпадении
+    в фильтре. Истекшие токены удаляются при очистке, фильтр при этом перестраивается.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, timer: Callable[[], float] = time.time):
+        """
+        :param capacity: Ожидаемое количество одновременно отозванных токенов.
+        :param error_rate: Допустимая доля ложноположительных ответов фильтра.
+        :param timer: Источник времени в секундах Unix (для тестов).
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._timer = timer
+        self._expires: Dict[str, float] = {}
+        self._filter = BloomFilter(capacity, error_rate)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """
+        Отзывает токен.
+
+        :param jti: Идентификатор токена.
+        :param expires_at: Время истечения токена в секундах Unix.
+        """
+        self._expires[jti] = expires_at
+        if len(self._expires) > self.capacity:
+            # Переполненный фильтр теряет избирательность, поэтому емкость удваивается
+            self.capacity *= 2
+            self._rebuild()
+        else:
+            self._filter.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        """Проверяет, отозван ли токен."""
+        if jti not in self._filter:
+            return False
+        expires_at = self._expires.get(jti)
+        return expires_at is not None and expires_at > self._timer()
+
+    def prune(self) -> int:
+        """
+        Удаляет истекшие токены.
+
+        :return: Количество удаленных токенов.
+        """
+        now = self._timer()
+        expired = [jti for jti, expires_at in self._expires.items() if expires_at <= now]
+        for jti in expired:
+            del self._expires[jti]
+        if expired:
+            self._rebuild()
+        return len(expired)
+
+    def _rebuild(self) -> None:
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        for jti in self._expires:
+            self._filter.add(jti)
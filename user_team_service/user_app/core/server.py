@@ -0,0 +1,20 @@
+from uvicorn_worker import UvicornWorker
+
+from user_team_service.user_app.core.config import settings
+
+
+class ProductionWorker(UvicornWorker):
+    """
+    Рабочий процесс gunicorn: цикл событий uvloop и HTTP-парсер httptools.
+
+    По SIGTERM процесс перестает принимать соединения и ждет открытые запросы не дольше
+    SHUTDOWN_DRAIN_TIMEOUT секунд, чтобы долгие соединения (поток событий) не задерживали остановку;
+    затем останавливается приложение (фоновые задачи, обработчик задач). gunicorn завершает процесс
+    принудительно через graceful_timeout, поэтому graceful_timeout должен покрывать оба этапа.
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = min(settings.SHUTDOWN_DRAIN_TIMEOUT, self.cfg.graceful_timeout)
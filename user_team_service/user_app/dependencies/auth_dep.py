@@ -1,19 +1,28 @@
+import hashlib
+import time
 from datetime import datetime, timezone
+from typing import Optional
 from fastapi import Request, Depends
 from jose import jwt, JWTError, ExpiredSignatureError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from user_team_service.user_app.repositories.auth_repository import UsersRepository
 from user_team_service.user_app.models.user_model import User, StatusEnum
+from user_team_service.user_app.core.cache import TTLCache
 from user_team_service.user_app.core.config import settings
 from user_team_service.user_app.dependencies.repository_dep import get_session_without_commit
 from user_team_service.user_app.exceptions.auth_exceptions import (
-    TokenNoFound, NoJwtException, TokenExpiredException, NoUserIdException, ForbiddenException, UserNotFoundException
+    TokenNoFound, NoJwtException, TokenExpiredException, NoUserIdException, ForbiddenException, UserNotFoundException,
+    TokenRevokedException
 )
+from user_team_service.user_app.services.revocation import token_denylist
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Полезные нагрузки проверенных токенов по их хэшу; запись живет до истечения токена
+_verified_tokens: TTLCache[dict] = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=0)
+
 
 def get_access_token(request: Request) -> str:
     """Извлекаем access_token из кук."""
@@ -32,6 +41,39 @@ def get_refresh_token(request: Request) -> str:
     return token
 
 
+def check_not_revoked(payload: dict) -> None:
+    """Проверяем, что токен не отозван (проверка в памяти процесса, без обращения к базе)."""
+    jti = payload.get('jti')
+    if jti and token_denylist.is_revoked(jti):
+        raise TokenRevokedException
+
+
+def read_token_claims(token: Optional[str]) -> Optional[dict]:
+    """
+    Возвращаем полезную нагрузку действующего токена или None, если токена нет, он невалиден или отозван.
+
+    Подпись проверяется один раз: результат кэшируется по хэшу токена до истечения его срока,
+    поэтому повторные запросы (например, в ограничителе частоты) не выполняют jwt.decode.
+    Отзыв проверяется при каждом вызове.
+    """
+    if not token:
+        return None
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _verified_tokens.get(key)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            return None
+        if not payload.get('exp') or int(payload['exp']) <= time.time():
+            return None
+        _verified_tokens.set(key, payload, ttl=int(payload['exp']) - time.time())
+    jti = payload.get('jti')
+    if jti and token_denylist.is_revoked(jti):
+        return None
+    return payload
+
+
 async def check_refresh_token(
         token: str = Depends(get_refresh_token),
         session: AsyncSession = Depends(get_session_without_commit)
@@ -43,6 +85,7 @@ async def check_refresh_token(
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
+        check_not_revoked(payload)
         user_id = payload.get("sub")
         if not user_id:
             raise NoJwtException
@@ -77,6 +120,7 @@ async def get_current_user(
     expire_time = datetime.fromtimestamp(int(expire), tz=timezone.utc)
     if (not expire) or (expire_time < datetime.now(timezone.utc)):
         raise TokenExpiredException
+    check_not_revoked(payload)
 
     user_id: str = payload.get('sub')
     if not user_id:
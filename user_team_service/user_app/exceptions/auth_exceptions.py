@@ -25,6 +25,15 @@ IncorrectEmailOrPasswordException = HTTPException(
     detail='Неверная почта или пароль'
 )
 
+
+def too_many_login_attempts(retry_after: int) -> HTTPException:
+    """Слишком много неудачных попыток входа; повторить можно через retry_after секунд."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail='Слишком много неудачных попыток входа, попробуйте позже',
+        headers={'Retry-After': str(retry_after)}
+    )
+
 # Токен истек
 TokenExpiredException = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,6 +59,12 @@ NoJwtException = HTTPException(
     detail='Токен не валидный'
 )
 
+# Токен отозван (выход из системы)
+TokenRevokedException = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail='Токен отозван'
+)
+
 # Не найден ID пользователя
 NoUserIdException = HTTPException(
     status_code=status.HTTP_404_NOT_FOUND,
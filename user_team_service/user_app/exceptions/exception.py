@@ -25,8 +25,42 @@ StructureMemberNotFoundException = HTTPException(
     detail='Участник структуры не найден'
 )
 
+# Назначение менеджера замыкает цикл подчинения
+ManagerCycleException = HTTPException(
+    status_code=status.HTTP_409_CONFLICT,
+    detail='Участник не может подчиняться своему подчиненному'
+)
+
 # Новость не найдена
 NewsNotFoundException = HTTPException(
     status_code=status.HTTP_404_NOT_FOUND,
     detail='Новость не найдена'
 )
+
+# Фоновая задача не найдена
+JobNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail='Задача не найдена'
+)
+
+# Курсор ленты передан не полностью
+InvalidFeedCursorException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail='Курсор ленты задается парой before_created_at и before_id'
+)
+
+
+def unknown_include(unknown, allowed) -> HTTPException:
+    """Запрошены связи, для которых нет профиля загрузки."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Неизвестные связи в include: {', '.join(unknown)}. Доступны: {', '.join(allowed) or 'нет'}"
+    )
+
+
+def unknown_fields(unknown, allowed) -> HTTPException:
+    """Запрошены поля, недоступные для выборки."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Неизвестные поля в fields: {', '.join(unknown)}. Доступны: {', '.join(allowed) or 'нет'}"
+    )
@@ -6,19 +6,65 @@ from loguru import logger
 from sqladmin import Admin
 
 from .admin import UserAdmin, CompanyAdmin, StructureAdmin, StructureMemberAdmin, NewsAdmin
-from .database.database import engine
+from .core.background import PeriodicTask
+from .core.config import settings
+from .database.database import async_session_maker, engine
+from .core.rate_limit import RatePolicy
+from .middlewares.compression import CompressionMiddleware
+from .middlewares.idempotency import IdempotencyMiddleware
+from .middlewares.rate_limit import RateLimitMiddleware, RouteLimit
+from .repositories.idempotency_repository import IdempotencyRepository
 from .routers.auth import router as router_auth
 from .routers.users import router as router_user
 from .routers.companies import router as router_companies
 from .routers.structures import router as router_structures
 from .routers.news import router as router_news
+from .routers.internal import router as router_internal
+from .routers.jobs import router as router_jobs
+from .services import purger  # noqa: F401  регистрация обработчиков фоновых задач
+from .services.cache_sync import cache_invalidation_listener
+from .services.headcount import schedule_headcount_reconcile
+from .services.jobs import job_worker
+from .services.outbox import OutboxRelay
+from .services.revocation import revocation_sync
+
+
+outbox_relay = OutboxRelay(source=settings.SERVICE_NAME, peer_url=settings.TASK_SERVICE_URL)
+
+
+async def purge_idempotency_keys() -> None:
+    """Удаляет просроченные ключи идемпотентности."""
+    async with async_session_maker() as session:
+        await IdempotencyRepository(session).purge_expired()
+        await session.commit()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[dict, None]:
     """Управление жизненным циклом приложения."""
     logger.info("Инициализация приложения...")
+    try:
+        await revocation_sync.load()
+    except Exception as e:
+        logger.error(f"Не удалось загрузить отозванные токены: {e}")
+    background_tasks = [
+        PeriodicTask("outbox-relay", outbox_relay.relay_once, settings.OUTBOX_RELAY_INTERVAL),
+        PeriodicTask("token-revocation-sync", revocation_sync.refresh, settings.TOKEN_REVOCATION_SYNC_INTERVAL),
+        PeriodicTask("token-revocation-purge", revocation_sync.purge_expired, settings.TOKEN_REVOCATION_PURGE_INTERVAL),
+        PeriodicTask("idempotency-purge", purge_idempotency_keys, settings.IDEMPOTENCY_PURGE_INTERVAL),
+        PeriodicTask("headcount-reconcile", schedule_headcount_reconcile, settings.HEADCOUNT_RECONCILE_INTERVAL),
+        PeriodicTask("cache-invalidation-listener", cache_invalidation_listener.ensure_connected,
+                     settings.CACHE_LISTENER_CHECK_INTERVAL),
+    ]
+    for task in background_tasks:
+        task.start()
+    if settings.JOB_WORKER_IN_APP:
+        job_worker.start()
     yield
+    await job_worker.stop()
+    for task in background_tasks:
+        await task.stop()
+    await cache_invalidation_listener.close()
     logger.info("Завершение работы приложения...")
 
 
@@ -34,6 +80,24 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Повтор запросов на создание по заголовку Idempotency-Key
+    app.add_middleware(IdempotencyMiddleware, paths=["/news/create"])
+
+    # Ограничение частоты запросов (до обращений к базе данных)
+    if settings.RATE_LIMIT_ENABLED:
+        # Запросы мотивации обращаются к сервису задач, поэтому лимит на них строже
+        motivation_limit = RouteLimit(user=RatePolicy(1.0, 5), ip=RatePolicy(5.0, 20))
+        app.add_middleware(RateLimitMiddleware, routes={
+            "/internal": None,
+            "/users/get_my_motivation": motivation_limit,
+            "/users/get_my_quarterly_motivation": motivation_limit,
+            "/auth/login": RouteLimit(user=None, ip=RatePolicy(1.0, 10)),
+        })
+
+    # Сжатие ответов; внутри CORS, но снаружи остальных middleware (ключи идемпотентности хранят несжатые ответы)
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+
     # Настройка CORS
     app.add_middleware(
         CORSMiddleware,
@@ -67,6 +131,8 @@ def register_routers(app: FastAPI) -> None:
     app.include_router(router_companies, prefix='/companies', tags=['Companies'])
     app.include_router(router_structures, prefix='/structures', tags=['Structures'])
     app.include_router(router_news, prefix='/news', tags=['News'])
+    app.include_router(router_jobs, prefix='/jobs', tags=['Jobs'])
+    app.include_router(router_internal, prefix='/internal', tags=['Internal'], include_in_schema=False)
 
 
 # Создание экземпляра приложения
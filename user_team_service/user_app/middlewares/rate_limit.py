@@ -0,0 +1,103 @@
+import hmac
+import math
+from typing import Dict, NamedTuple, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from user_team_service.user_app.core.config import settings
+from user_team_service.user_app.core.proxy import client_ip
+from user_team_service.user_app.core.rate_limit import RatePolicy, create_bucket_store
+from user_team_service.user_app.dependencies.auth_dep import read_token_claims
+
+
+class RouteLimit(NamedTuple):
+    """Лимиты маршрута: на пользователя (по sub токена доступа) и на IP-адрес; None — без ограничения."""
+    user: Optional[RatePolicy]
+    ip: Optional[RatePolicy]
+
+
+def default_route_limit() -> RouteLimit:
+    """Лимит по умолчанию из настроек."""
+    return RouteLimit(
+        user=RatePolicy(settings.RATE_LIMIT_USER_RATE, settings.RATE_LIMIT_USER_BURST),
+        ip=RatePolicy(settings.RATE_LIMIT_IP_RATE, settings.RATE_LIMIT_IP_BURST),
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Ограничение частоты запросов корзиной токенов.
+
+    Для каждого запроса списывается токен из корзины IP-адреса клиента (X-Forwarded-For учитывается
+    только от доверенных прокси) и, если есть действующий токен доступа, из корзины пользователя
+    (по полю sub: новые токены того же пользователя не дают нового лимита). Корзины заводятся
+    отдельно для каждого правила: маршруты со своими лимитами не расходуют общий лимит. Если токена
+    нет, возвращается 429 с заголовком Retry-After.
+    Межсервисные запросы с действующим X-Internal-Token не ограничиваются.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Optional[Dict[str, Optional[RouteLimit]]] = None,
+                 default: Optional[RouteLimit] = None, store=None):
+        """
+        :param app: Следующее ASGI-приложение.
+        :param routes: Лимиты по префиксам путей; None вместо лимита исключает маршрут из проверки.
+        :param default: Лимит для остальных путей (по умолчанию из настроек).
+        :param store: Хранилище корзин (по умолчанию из настроек).
+        """
+        self.app = app
+        self.default = default or default_route_limit()
+        # Более длинные префиксы проверяются первыми
+        self.routes = sorted((routes or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.internal_token = settings.INTERNAL_API_TOKEN
+        self.store = store or create_bucket_store(settings.RATE_LIMIT_MAX_BUCKETS, settings.RATE_LIMIT_REDIS_URL,
+                                                  prefix=f"ratelimit:{settings.SERVICE_NAME}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        rule, limit = self._match(scope["path"])
+        if limit is None or self._is_internal(headers):
+            await self.app(scope, receive, send)
+            return
+
+        wait = 0.0
+        if limit.ip is not None:
+            wait = await self.store.acquire(f"ip:{rule}:{client_ip(scope)}", limit.ip)
+        if not wait and limit.user is not None:
+            token = self._cookie(headers, "user_access_token")
+            principal = self._principal(token) if token else None
+            if principal is not None:
+                wait = await self.store.acquire(f"user:{rule}:{principal}", limit.user)
+        if wait:
+            response = JSONResponse({"detail": "Слишком много запросов"}, status_code=429,
+                                    headers={"Retry-After": str(math.ceil(wait))})
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def _is_internal(self, headers: Headers) -> bool:
+        token = headers.get("x-internal-token")
+        return bool(self.internal_token and token and hmac.compare_digest(token, self.internal_token))
+
+    @staticmethod
+    def _principal(token: str) -> Optional[str]:
+        claims = read_token_claims(token)
+        return str(claims["sub"]) if claims and claims.get("sub") is not None else None
+
+    def _match(self, path: str):
+        for prefix, limit in self.routes:
+            if path.startswith(prefix):
+                return prefix, limit
+        return "", self.default
+
+    @staticmethod
+    def _cookie(headers: Headers, name: str) -> str:
+        for part in headers.get("cookie", "").split(";"):
+            cookie_name, _, value = part.strip().partition("=")
+            if cookie_name == name:
+                return value
+        return ""
@@ -0,0 +1,150 @@
+"""headcount counters
+
+Revision ID: 1b7e4c9a2d58
+Revises: 6e3a9d1c4b75
+Create Date: 2026-10-19 20:04:37.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7e4c9a2d58'
+down_revision: Union[str, None] = '6e3a9d1c4b75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Счетчик -> (таблица строк, колонка ссылки, таблица счетчика, колонка счетчика)
+COUNTERS = {
+    'users_count': ('users', 'company_id', 'companys', 'users_count'),
+    'members_count': ('structuremembers', 'structure_id', 'structures', 'members_count'),
+}
+
+
+def apply_delta(key: str, target: str, column: str, parts: Sequence[str]) -> str:
+    """Изменяет счетчики на сумму +1 за строки new_rows и -1 за строки old_rows, сгруппированную по ссылке."""
+    rows = ' UNION ALL '.join(parts)
+    return (f'UPDATE {target} t SET {column} = t.{column} + d.delta '
+            f'FROM (SELECT {key} AS id, sum(delta) AS delta FROM ({rows}) x GROUP BY {key}) d '
+            f'WHERE t.id = d.id AND d.delta <> 0;')
+
+
+def upgrade() -> None:
+    op.add_column('companys', sa.Column('users_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('structures', sa.Column('members_count', sa.Integer(), server_default=sa.text('0'),
+                                          nullable=False))
+    op.add_column('structuremembers', sa.Column('direct_reports_count', sa.Integer(), server_default=sa.text('0'),
+                                                nullable=False))
+    op.add_column('structuremembers', sa.Column('total_reports_count', sa.Integer(), server_default=sa.text('0'),
+                                                nullable=False))
+
+    # Численность: триггеры уровня оператора, изменения суммируются по компании или структуре
+    for name, (table, key, target, column) in COUNTERS.items():
+        new_part = f'SELECT {key}, 1 AS delta FROM new_rows WHERE {key} IS NOT NULL'
+        old_part = f'SELECT {key}, -1 AS delta FROM old_rows WHERE {key} IS NOT NULL'
+        op.execute(f"""
+            CREATE FUNCTION {table}_maintain_{name}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    {apply_delta(key, target, column, [new_part])}
+                ELSIF TG_OP = 'DELETE' THEN
+                    {apply_delta(key, target, column, [old_part])}
+                ELSE
+                    {apply_delta(key, target, column, [new_part, old_part])}
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f'CREATE TRIGGER {table}_{name}_insert AFTER INSERT ON {table} '
+                   f'REFERENCING NEW TABLE AS new_rows '
+                   f'FOR EACH STATEMENT EXECUTE FUNCTION {table}_maintain_{name}()')
+        op.execute(f'CREATE TRIGGER {table}_{name}_update AFTER UPDATE ON {table} '
+                   f'REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows '
+                   f'FOR EACH STATEMENT EXECUTE FUNCTION {table}_maintain_{name}()')
+        op.execute(f'CREATE TRIGGER {table}_{name}_delete AFTER DELETE ON {table} '
+                   f'REFERENCING OLD TABLE AS old_rows '
+                   f'FOR EACH STATEMENT EXECUTE FUNCTION {table}_maintain_{name}()')
+
+    # Подчиненные: прямые у менеджера, все (прямые и косвенные) — у менеджера и всех его руководителей.
+    # При переносе участника вместе с ним переносится его поддерево, поэтому цепочка руководителей
+    # меняется на 1 + total_reports_count участника. UNION в рекурсии защищает от циклов в данных.
+    op.execute("""
+        CREATE FUNCTION structuremembers_add_reports(start_id integer, delta integer) RETURNS void AS $$
+            WITH RECURSIVE chain(id) AS (
+                SELECT start_id
+                UNION
+                SELECT m.manager_id FROM structuremembers m JOIN chain c ON m.id = c.id
+                WHERE m.manager_id IS NOT NULL
+            )
+            UPDATE structuremembers SET total_reports_count = total_reports_count + delta
+            WHERE id IN (SELECT id FROM chain)
+        $$ LANGUAGE sql
+    """)
+    # Размер поддерева читается из таблицы: строки, измененные тем же оператором ранее, уже учтены
+    op.execute("""
+        CREATE FUNCTION structuremembers_count_reports() RETURNS trigger AS $$
+        DECLARE
+            subtree integer;
+        BEGIN
+            IF TG_OP <> 'INSERT' AND OLD.manager_id IS NOT NULL THEN
+                SELECT total_reports_count INTO subtree FROM structuremembers WHERE id = OLD.id;
+                UPDATE structuremembers SET direct_reports_count = direct_reports_count - 1
+                WHERE id = OLD.manager_id;
+                PERFORM structuremembers_add_reports(OLD.manager_id, -1 - COALESCE(subtree, OLD.total_reports_count));
+            END IF;
+            IF TG_OP <> 'DELETE' AND NEW.manager_id IS NOT NULL THEN
+                SELECT total_reports_count INTO subtree FROM structuremembers WHERE id = NEW.id;
+                UPDATE structuremembers SET direct_reports_count = direct_reports_count + 1
+                WHERE id = NEW.manager_id;
+                PERFORM structuremembers_add_reports(NEW.manager_id, 1 + COALESCE(subtree, 0));
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute('CREATE TRIGGER structuremembers_reports_insert AFTER INSERT ON structuremembers '
+               'FOR EACH ROW WHEN (NEW.manager_id IS NOT NULL) EXECUTE FUNCTION structuremembers_count_reports()')
+    op.execute('CREATE TRIGGER structuremembers_reports_update AFTER UPDATE OF manager_id ON structuremembers '
+               'FOR EACH ROW WHEN (NEW.manager_id IS DISTINCT FROM OLD.manager_id) '
+               'EXECUTE FUNCTION structuremembers_count_reports()')
+    op.execute('CREATE TRIGGER structuremembers_reports_delete AFTER DELETE ON structuremembers '
+               'FOR EACH ROW WHEN (OLD.manager_id IS NOT NULL) EXECUTE FUNCTION structuremembers_count_reports()')
+
+    # Начальные значения по существующим данным
+    op.execute('UPDATE companys c SET users_count = d.count '
+               'FROM (SELECT company_id, count(*) AS count FROM users GROUP BY company_id) d WHERE c.id = d.company_id')
+    op.execute('UPDATE structures s SET members_count = d.count '
+               'FROM (SELECT structure_id, count(*) AS count FROM structuremembers GROUP BY structure_id) d '
+               'WHERE s.id = d.structure_id')
+    op.execute('UPDATE structuremembers m SET direct_reports_count = d.count '
+               'FROM (SELECT manager_id, count(*) AS count FROM structuremembers GROUP BY manager_id) d '
+               'WHERE m.id = d.manager_id')
+    op.execute("""
+        WITH RECURSIVE tree(ancestor, id) AS (
+            SELECT manager_id, id FROM structuremembers WHERE manager_id IS NOT NULL
+            UNION
+            SELECT t.ancestor, m.id FROM tree t JOIN structuremembers m ON m.manager_id = t.id
+        )
+        UPDATE structuremembers m SET total_reports_count = d.count
+        FROM (SELECT ancestor, count(*) AS count FROM tree GROUP BY ancestor) d
+        WHERE m.id = d.ancestor
+    """)
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f'DROP TRIGGER structuremembers_reports_{event} ON structuremembers')
+    op.execute('DROP FUNCTION structuremembers_count_reports()')
+    op.execute('DROP FUNCTION structuremembers_add_reports(integer, integer)')
+    for name, (table, _, _, _) in COUNTERS.items():
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f'DROP TRIGGER {table}_{name}_{event} ON {table}')
+        op.execute(f'DROP FUNCTION {table}_maintain_{name}()')
+    op.drop_column('structuremembers', 'total_reports_count')
+    op.drop_column('structuremembers', 'direct_reports_count')
+    op.drop_column('structures', 'members_count')
+    op.drop_column('companys', 'users_count')
@@ -0,0 +1,35 @@
+"""job queue
+
+Revision ID: 3c7e5b1a9d42
+Revises: 9f4d2a6c8e13
+Create Date: 2026-10-19 17:20:36.518264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e5b1a9d42'
+down_revision: Union[str, None] = '9f4d2a6c8e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('max_attempts', sa.Integer(), server_default='5', nullable=False))
+    op.add_column('jobs', sa.Column('run_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'),
+                                    nullable=False))
+    op.drop_index('ix_jobs_kind_status', table_name='jobs')
+    op.create_index('ix_jobs_status_run_at', 'jobs', ['status', 'run_at', 'id'], unique=False,
+                    postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_status_run_at', table_name='jobs')
+    op.create_index('ix_jobs_kind_status', 'jobs', ['kind', 'status', 'id'], unique=False,
+                    postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"))
+    op.drop_column('jobs', 'run_at')
+    op.drop_column('jobs', 'max_attempts')
@@ -0,0 +1,69 @@
+"""user structure ids
+
+Revision ID: 3f8b6d2e9a41
+Revises: 1b7e4c9a2d58
+Create Date: 2026-10-19 21:02:47.610358
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b6d2e9a41'
+down_revision: Union[str, None] = '1b7e4c9a2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Пересчет структур пользователей из набора идентификаторов; updated_at сдвигается, чтобы изменение
+# попало в ленту /internal/users/changes и в справочники других сервисов
+REFRESH = ('UPDATE users u SET structure_ids = ARRAY(SELECT m.structure_id FROM structuremembers m '
+           'WHERE m.user_id = u.id ORDER BY 1), updated_at = now() WHERE u.id IN ({users});')
+
+# При изменении строки участника пересчитываются прежний и новый пользователь, если сменились пользователь или структура
+MOVED = ('SELECT x.user_id FROM new_rows n JOIN old_rows o ON o.id = n.id, LATERAL (VALUES (n.user_id), (o.user_id)) '
+         'x(user_id) WHERE (n.user_id, n.structure_id) IS DISTINCT FROM (o.user_id, o.structure_id)')
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('structure_ids', postgresql.ARRAY(sa.Integer()), server_default=sa.text("'{}'"),
+                                     nullable=False))
+
+    op.execute(f"""
+        CREATE FUNCTION structuremembers_refresh_user_structures() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {REFRESH.format(users='SELECT user_id FROM new_rows')}
+            ELSIF TG_OP = 'DELETE' THEN
+                {REFRESH.format(users='SELECT user_id FROM old_rows')}
+            ELSE
+                {REFRESH.format(users=MOVED)}
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute('CREATE TRIGGER structuremembers_user_structures_insert AFTER INSERT ON structuremembers '
+               'REFERENCING NEW TABLE AS new_rows '
+               'FOR EACH STATEMENT EXECUTE FUNCTION structuremembers_refresh_user_structures()')
+    op.execute('CREATE TRIGGER structuremembers_user_structures_update AFTER UPDATE ON structuremembers '
+               'REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows '
+               'FOR EACH STATEMENT EXECUTE FUNCTION structuremembers_refresh_user_structures()')
+    op.execute('CREATE TRIGGER structuremembers_user_structures_delete AFTER DELETE ON structuremembers '
+               'REFERENCING OLD TABLE AS old_rows '
+               'FOR EACH STATEMENT EXECUTE FUNCTION structuremembers_refresh_user_structures()')
+
+    # Начальные значения по существующим данным; сдвиг updated_at повторно отправляет записи в справочники
+    op.execute('UPDATE users u SET structure_ids = d.ids, updated_at = now() '
+               'FROM (SELECT user_id, array_agg(structure_id ORDER BY structure_id) AS ids '
+               'FROM structuremembers GROUP BY user_id) d WHERE u.id = d.user_id')
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f'DROP TRIGGER structuremembers_user_structures_{event} ON structuremembers')
+    op.execute('DROP FUNCTION structuremembers_refresh_user_structures()')
+    op.drop_column('users', 'structure_ids')
@@ -0,0 +1,26 @@
+"""job created by
+
+Revision ID: 4d8a2e6c1f57
+Revises: 8c2f5a7d1e36
+Create Date: 2026-10-20 10:14:37.902516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8a2e6c1f57'
+down_revision: Union[str, None] = '8c2f5a7d1e36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('created_by', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'created_by')
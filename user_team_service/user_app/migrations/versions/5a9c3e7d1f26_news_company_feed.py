@@ -0,0 +1,33 @@
+"""news company feed
+
+Revision ID: 5a9c3e7d1f26
+Revises: 2d6b9e4f7a18
+Create Date: 2026-10-19 15:37:20.581644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9c3e7d1f26'
+down_revision: Union[str, None] = '2d6b9e4f7a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('newss', sa.Column('company_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('newss_company_id_fkey', 'newss', 'companys', ['company_id'], ['id'], ondelete='CASCADE')
+    # Существующие новости относятся к компании автора
+    op.execute('UPDATE newss SET company_id = users.company_id FROM users WHERE newss.author_id = users.id')
+    op.create_index('ix_newss_company_created', 'newss',
+                    ['company_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_newss_company_created', table_name='newss')
+    op.drop_constraint('newss_company_id_fkey', 'newss', type_='foreignkey')
+    op.drop_column('newss', 'company_id')
@@ -0,0 +1,101 @@
+"""company org version
+
+Revision ID: 6e3a9d1c4b75
+Revises: 8b2d6f4a1c93
+Create Date: 2026-10-19 19:26:48.117305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e3a9d1c4b75'
+down_revision: Union[str, None] = '8b2d6f4a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Компании, затронутые изменением строк таблицы, по таблицам переходов new_rows и old_rows
+COMPANIES_OF = {
+    'structures': 'SELECT company_id FROM {rows}',
+    'structuremembers': 'SELECT s.company_id FROM structures s JOIN {rows} r ON r.structure_id = s.id',
+    'users': 'SELECT s.company_id FROM structures s JOIN structuremembers m ON m.structure_id = s.id '
+             'JOIN {rows} r ON r.id = m.user_id',
+}
+
+# Для пользователей версия меняется только при изменении полей, которые показываются в оргструктуре
+USERS_CHANGED = ('SELECT n.id FROM new_rows n JOIN old_rows o ON o.id = n.id '
+                 'WHERE (n.first_name, n.last_name, n.email) IS DISTINCT FROM (o.first_name, o.last_name, o.email)')
+
+
+def bump(rows: str) -> str:
+    return f'UPDATE companys SET org_version = org_version + 1 WHERE id IN ({rows});'
+
+
+def upgrade() -> None:
+    op.add_column('companys', sa.Column('org_version', sa.BigInteger(), server_default=sa.text('0'), nullable=False))
+
+    # Триггеры уровня оператора: массовое изменение (например, фоновое удаление) увеличивает версию
+    # компании один раз за оператор, а не на каждую строку
+    for table in ('structures', 'structuremembers'):
+        op.execute(f"""
+            CREATE FUNCTION {table}_bump_org_version() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP <> 'DELETE' THEN
+                    {bump(COMPANIES_OF[table].format(rows='new_rows'))}
+                END IF;
+                IF TG_OP <> 'INSERT' THEN
+                    {bump(COMPANIES_OF[table].format(rows='old_rows'))}
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        # Таблицы переходов допускаются только в триггерах на одно событие
+        op.execute(f'CREATE TRIGGER {table}_org_version_insert AFTER INSERT ON {table} '
+                   f'REFERENCING NEW TABLE AS new_rows '
+                   f'FOR EACH STATEMENT EXECUTE FUNCTION {table}_bump_org_version()')
+        op.execute(f'CREATE TRIGGER {table}_org_version_update AFTER UPDATE ON {table} '
+                   f'REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows '
+                   f'FOR EACH STATEMENT EXECUTE FUNCTION {table}_bump_org_version()')
+        op.execute(f'CREATE TRIGGER {table}_org_version_delete AFTER DELETE ON {table} '
+                   f'REFERENCING OLD TABLE AS old_rows '
+                   f'FOR EACH STATEMENT EXECUTE FUNCTION {table}_bump_org_version()')
+
+    op.execute(f"""
+        CREATE FUNCTION users_bump_org_version() RETURNS trigger AS $$
+        BEGIN
+            {bump(COMPANIES_OF['users'].format(rows=f'({USERS_CHANGED})'))}
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute('CREATE TRIGGER users_org_version_update AFTER UPDATE ON users '
+               'REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows '
+               'FOR EACH STATEMENT EXECUTE FUNCTION users_bump_org_version()')
+
+    op.execute("""
+        CREATE FUNCTION companys_bump_org_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.org_version := OLD.org_version + 1;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute('CREATE TRIGGER companys_org_version_name BEFORE UPDATE OF name ON companys '
+               'FOR EACH ROW WHEN (NEW.name IS DISTINCT FROM OLD.name) '
+               'EXECUTE FUNCTION companys_bump_org_version()')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER companys_org_version_name ON companys')
+    op.execute('DROP FUNCTION companys_bump_org_version()')
+    op.execute('DROP TRIGGER users_org_version_update ON users')
+    op.execute('DROP FUNCTION users_bump_org_version()')
+    for table in ('structuremembers', 'structures'):
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f'DROP TRIGGER {table}_org_version_{event} ON {table}')
+        op.execute(f'DROP FUNCTION {table}_bump_org_version()')
+    op.drop_column('companys', 'org_version')
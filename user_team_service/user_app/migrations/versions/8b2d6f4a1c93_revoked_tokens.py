@@ -0,0 +1,38 @@
+"""revoked tokens
+
+Revision ID: 8b2d6f4a1c93
+Revises: 3c7e5b1a9d42
+Create Date: 2026-10-19 18:42:11.304517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d6f4a1c93'
+down_revision: Union[str, None] = '3c7e5b1a9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('revokedtokens',
+    sa.Column('jti', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    op.create_index('ix_revokedtokens_created_at', 'revokedtokens', ['created_at'], unique=False)
+    op.create_index('ix_revokedtokens_expires_at', 'revokedtokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_revokedtokens_expires_at', table_name='revokedtokens')
+    op.drop_index('ix_revokedtokens_created_at', table_name='revokedtokens')
+    op.drop_table('revokedtokens')
@@ -0,0 +1,26 @@
+"""users updated_at index
+
+Revision ID: 8c2f41d7e6a3
+Revises: 0dc4775d46e0
+Create Date: 2026-10-19 10:20:04.512377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2f41d7e6a3'
+down_revision: Union[str, None] = '0dc4775d46e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_updated_at_id', 'users', ['updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_updated_at_id', table_name='users')
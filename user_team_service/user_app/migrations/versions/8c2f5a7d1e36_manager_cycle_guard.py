@@ -0,0 +1,58 @@
+"""manager cycle guard
+
+Revision ID: 8c2f5a7d1e36
+Revises: 3f8b6d2e9a41
+Create Date: 2026-10-19 23:12:08.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2f5a7d1e36'
+down_revision: Union[str, None] = '3f8b6d2e9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ключ advisory-блокировки, под которой изменения подчинения выполняются по очереди
+MANAGER_LOCK_KEY = 727002
+
+
+def upgrade() -> None:
+    # Счетчики подчиненных (1b7e4c9a2d58) верны, только пока подчинение остается деревом, а
+    # размер поддерева читается без параллельных переносов. Поэтому назначение менеджера,
+    # замыкающее цикл, отклоняется, а изменения подчинения выполняются под общей блокировкой до
+    # конца транзакции: следующая транзакция проверяет цикл и пересчитывает счетчики уже после
+    # фиксации предыдущей.
+    op.execute(f"""
+        CREATE FUNCTION structuremembers_check_manager() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.manager_id IS NULL OR (TG_OP = 'UPDATE' AND NEW.manager_id IS NOT DISTINCT FROM OLD.manager_id) THEN
+                RETURN NEW;
+            END IF;
+            PERFORM pg_advisory_xact_lock({MANAGER_LOCK_KEY});
+            IF EXISTS (
+                WITH RECURSIVE chain(id) AS (
+                    SELECT NEW.manager_id
+                    UNION
+                    SELECT m.manager_id FROM structuremembers m JOIN chain c ON m.id = c.id
+                    WHERE m.manager_id IS NOT NULL
+                )
+                SELECT 1 FROM chain WHERE id = NEW.id
+            ) THEN
+                RAISE EXCEPTION 'Назначение менеджера % участнику % создает цикл подчинения', NEW.manager_id, NEW.id
+                    USING ERRCODE = 'check_violation';
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute('CREATE TRIGGER structuremembers_manager_check BEFORE INSERT OR UPDATE OF manager_id '
+               'ON structuremembers FOR EACH ROW EXECUTE FUNCTION structuremembers_check_manager()')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER structuremembers_manager_check ON structuremembers')
+    op.execute('DROP FUNCTION structuremembers_check_manager()')
@@ -3,3 +3,7 @@ from user_team_service.user_app.models.company_model import Company
 from user_team_service.user_app.models.news_model import News
 from user_team_service.user_app.models.structure_model import Structure, StructureMember
 from user_team_service.user_app.models.user_model import User
+from user_team_service.user_app.models.outbox_model import OutboxEvent, ConsumerOffset
+from user_team_service.user_app.models.idempotency_model import IdempotencyKey
+from user_team_service.user_app.models.job_model import Job
+from user_team_service.user_app.models.revoked_token_model import RevokedToken
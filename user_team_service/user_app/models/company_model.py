@@ -1,5 +1,6 @@
-from typing import TYPE_CHECKING
-from sqlalchemy import String
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import BigInteger, String, TIMESTAMP, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from user_team_service.user_app.database.database import Base
@@ -17,9 +18,16 @@ class Company(Base):
         name (str): Название компании, уникальное и обязательное поле.
         users (list[User ]): Список пользователей, связанных с компанией.
         structures (list[Structure]): Список структур, связанных с компанией.
+        deleted_at (datetime): Время удаления (зависимые данные удаляются в фоне, затем удаляется компания).
+        org_version (int): Версия оргструктуры; увеличивается триггерами базы данных при изменении названия
+            компании, ее структур, участников структур и их имен.
+        users_count (int): Количество пользователей компании (поддерживается триггерами базы данных).
     """
 
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    org_version: Mapped[int] = mapped_column(BigInteger, server_default=text('0'), nullable=False)
+    users_count: Mapped[int] = mapped_column(server_default=text('0'), nullable=False)
 
     users: Mapped[list["User"]] = relationship("User", back_populates="company")
     structures: Mapped[list["Structure"]] = relationship("Structure", back_populates="company")
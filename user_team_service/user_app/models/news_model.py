@@ -1,6 +1,6 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from user_team_service.user_app.database.database import Base
@@ -17,11 +17,17 @@ class News(Base):
         title (str): Заголовок новости.
         content (str): Содержимое новости.
         author_id (int): Идентификатор автора, ссылающийся на пользователя.
+        company_id (int): Идентификатор компании автора на момент публикации (денормализован для ленты).
         author (User ): Автор новости, связанный с моделью User.
     """
 
     title: Mapped[str]
     content: Mapped[str]
     author_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete="CASCADE"))
+    company_id: Mapped[Optional[int]] = mapped_column(ForeignKey('companys.id', ondelete="CASCADE"), nullable=True)
 
-    author: Mapped["User"] = relationship("User", lazy="joined")
+    author: Mapped["User"] = relationship("User", back_populates="news")
+
+
+# Лента компании: последние новости по company_id
+Index('ix_newss_company_created', News.company_id, News.created_at.desc(), News.id.desc())
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Index, Sequence, String, TIMESTAMP, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from user_team_service.user_app.database.database import Base
+
+# Последовательность номеров доставки: выдается событиям в момент публикации,
+# поэтому номера монотонны в порядке отправки, даже если транзакции фиксировались не по порядку id.
+delivery_seq = Sequence('outboxevents_delivery_seq', metadata=Base.metadata)
+
+
+class OutboxEvent(Base):
+    """
+    Событие транзакционного outbox, записываемое в одной транзакции с изменением данных.
+
+    Атрибуты:
+        event_type (str): Тип события, например 'user.deleted'.
+        aggregate_id (int): Идентификатор измененной сущности.
+        payload (dict): Данные события.
+        delivery_seq (int): Номер доставки, назначается при публикации.
+        published_at (datetime): Время успешной публикации (NULL, пока событие не опубликовано).
+    """
+
+    event_type: Mapped[str] = mapped_column(String(64))
+    aggregate_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    payload: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
+    delivery_seq: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    published_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        Index('ix_outboxevents_unpublished', 'id', postgresql_where=text('published_at IS NULL')),
+    )
+
+
+class ConsumerOffset(Base):
+    """
+    Смещение потребителя: последний обработанный номер доставки для каждого источника событий.
+
+    Атрибуты:
+        source (str): Имя сервиса-источника событий.
+        last_seq (int): Последний обработанный номер доставки.
+    """
+
+    source: Mapped[str] = mapped_column(String(64), unique=True)
+    last_seq: Mapped[int] = mapped_column(BigInteger, default=0)
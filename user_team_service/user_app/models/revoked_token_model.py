@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Index, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from user_team_service.user_app.database.database import Base
+
+
+class RevokedToken(Base):
+    """
+    Отозванный JWT (выход из системы).
+
+    Таблица — общее хранилище, из которого отзывы периодически загружаются в память всех процессов сервиса.
+
+    Атрибуты:
+        jti (str): Идентификатор токена.
+        expires_at (datetime): Время истечения токена; после него запись не нужна.
+    """
+
+    jti: Mapped[str] = mapped_column(String(64), unique=True)
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+
+    __table_args__ = (
+        Index('ix_revokedtokens_created_at', 'created_at'),
+        Index('ix_revokedtokens_expires_at', 'expires_at'),
+    )
@@ -1,7 +1,8 @@
 import enum
-from typing import TYPE_CHECKING
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, ForeignKey, Enum
+from sqlalchemy import String, ForeignKey, Enum, TIMESTAMP, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from user_team_service.user_app.database.database import Base
@@ -35,10 +36,14 @@ class Structure(Base):
         company_id (int): Идентификатор компании, к которой принадлежит структура.
         members (list[StructureMember]): Список участников структуры.
         company (Company): Связь с моделью Company, представляющая компанию, к которой принадлежит структура.
+        deleted_at (datetime): Время удаления (участники удаляются в фоне, затем удаляется структура).
+        members_count (int): Количество участников структуры (поддерживается триггерами базы данных).
     """
 
     name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     company_id: Mapped[int] = mapped_column(ForeignKey("companys.id", ondelete='CASCADE'), nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    members_count: Mapped[int] = mapped_column(server_default=text('0'), nullable=False)
     members: Mapped[list["StructureMember"]] = relationship(
         "StructureMember",
         back_populates="structure",
@@ -63,6 +68,9 @@ class StructureMember(Base):
         user (User ): Связь с моделью User, представляющая участника.
         structure (Structure): Связь с моделью Structure, представляющая структуру, к которой принадлежит участник.
         manager (StructureMember): Связь с менеджером, который курирует участника.
+        direct_reports_count (int): Количество прямых подчиненных.
+        total_reports_count (int): Количество всех подчиненных, прямых и косвенных.
+            Оба счетчика поддерживаются триггерами базы данных.
     """
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
@@ -70,10 +78,11 @@ class StructureMember(Base):
     manager_id: Mapped[int] = mapped_column(ForeignKey("structuremembers.id", ondelete="SET NULL"), nullable=True)
     role: Mapped[RoleEnum] = mapped_column(Enum(RoleEnum, name='roleenum', create_type=True),
                                            default=RoleEnum.EMPLOYEE)
-    user: Mapped["User"] = relationship("User", lazy="joined")  # Связь с пользователем
+    direct_reports_count: Mapped[int] = mapped_column(server_default=text('0'), nullable=False)
+    total_reports_count: Mapped[int] = mapped_column(server_default=text('0'), nullable=False)
+    user: Mapped["User"] = relationship("User")  # Связь с пользователем
     structure: Mapped["Structure"] = relationship("Structure", back_populates="members")
     manager: Mapped["StructureMember"] = relationship(
         "StructureMember",
         remote_side="StructureMember.id",
-        backref="subordinates",
-        lazy="joined")
+        backref="subordinates")
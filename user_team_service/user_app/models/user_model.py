@@ -1,6 +1,6 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 from ..database.database import Base, str_uniq
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import ARRAY, Enum, ForeignKey, Index, Integer, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -34,6 +34,7 @@ class User(Base):
         password (str): Пароль пользователя.
         status (StatusEnum): Статус пользователя, определяющий его уровень доступа.
         company_id (int): Идентификатор компании, к которой принадлежит пользователь (может быть NULL).
+        structure_ids (list[int]): Идентификаторы структур пользователя, поддерживаются триггером.
         company (Company): Связь с моделью Company, представляющая компанию пользователя.
         news (list[News]): Список новостей, созданных пользователем.
     """
@@ -45,9 +46,14 @@ class User(Base):
     status: Mapped[StatusEnum] = mapped_column(Enum(StatusEnum, name='statusenum', create_type=True),
                                                default=StatusEnum.USER)
     company_id: Mapped[int] = mapped_column(ForeignKey('companys.id', ondelete="SET NULL"), nullable=True)
+    structure_ids: Mapped[List[int]] = mapped_column(ARRAY(Integer), server_default=text("'{}'"))
 
     company: Mapped["Company"] = relationship(back_populates="users", uselist=True)
     news: Mapped[list["News"]] = relationship(back_populates="author")
 
+    __table_args__ = (
+        Index('ix_users_updated_at_id', 'updated_at', 'id'),
+    )
+
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id}, status={self.status.value})"
@@ -1,8 +1,82 @@
-from select import select
+from datetime import datetime
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import func, select, tuple_, update as sqlalchemy_update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
 
 from user_team_service.user_app.models.user_model import User
 from user_team_service.user_app.repositories.base_repository import BaseRepository
+from user_team_service.user_app.schemas.internal_schema import SDirectoryUser
 
 
 class UsersRepository(BaseRepository):
     model = User
+    # Пароль в выборку не входит
+    selectable_fields = ('id', 'first_name', 'last_name', 'email', 'status', 'company_id', 'structure_ids',
+                         'created_at', 'updated_at')
+
+    async def find_changed_since(self, since: Optional[datetime], after_id: int, limit: int):
+        """
+        Ищет пользователей, измененных после курсора (updated_at, id), в порядке изменения.
+
+        :param since: Время изменения, после которого нужны записи (None — с самого начала).
+        :param after_id: Идентификатор последней полученной записи с тем же временем изменения.
+        :param limit: Максимальное количество записей.
+        :return: Список пользователей.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        logger.info(f"Поиск изменений {self.model.__name__} после ({since}, {after_id}), лимит {limit}")
+        try:
+            query = (
+                select(self.model)
+                .options(load_only(self.model.id, self.model.first_name, self.model.last_name,
+                                   self.model.company_id, self.model.status, self.model.structure_ids,
+                                   self.model.updated_at))
+                .order_by(self.model.updated_at, self.model.id)
+                .limit(limit)
+            )
+            if since is not None:
+                query = query.where(tuple_(self.model.updated_at, self.model.id) > tuple_(since, after_id))
+            result = await self._session.execute(query)
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при поиске изменений пользователей: {e}")
+            raise
+
+    async def get_directory_entry(self, user_id: int) -> Optional[SDirectoryUser]:
+        """
+        Возвращает запись справочника пользователя (только поля, нужные другим сервисам).
+
+        :param user_id: Идентификатор пользователя.
+        :return: Запись справочника или None, если пользователь не найден.
+        """
+        query = (
+            select(self.model.id, self.model.first_name, self.model.last_name, self.model.company_id,
+                   self.model.status, self.model.structure_ids, self.model.updated_at)
+            .where(self.model.id == user_id)
+        )
+        result = await self._session.execute(query)
+        row = result.one_or_none()
+        return SDirectoryUser.model_validate(row._mapping) if row else None
+
+    async def detach_company_batch(self, company_id: int, limit: int) -> List[SDirectoryUser]:
+        """
+        Исключает из компании очередную пачку пользователей.
+
+        :param company_id: Идентификатор компании.
+        :param limit: Размер пачки.
+        :return: Записи справочника исключенных пользователей.
+        """
+        self._clear_loader()
+        batch = select(self.model.id).where(self.model.company_id == company_id).order_by(self.model.id).limit(limit)
+        result = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id.in_(batch.scalar_subquery()))
+            .values(company_id=None, updated_at=func.now())
+            .returning(self.model.id, self.model.first_name, self.model.last_name, self.model.company_id,
+                       self.model.status, self.model.structure_ids, self.model.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return [SDirectoryUser.model_validate(row._mapping) for row in result.all()]
@@ -0,0 +1,176 @@
+from datetime import timedelta
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import case, func, insert, or_, select, update as sqlalchemy_update
+
+from user_team_service.user_app.models.job_model import Job, JobStatusEnum
+from user_team_service.user_app.repositories.base_repository import BaseRepository
+
+# Ключ advisory-блокировки постановки неповторяющихся задач (второй ключ — хэш типа задачи)
+JOB_ENQUEUE_LOCK_KEY = 727003
+
+
+class JobRepository(BaseRepository):
+    model = Job
+
+    async def enqueue(self, kind: str, payload: dict, max_attempts: int, created_by: Optional[int] = None) -> int:
+        """
+        Ставит задачу в очередь в текущей транзакции.
+
+        Задача становится видна обработчикам только после фиксации транзакции, вместе с изменениями,
+        ради которых она создана.
+
+        :param kind: Тип задачи.
+        :param payload: Параметры задачи (JSON-сериализуемый словарь).
+        :param max_attempts: Максимальное количество запусков.
+        :param created_by: Пользователь, поставивший задачу (None — системная задача).
+        :return: Идентификатор задачи.
+        """
+        result = await self._session.execute(
+            insert(self.model)
+            .values(kind=kind, payload=payload, status=JobStatusEnum.PENDING, max_attempts=max_attempts,
+                    created_by=created_by)
+            .returning(self.model.id)
+        )
+        job_id = result.scalar_one()
+        logger.info(f"Задача {kind} поставлена в очередь: {job_id}")
+        return job_id
+
+    async def enqueue_unique(self, kind: str, payload: dict, max_attempts: int) -> Optional[int]:
+        """
+        Ставит задачу в очередь, если задача того же типа еще не ожидает выполнения и не выполняется.
+
+        Проверка и вставка выполняются под блокировкой типа задачи до конца транзакции, поэтому
+        одновременные вызовы из разных процессов ставят в очередь одну задачу.
+
+        :param kind: Тип задачи.
+        :param payload: Параметры задачи.
+        :param max_attempts: Максимальное количество запусков.
+        :return: Идентификатор новой задачи или None, если задача уже в очереди.
+        """
+        await self._session.execute(select(func.pg_advisory_xact_lock(JOB_ENQUEUE_LOCK_KEY, func.hashtext(kind))))
+        queued = await self._session.execute(
+            select(self.model.id)
+            .where(self.model.kind == kind, self.model.status.in_((JobStatusEnum.PENDING, JobStatusEnum.RUNNING)))
+            .limit(1)
+        )
+        if queued.scalar() is not None:
+            return None
+        return await self.enqueue(kind, payload, max_attempts)
+
+    async def claim_next(self, kinds: List[str], stale_after: timedelta) -> Optional[Job]:
+        """
+        Захватывает очередную задачу указанных типов.
+
+        Кроме ожидающих задач, срок запуска которых наступил, повторно захватываются выполняющиеся
+        задачи без признаков жизни дольше stale_after (обработчик завершился аварийно). Строки,
+        захватываемые другими процессами, пропускаются (SKIP LOCKED).
+
+        :param kinds: Типы задач.
+        :param stale_after: Время без обновления, после которого выполняющаяся задача считается брошенной.
+        :return: Захваченная задача или None, если очередь пуста.
+        """
+        candidate = (
+            select(self.model.id)
+            .where(
+                self.model.kind.in_(kinds),
+                or_(
+                    (self.model.status == JobStatusEnum.PENDING) & (self.model.run_at <= func.now()),
+                    (self.model.status == JobStatusEnum.RUNNING) & (self.model.updated_at < func.now() - stale_after),
+                ),
+            )
+            .order_by(self.model.run_at, self.model.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id == candidate.scalar_subquery())
+            .values(status=JobStatusEnum.RUNNING, attempts=self.model.attempts + 1,
+                    started_at=func.now(), updated_at=func.now())
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def heartbeat(self, job_id: int, attempts: int) -> None:
+        """
+        Обновляет время последней активности выполняющейся задачи.
+
+        :param job_id: Идентификатор задачи.
+        :param attempts: Номер запуска, которым захвачена задача.
+        """
+        await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(*self._claimed_by(job_id, attempts))
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def save_progress(self, job_id: int, progress: dict) -> None:
+        """
+        Сохраняет прогресс выполняющейся задачи (обновляет и время последней активности).
+
+        :param job_id: Идентификатор задачи.
+        :param progress: Текущий прогресс.
+        """
+        await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id == job_id)
+            .values(result=progress, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def finish(self, job_id: int, attempts: int, result: Optional[dict] = None) -> bool:
+        """
+        Отмечает задачу успешно завершенной.
+
+        Результат записывается, только если задача все еще выполняется тем же запуском: задачу,
+        повторно захваченную после JOB_STALE_AFTER, завершает ее новый обработчик.
+
+        :param job_id: Идентификатор задачи.
+        :param attempts: Номер запуска, которым захвачена задача.
+        :param result: Результат выполнения.
+        :return: True, если результат записан.
+        """
+        updated = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(*self._claimed_by(job_id, attempts))
+            .values(status=JobStatusEnum.DONE, result=result, error=None, finished_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return updated.rowcount > 0
+
+    async def fail(self, job_id: int, attempts: int, error: str, retry_delay: timedelta) -> bool:
+        """
+        Записывает ошибку задачи.
+
+        Пока попытки не исчерпаны, задача возвращается в очередь с экспоненциально растущей задержкой
+        (retry_delay, 2 * retry_delay, 4 * retry_delay, ...), затем отмечается неудавшейся. Как и в finish,
+        ошибка записывается только для задачи, которая все еще выполняется тем же запуском.
+
+        :param job_id: Идентификатор задачи.
+        :param attempts: Номер запуска, которым захвачена задача.
+        :param error: Текст ошибки.
+        :param retry_delay: Задержка перед первым повтором.
+        :return: True, если ошибка записана.
+        """
+        exhausted = self.model.attempts >= self.model.max_attempts
+        backoff = func.power(2, func.greatest(self.model.attempts - 1, 0))
+        updated = await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(*self._claimed_by(job_id, attempts))
+            .values(
+                status=case((exhausted, JobStatusEnum.FAILED), else_=JobStatusEnum.PENDING),
+                finished_at=case((exhausted, func.now()), else_=None),
+                run_at=func.now() + backoff * retry_delay,
+                error=error,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return updated.rowcount > 0
+
+    def _claimed_by(self, job_id: int, attempts: int) -> tuple:
+        """Условия, по которым строка задачи принадлежит запуску attempts, захватившему ее."""
+        return self.model.id == job_id, self.model.status == JobStatusEnum.RUNNING, self.model.attempts == attempts
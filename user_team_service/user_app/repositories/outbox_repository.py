@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import delete as sqlalchemy_delete, func, insert, select, update as sqlalchemy_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from user_team_service.user_app.models.outbox_model import ConsumerOffset, OutboxEvent, delivery_seq
+from user_team_service.user_app.repositories.base_repository import BaseRepository
+
+# Ключ advisory-блокировки, под которой работает ретранслятор outbox
+OUTBOX_RELAY_LOCK_KEY = 727001
+
+
+class OutboxRepository(BaseRepository):
+    model = OutboxEvent
+
+    async def add_event(self, event_type: str, aggregate_id: Optional[int], payload: dict) -> None:
+        """
+        Записывает событие в outbox в текущей транзакции.
+
+        :param event_type: Тип события.
+        :param aggregate_id: Идентификатор измененной сущности.
+        :param payload: Данные события (JSON-сериализуемый словарь).
+        """
+        logger.info(f"Событие outbox {event_type} для {aggregate_id}")
+        await self._session.execute(
+            insert(self.model).values(event_type=event_type, aggregate_id=aggregate_id, payload=payload)
+        )
+
+    async def add_events(self, events: List[dict]) -> None:
+        """
+        Записывает несколько событий в outbox одним запросом в текущей транзакции.
+
+        :param events: Словари с ключами event_type, aggregate_id и payload.
+        """
+        if not events:
+            return
+        logger.info(f"События outbox: {len(events)} ({events[0]['event_type']})")
+        await self._session.execute(insert(self.model), events)
+
+    async def try_lock_relay(self) -> bool:
+        """
+        Пытается захватить блокировку ретранслятора на соединение сессии.
+
+        Блокировка переживает фиксацию транзакций и снимается unlock_relay или при разрыве соединения,
+        поэтому сессия должна быть привязана к выделенному соединению.
+
+        :return: True, если блокировка получена и этот процесс может публиковать события.
+        """
+        result = await self._session.execute(select(func.pg_try_advisory_lock(OUTBOX_RELAY_LOCK_KEY)))
+        return bool(result.scalar())
+
+    async def unlock_relay(self) -> None:
+        """Снимает блокировку ретранслятора."""
+        await self._session.execute(select(func.pg_advisory_unlock(OUTBOX_RELAY_LOCK_KEY)))
+
+    async def claim_batch(self, limit: int) -> List[OutboxEvent]:
+        """
+        Выбирает пачку неопубликованных событий в порядке номеров доставки.
+
+        Номер доставки назначается событию один раз, в порядке id: событие, доставка которого
+        не подтверждена, отправляется повторно с тем же номером, и получатель отсекает его по смещению.
+        Вызывается только под блокировкой ретранслятора.
+
+        :param limit: Максимальный размер пачки.
+        :return: События пачки, упорядоченные по номеру доставки.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        try:
+            fresh = (
+                select(self.model.id)
+                .where(self.model.published_at.is_(None), self.model.delivery_seq.is_(None))
+                .order_by(self.model.id)
+                .limit(limit)
+                .subquery()
+            )
+            numbered = select(fresh.c.id, delivery_seq.next_value().label("seq")).subquery()
+            await self._session.execute(
+                sqlalchemy_update(self.model)
+                .where(self.model.id == numbered.c.id)
+                .values(delivery_seq=numbered.c.seq)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self._session.execute(
+                select(self.model)
+                .where(self.model.published_at.is_(None), self.model.delivery_seq.is_not(None))
+                .order_by(self.model.delivery_seq)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при выборке событий outbox: {e}")
+            raise
+
+    async def mark_published(self, event_ids: List[int]) -> None:
+        """Отмечает события опубликованными."""
+        await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.id.in_(event_ids))
+            .values(published_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def prune_published(self, older_than: timedelta) -> int:
+        """
+        Удаляет давно опубликованные события.
+
+        :param older_than: Возраст публикации, после которого событие удаляется.
+        :return: Количество удаленных событий.
+        """
+        result = await self._session.execute(
+            sqlalchemy_delete(self.model)
+            .where(self.model.published_at < datetime.utcnow() - older_than)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+class ConsumerOffsetRepository(BaseRepository):
+    model = ConsumerOffset
+
+    async def lock_offset(self, source: str) -> int:
+        """
+        Возвращает смещение источника, блокируя его строку до конца транзакции.
+
+        :param source: Имя сервиса-источника.
+        :return: Последний обработанный номер доставки.
+        """
+        await self._session.execute(
+            pg_insert(self.model).values(source=source, last_seq=0).on_conflict_do_nothing(
+                index_elements=[self.model.source]
+            )
+        )
+        result = await self._session.execute(
+            select(self.model.last_seq).where(self.model.source == source).with_for_update()
+        )
+        return result.scalar_one()
+
+    async def set_offset(self, source: str, last_seq: int) -> None:
+        """Сдвигает смещение источника."""
+        await self._session.execute(
+            sqlalchemy_update(self.model)
+            .where(self.model.source == source)
+            .values(last_seq=last_seq)
+            .execution_options(synchronize_session=False)
+        )
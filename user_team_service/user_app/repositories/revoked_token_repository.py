@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import delete as sqlalchemy_delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from user_team_service.user_app.models.revoked_token_model import RevokedToken
+from user_team_service.user_app.repositories.base_repository import BaseRepository
+
+
+class RevokedTokenRepository(BaseRepository):
+    model = RevokedToken
+
+    async def revoke(self, tokens: Iterable[Tuple[str, datetime]]) -> None:
+        """
+        Сохраняет отозванные токены; повторный отзыв игнорируется.
+
+        :param tokens: Пары (jti, время истечения).
+        """
+        values = [{'jti': jti, 'expires_at': expires_at} for jti, expires_at in tokens]
+        if not values:
+            return
+        await self._session.execute(
+            pg_insert(self.model).values(values).on_conflict_do_nothing(index_elements=[self.model.jti])
+        )
+
+    async def find_revoked_since(self, since: Optional[datetime]) -> List[RevokedToken]:
+        """
+        Возвращает неистекшие отзывы, созданные после указанного времени.
+
+        :param since: Время создания записи (None — все неистекшие отзывы).
+        :return: Список записей.
+        """
+        query = select(self.model).where(self.model.expires_at > func.now())
+        if since is not None:
+            query = query.where(self.model.created_at > since)
+        result = await self._session.execute(query.order_by(self.model.created_at))
+        return list(result.scalars().all())
+
+    async def purge_expired(self) -> int:
+        """
+        Удаляет истекшие отзывы.
+
+        :return: Количество удаленных записей.
+        """
+        result = await self._session.execute(
+            sqlalchemy_delete(self.model)
+            .where(self.model.expires_at < func.now())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            logger.info(f"Удалено {result.rowcount} истекших отзывов токенов.")
+        return result.rowcount
@@ -1,18 +1,215 @@
-from user_team_service.user_app.models import Company, StructureMember, Structure, News
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import Row, exists, literal, select, text, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+
+from user_team_service.user_app.core.loading import load_options
+from user_team_service.user_app.models import Company, StructureMember, Structure, News, User
 from user_team_service.user_app.repositories.base_repository import BaseRepository
 
 
 class CompanyRepository(BaseRepository):
     model = Company
+    soft_delete = True
+    loading_profiles = {
+        "users": lambda: [selectinload(Company.users).load_only(User.id, User.first_name, User.last_name, User.email)],
+        "structures": lambda: [
+            selectinload(Company.structures.and_(Structure.deleted_at.is_(None))).load_only(Structure.id,
+                                                                                           Structure.name)
+        ],
+    }
+
+    async def reconcile_users_count(self) -> int:
+        """
+        Пересчитывает численность компаний по таблице пользователей.
+
+        Таблица пользователей блокируется от изменений до конца транзакции, чтобы пересчет
+        не разошелся с изменениями, которые триггеры вносят параллельно.
+
+        :return: Количество исправленных компаний.
+        """
+        self._clear_loader()
+        await self._session.execute(text("LOCK TABLE users IN SHARE MODE"))
+        result = await self._session.execute(text("""
+            UPDATE companys c SET users_count = d.count
+            FROM (SELECT c.id, count(u.id) AS count FROM companys c LEFT JOIN users u ON u.company_id = c.id
+                  GROUP BY c.id) d
+            WHERE c.id = d.id AND c.users_count <> d.count
+        """))
+        return result.rowcount
+
+    async def find_org_version(self, company_id: int) -> Optional[Row]:
+        """
+        Возвращает название и версию оргструктуры компании (поиск по первичному ключу, без чтения структур).
+
+        :param company_id: Идентификатор компании.
+        :return: Строка (name, org_version) или None, если компания не найдена или удалена.
+        """
+        result = await self._session.execute(
+            select(self.model.name, self.model.org_version).where(self.model.id == company_id, *self._not_deleted())
+        )
+        return result.first()
+
+    async def find_org_chart_rows(self, company_id: int) -> Tuple[List[Row], List[Row]]:
+        """
+        Выбирает плоские строки оргструктуры компании двумя запросами: структуры и участники с именами.
+
+        :param company_id: Идентификатор компании.
+        :return: Строки структур (id, name) и строки участников
+            (id, structure_id, manager_id, role, user_id, first_name, last_name, email), упорядоченные по id.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        logger.info(f"Выборка оргструктуры компании {company_id}")
+        try:
+            structures = await self._session.execute(
+                select(Structure.id, Structure.name)
+                .where(Structure.company_id == company_id, Structure.deleted_at.is_(None))
+                .order_by(Structure.id)
+            )
+            members = await self._session.execute(
+                select(StructureMember.id, StructureMember.structure_id, StructureMember.manager_id,
+                       StructureMember.role, StructureMember.user_id, User.first_name, User.last_name, User.email)
+                .join(Structure, Structure.id == StructureMember.structure_id)
+                .outerjoin(User, User.id == StructureMember.user_id)
+                .where(Structure.company_id == company_id, Structure.deleted_at.is_(None))
+                .order_by(StructureMember.id)
+            )
+            return list(structures.all()), list(members.all())
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при выборке оргструктуры компании {company_id}: {e}")
+            raise
 
 
 class StructureRepository(BaseRepository):
     model = Structure
+    soft_delete = True
+    loading_profiles = {
+        "members": lambda: [selectinload(Structure.members)],
+    }
+
+    async def find_company_structure_ids(self, company_id: int) -> List[int]:
+        """
+        Возвращает идентификаторы всех структур компании, включая помеченные удаленными.
+
+        :param company_id: Идентификатор компании.
+        :return: Список идентификаторов структур.
+        """
+        result = await self._session.execute(
+            select(self.model.id).where(self.model.company_id == company_id).order_by(self.model.id)
+        )
+        return list(result.scalars().all())
+
+    async def reconcile_members_count(self) -> int:
+        """
+        Пересчитывает численность структур по таблице участников (таблица участников блокируется
+        от изменений до конца транзакции).
+
+        :return: Количество исправленных структур.
+        """
+        self._clear_loader()
+        await self._session.execute(text("LOCK TABLE structuremembers IN SHARE MODE"))
+        result = await self._session.execute(text("""
+            UPDATE structures s SET members_count = d.count
+            FROM (SELECT s.id, count(m.id) AS count FROM structures s
+                  LEFT JOIN structuremembers m ON m.structure_id = s.id GROUP BY s.id) d
+            WHERE s.id = d.id AND s.members_count <> d.count
+        """))
+        return result.rowcount
 
 
 class StructureMemberRepository(BaseRepository):
     model = StructureMember
+    loading_profiles = {
+        "user": lambda: [selectinload(StructureMember.user).load_only(User.id, User.first_name, User.last_name,
+                                                                      User.email)],
+        "manager": lambda: [selectinload(StructureMember.manager)],
+    }
+
+    async def manager_chain_contains(self, manager_id: int, member_id: int) -> bool:
+        """
+        Проверяет, входит ли участник в цепочку руководителей начиная с manager_id (включительно).
+
+        :param manager_id: Идентификатор назначаемого менеджера.
+        :param member_id: Идентификатор участника.
+        :return: True, если назначение менеджера замкнет цикл подчинения.
+        """
+        chain = select(literal(manager_id).label("id")).cte("chain", recursive=True)
+        chain = chain.union(
+            select(self.model.manager_id).join(chain, self.model.id == chain.c.id)
+            .where(self.model.manager_id.is_not(None))
+        )
+        result = await self._session.execute(select(exists().where(chain.c.id == member_id)))
+        return bool(result.scalar())
+
+    async def reconcile_reports_count(self) -> int:
+        """
+        Пересчитывает счетчики прямых и всех подчиненных по связям manager_id.
+
+        Повторяет начальное заполнение счетчиков; таблица участников блокируется от изменений
+        до конца транзакции.
+
+        :return: Количество исправленных участников.
+        """
+        self._clear_loader()
+        await self._session.execute(text("LOCK TABLE structuremembers IN SHARE MODE"))
+        result = await self._session.execute(text("""
+            WITH RECURSIVE tree(ancestor, id) AS (
+                SELECT manager_id, id FROM structuremembers WHERE manager_id IS NOT NULL
+                UNION
+                SELECT t.ancestor, m.id FROM tree t JOIN structuremembers m ON m.manager_id = t.id
+            )
+            UPDATE structuremembers m
+            SET direct_reports_count = d.direct, total_reports_count = d.total
+            FROM (
+                SELECT s.id, coalesce(r.count, 0) AS direct, coalesce(t.count, 0) AS total
+                FROM structuremembers s
+                LEFT JOIN (SELECT manager_id, count(*) AS count FROM structuremembers GROUP BY manager_id) r
+                    ON r.manager_id = s.id
+                LEFT JOIN (SELECT ancestor, count(*) AS count FROM tree GROUP BY ancestor) t ON t.ancestor = s.id
+            ) d
+            WHERE m.id = d.id
+              AND (m.direct_reports_count, m.total_reports_count) IS DISTINCT FROM (d.direct, d.total)
+        """))
+        return result.rowcount
 
 
 class NewsRepository(BaseRepository):
     model = News
+    loading_profiles = {
+        "author": lambda: [selectinload(News.author).load_only(User.id, User.first_name, User.last_name)],
+    }
+
+    async def find_company_feed(self, company_id: int, limit: int, before: Optional[Tuple[datetime, int]] = None):
+        """
+        Ищет новости компании от новых к старым (keyset-пагинация по (created_at, id)).
+
+        Курсор передается значениями, а не идентификатором новости, поэтому удаление последней
+        новости предыдущей страницы не обрывает ленту.
+
+        :param company_id: Идентификатор компании.
+        :param limit: Максимальное количество новостей.
+        :param before: Курсор (created_at, id) последней новости предыдущей страницы (None — первая страница).
+        :return: Список новостей без загрузки авторов.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        logger.info(f"Лента новостей компании {company_id} до {before}, лимит {limit}")
+        try:
+            query = (
+                select(self.model)
+                .options(*load_options(self.loading_profiles))
+                .where(self.model.company_id == company_id)
+                .order_by(self.model.created_at.desc(), self.model.id.desc())
+                .limit(limit)
+            )
+            if before is not None:
+                created_at, news_id = before
+                query = query.where(tuple_(self.model.created_at, self.model.id)
+                                    < tuple_(literal(created_at, self.model.created_at.type), news_id))
+            result = await self._session.execute(query)
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при получении ленты новостей: {e}")
+            raise
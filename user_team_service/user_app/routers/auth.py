@@ -1,14 +1,21 @@
+import asyncio
 from typing import List, Optional
-from fastapi import APIRouter, Response, Depends
+from fastapi import APIRouter, Request, Response, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.proxy import client_ip
 from ..models.user_model import User
 from ..repositories.teams_repository import CompanyRepository
 from ..utils import authenticate_user, set_tokens
-from ..dependencies.auth_dep import (get_current_user, get_current_admin_user, check_refresh_token)
+from ..dependencies.auth_dep import (get_current_user, get_current_admin_user, check_refresh_token,
+                                     read_token_claims)
 from ..dependencies.repository_dep import get_session_with_commit, get_session_without_commit
-from ..exceptions.auth_exceptions import (UserAlreadyExistsException, IncorrectEmailOrPasswordException)
+from ..exceptions.auth_exceptions import (UserAlreadyExistsException, IncorrectEmailOrPasswordException,
+                                          too_many_login_attempts)
 from ..repositories.auth_repository import UsersRepository
+from ..services.login_throttle import login_throttle
+from ..services.outbox import record_user_event
+from ..services.revocation import revoke_tokens
 from ..schemas.auth_schemas import SUserRegister, SUserAuth, EmailModel, SUserAddDB, SUserInfo
 
 router = APIRouter()
@@ -17,12 +24,6 @@ router = APIRouter()
 @router.post("/register")
 async def register_user(user_data: SUserRegister, company_id: Optional[int | None] = None,
                         session: AsyncSession = Depends(get_session_with_commit)) -> dict:
-    # Проверка существования пользователя
-
-    existing_user = await UsersRepository(session).find_one_or_none(filters=EmailModel(email=user_data.email))
-    if existing_user:
-        raise UserAlreadyExistsException
-
     # Подготовка данных для добавления
     user_data_dict = user_data.model_dump()
     user_data_dict.pop('confirm_password', None)
@@ -32,24 +33,41 @@ async def register_user(user_data: SUserRegister, company_id: Optional[int | Non
             user_data_dict["company_id"] = company_id
         else:
             raise ValueError("Неправильный код компании.")
-    # Добавление пользователя
-    await UsersRepository(session).add(values=SUserAddDB(**user_data_dict))
+    # Добавление пользователя; занятый email определяется уникальным ограничением
+    user = await UsersRepository(session).insert_or_conflict(values=SUserAddDB(**user_data_dict),
+                                                             conflict_columns=['email'])
+    if user is None:
+        raise UserAlreadyExistsException
+    await record_user_event(session, "user.created", user.id, user)
 
     return {'message': 'Вы успешно зарегистрированы!'}
 
 
 @router.post("/login")
 async def auth_user(
+        request: Request,
         response: Response,
         user_data: SUserAuth,
         session: AsyncSession = Depends(get_session_without_commit)
 ) -> dict:
+    # Попытки сверх лимита отклоняются до обращения к базе и проверки пароля
+    # За nginx адрес клиента берется из X-Forwarded-For, иначе все попытки делили бы окно прокси
+    ip = client_ip(request.scope)
+    delay = login_throttle.delay(user_data.email)
+    # Попытка учитывается до первого await, чтобы одновременные запросы видели друг друга
+    retry_after = login_throttle.acquire(user_data.email, ip)
+    if retry_after:
+        raise too_many_login_attempts(retry_after)
+    if delay:
+        await asyncio.sleep(delay)
+
     user = await UsersRepository(session).find_one_or_none(
         filters=EmailModel(email=user_data.email)
     )
 
     if not (user and await authenticate_user(user=user, password=user_data.password)):
         raise IncorrectEmailOrPasswordException
+    login_throttle.register_success(user_data.email, ip)
     set_tokens(response, user.id)
     return {
         'token': True,
@@ -58,7 +76,11 @@ async def auth_user(
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(request: Request, response: Response,
+                 session: AsyncSession = Depends(get_session_with_commit)):
+    # Токены отзываются, чтобы их копии перестали приниматься до истечения срока действия
+    claims = [read_token_claims(request.cookies.get(name)) for name in ("user_access_token", "user_refresh_token")]
+    await revoke_tokens(session, [payload for payload in claims if payload])
     response.delete_cookie("user_access_token")
     response.delete_cookie("user_refresh_token")
     return {'message': 'Пользователь успешно вышел из системы'}
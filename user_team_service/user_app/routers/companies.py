@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from typing import Tuple
+
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from user_team_service.user_app.core.loading import to_schema
 from user_team_service.user_app.dependencies.auth_dep import get_current_user, get_current_admin_user
+from user_team_service.user_app.dependencies.include_dep import include_param
 from user_team_service.user_app.dependencies.repository_dep import get_session_with_commit, get_session_without_commit
 from user_team_service.user_app.models import User
-from user_team_service.user_app.schemas.company_schemas import SCompanyCreate
+from user_team_service.user_app.repositories.teams_repository import CompanyRepository
+from user_team_service.user_app.schemas.company_schemas import (SCompanyCreate, SCompanyDeleteJob, SCompanyHeadcount,
+                                                                SCompanyResponse, SOrgChart)
 from user_team_service.user_app.services.company_service import CompanyUserService
 
 router = APIRouter()
@@ -50,23 +56,25 @@ async def update_company(
     return {'message': 'Данные компании успешно обновлены!'}
 
 
-@router.delete("/delete/{company_id}")
+@router.delete("/delete/{company_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_company(
     company_id: int,
     current_user: User = Depends(get_current_admin_user),
     session: AsyncSession = Depends(get_session_with_commit)
-):
+) -> SCompanyDeleteJob:
     """
     Удаление компании по ее идентификатору.
 
+    Компания сразу перестает быть доступной, связанные данные удаляются в фоне.
+
     :param company_id: Идентификатор компании для удаления.
     :param current_user: Данные текущего администратора.
     :param session: Асинхронная сессия базы данных.
-    :return: Сообщение об успешном удалении компании.
+    :return: Сообщение о принятом удалении и идентификатор фоновой задачи.
     """
     service = CompanyUserService(session)
-    await service.delete_company(company_id)
-    return {'message': 'Компания успешно удалена!'}
+    job_id = await service.delete_company(company_id, created_by=current_user.id)
+    return SCompanyDeleteJob(message='Компания удалена, связанные данные удаляются в фоне.', job_id=job_id)
 
 
 @router.get("/all")
@@ -89,20 +97,58 @@ async def get_companies(
 @router.get("/get/{company_id}")
 async def get_company(
     company_id: int,
+    include: Tuple[str, ...] = Depends(include_param(CompanyRepository.loading_profiles)),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session_without_commit)
-):
+) -> SCompanyResponse:
     """
     Получение информации о компании по ее идентификатору.
 
     :param company_id: Идентификатор компании.
+    :param include: Загружаемые связи (users, structures).
     :param current_user: Данные текущего пользователя.
     :param session: Асинхронная сессия базы данных.
     :return: Информация о компании.
     """
     service = CompanyUserService(session)
-    company = await service.get_company_by_id(company_id)
-    return company
+    company = await service.get_company_by_id(company_id, include)
+    return to_schema(SCompanyResponse, company)
+
+
+@router.get("/{company_id}/headcount")
+async def get_company_headcount(
+    company_id: int,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> SCompanyHeadcount:
+    """
+    Получение количества пользователей компании.
+
+    :param company_id: Идентификатор компании.
+    :param current_user: Данные текущего пользователя.
+    :param session: Асинхронная сессия базы данных.
+    :return: Численность компании.
+    """
+    service = CompanyUserService(session)
+    return await service.get_headcount(company_id)
+
+
+@router.get("/{company_id}/org_chart", response_model=SOrgChart)
+async def get_org_chart(
+    company_id: int,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> Response:
+    """
+    Получение оргструктуры компании одним запросом: структуры, участники и подчиненные.
+
+    :param company_id: Идентификатор компании.
+    :param current_user: Данные текущего пользователя.
+    :param session: Асинхронная сессия базы данных.
+    :return: Оргструктура компании.
+    """
+    service = CompanyUserService(session)
+    return Response(content=await service.get_org_chart(company_id), media_type="application/json")
 
 
 @router.post("/add_user/{user_id}/to_company/{company_id}")
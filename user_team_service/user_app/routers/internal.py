@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_team_service.user_app.dependencies.internal_dep import verify_internal_token
+from user_team_service.user_app.dependencies.repository_dep import get_session_with_commit, get_session_without_commit
+from user_team_service.user_app.repositories.auth_repository import UsersRepository
+from user_team_service.user_app.schemas.event_schema import SEventBatch, SEventBatchResult
+from user_team_service.user_app.schemas.internal_schema import SDirectoryPage, SDirectoryUser
+from user_team_service.user_app.services.outbox import EventConsumer
+
+router = APIRouter(dependencies=[Depends(verify_internal_token)])
+
+
+@router.get("/users/changes")
+async def get_user_changes(
+    since: Optional[datetime] = None,
+    after_id: int = 0,
+    limit: int = Query(default=500, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> SDirectoryPage:
+    """
+    Получение пользователей, измененных после курсора, для реплики справочника в других сервисах.
+
+    :param since: Время изменения последней полученной записи.
+    :param after_id: Идентификатор последней полученной записи.
+    :param limit: Размер страницы.
+    :param session: Асинхронная сессия базы данных.
+    :return: Страница измененных пользователей.
+    """
+    users = await UsersRepository(session).find_changed_since(since, after_id, limit)
+    return SDirectoryPage(
+        items=[SDirectoryUser.model_validate(user) for user in users],
+        has_more=len(users) == limit
+    )
+
+
+@router.post("/events")
+async def ingest_events(
+    batch: SEventBatch,
+    session: AsyncSession = Depends(get_session_with_commit)
+) -> SEventBatchResult:
+    """
+    Прием пачки событий от сервиса задач.
+
+    :param batch: Пачка событий с именем источника.
+    :param session: Асинхронная сессия базы данных.
+    :return: Количество обработанных событий и смещение источника.
+    """
+    return await EventConsumer(session).consume(batch)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_team_service.user_app.dependencies.auth_dep import get_current_user
+from user_team_service.user_app.dependencies.repository_dep import get_session_without_commit
+from user_team_service.user_app.exceptions.exception import JobNotFoundException
+from user_team_service.user_app.models import User
+from user_team_service.user_app.models.user_model import StatusEnum
+from user_team_service.user_app.repositories.job_repository import JobRepository
+from user_team_service.user_app.schemas.job_schema import SJob
+
+router = APIRouter()
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> SJob:
+    """
+    Получение состояния фоновой задачи.
+
+    Задачу видят поставивший ее пользователь и администраторы; для остальных она не найдена.
+
+    :param job_id: Идентификатор задачи.
+    :param current_user: Данные текущего пользователя.
+    :param session: Асинхронная сессия базы данных.
+    :return: Состояние, прогресс и результат задачи.
+    """
+    job = await JobRepository(session).find_one_or_none_by_id(job_id)
+    is_admin = current_user.status in (StatusEnum.ADMIN_GROUP, StatusEnum.ADMIN_GENERAL)
+    if not job or not (is_admin or job.created_by == current_user.id):
+        raise JobNotFoundException
+    return SJob.model_validate(job)
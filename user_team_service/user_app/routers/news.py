@@ -1,17 +1,25 @@
+from datetime import datetime
 from fastapi.exceptions import HTTPException
-from typing import List
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from user_team_service.user_app.core.loading import to_schema
 from user_team_service.user_app.dependencies.auth_dep import get_current_user, get_current_admin_user
+from user_team_service.user_app.dependencies.include_dep import include_param
 from user_team_service.user_app.dependencies.repository_dep import get_session_with_commit, get_session_without_commit
+from user_team_service.user_app.exceptions.exception import InvalidFeedCursorException
 from user_team_service.user_app.models import User
-from user_team_service.user_app.schemas.news_schema import SNewsCreate, SNewsAll
+from user_team_service.user_app.core.config import settings
+from user_team_service.user_app.repositories.teams_repository import NewsRepository
+from user_team_service.user_app.schemas.news_schema import SNewsCreate, SNewsDetail, SNewsPage
 from user_team_service.user_app.services.news_service import NewsService
 
 router = APIRouter()
 
+news_include = include_param(NewsRepository.loading_profiles)
+
 
 @router.post("/create")
 async def create_news(
@@ -28,8 +36,8 @@ async def create_news(
     :return: Сообщение об успешном создании новости и идентификатор новости.
     """
     news_service = NewsService(session)
-    new_news = await news_service.create_news(news, user_data.id)
-    return {'message': 'Новость успешно создана!', 'news_id': new_news.news_id}
+    new_news = await news_service.create_news(news, user_data.id, user_data.company_id)
+    return {'message': 'Новость успешно создана!', 'news_id': new_news.id}
 
 
 @router.delete("/delete/{news_id}")
@@ -58,32 +66,63 @@ async def delete_news(
 @router.get("/get/{news_id}")
 async def get_one_news(
     news_id: int,
+    include: Tuple[str, ...] = Depends(news_include),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session_without_commit)
-) -> SNewsAll:
+) -> SNewsDetail:
     """
     Получение одной новости по идентификатору.
 
     :param news_id: Идентификатор новости.
+    :param include: Загружаемые связи (author).
     :param current_user: Данные текущего пользователя.
     :param session: Асинхронная сессия базы данных.
     :return: Информация о новости.
     """
     news_service = NewsService(session)
-    return await news_service.get_one_news(news_id)
+    return to_schema(SNewsDetail, await news_service.get_one_news(news_id, include))
 
 
 @router.get("/get_all")
 async def get_news(
+    include: Tuple[str, ...] = Depends(news_include),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session_without_commit)
-) -> List[SNewsAll]:
+) -> List[SNewsDetail]:
     """
     Получение всех новостей.
 
+    :param include: Загружаемые связи (author).
     :param current_user: Данные текущего пользователя.
     :param session: Асинхронная сессия базы данных.
     :return: Список всех новостей.
     """
     news_service = NewsService(session)
-    return await news_service.get_all_news()
+    return [to_schema(SNewsDetail, news) for news in await news_service.get_all_news(include)]
+
+
+@router.get("/feed")
+async def get_company_feed(
+    limit: int = Query(default=settings.NEWS_FEED_PAGE_SIZE, ge=1, le=100),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session_without_commit)
+) -> SNewsPage:
+    """
+    Получение ленты новостей компании текущего пользователя, от новых к старым.
+
+    :param limit: Размер страницы.
+    :param before_created_at: Время публикации последней новости предыдущей страницы (next_before_created_at).
+    :param before_id: Идентификатор последней новости предыдущей страницы (next_before_id из ответа).
+    :param current_user: Данные текущего пользователя.
+    :param session: Асинхронная сессия базы данных.
+    :return: Страница ленты новостей.
+    """
+    if (before_created_at is None) != (before_id is None):
+        raise InvalidFeedCursorException
+    if current_user.company_id is None:
+        return SNewsPage(items=[])
+    before = (before_created_at, before_id) if before_id is not None else None
+    news_service = NewsService(session)
+    return await news_service.get_company_feed(current_user.company_id, limit, before)
@@ -1,16 +1,24 @@
-from typing import List
+from typing import List, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from user_team_service.user_app.core.loading import to_schema
 from user_team_service.user_app.dependencies.auth_dep import get_current_admin_user, get_current_user
+from user_team_service.user_app.dependencies.include_dep import include_param
 from user_team_service.user_app.dependencies.repository_dep import get_session_with_commit, get_session_without_commit
 from user_team_service.user_app.models import User
-from user_team_service.user_app.schemas.structure_schema import SStructure, SstrMembers, SStructureResponse, SStrMemResponse
+from user_team_service.user_app.repositories.teams_repository import StructureMemberRepository, StructureRepository
+from user_team_service.user_app.schemas.structure_schema import (SStructure, SstrMembers, SStructureHeadcount,
+                                                                 SStructurePerformance, SStructureResponse,
+                                                                 SStrMemDetail, SStrMemReports)
 from user_team_service.user_app.services.structure_service import StructureService
 
 router = APIRouter()
 
+structure_include = include_param(StructureRepository.loading_profiles)
+member_include = include_param(StructureMemberRepository.loading_profiles)
+
 
 @router.post("/create")
 async def create_structure(structure_data: SStructure,
@@ -30,27 +38,55 @@ async def update_structure(structure_id: int,
     return await service.update_structure(structure_id, structure_data)
 
 
-@router.delete("/delete/{structure_id}")
+@router.delete("/delete/{structure_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_structure(structure_id: int,
                            current_user: User = Depends(get_current_admin_user),
                            session: AsyncSession = Depends(get_session_with_commit)):
     service = StructureService(session)
-    return await service.delete_structure(structure_id)
+    return await service.delete_structure(structure_id, created_by=current_user.id)
 
 
 @router.get("/get/{structure_id}")
 async def get_structure(structure_id: int,
+                        include: Tuple[str, ...] = Depends(structure_include),
                         current_user: User = Depends(get_current_user),
                         session: AsyncSession = Depends(get_session_without_commit)) -> SStructureResponse:
     service = StructureService(session)
-    return await service.get_structure(structure_id)
+    return to_schema(SStructureResponse, await service.get_structure(structure_id, include))
+
+
+@router.get("/{structure_id}/headcount")
+async def get_structure_headcount(structure_id: int,
+                                  current_user: User = Depends(get_current_user),
+                                  session: AsyncSession = Depends(get_session_without_commit)) -> SStructureHeadcount:
+    """
+    Получение количества участников структуры.
+    """
+    service = StructureService(session)
+    return await service.get_headcount(structure_id)
+
+
+@router.get("/{structure_id}/performance")
+async def get_structure_performance(structure_id: int,
+                                    current_user: User = Depends(get_current_user),
+                                    session: AsyncSession = Depends(get_session_without_commit)
+                                    ) -> SStructurePerformance:
+    """
+    Получение отчета об эффективности структуры: задачи и средние оценки участников.
+
+    Показатели запрашиваются в сервисе задач параллельными пачками с общим сроком; участники,
+    для которых сервис задач не ответил вовремя, перечислены в missing_user_ids.
+    """
+    service = StructureService(session)
+    return await service.get_performance_report(structure_id)
 
 
 @router.get("/all")
-async def get_structures(current_user: User = Depends(get_current_user),
+async def get_structures(include: Tuple[str, ...] = Depends(structure_include),
+                         current_user: User = Depends(get_current_user),
                          session: AsyncSession = Depends(get_session_without_commit)) -> List[SStructureResponse]:
     service = StructureService(session)
-    return await service.get_all_structures()
+    return [to_schema(SStructureResponse, structure) for structure in await service.get_all_structures(include)]
 
 
 @router.post("/create_member")
@@ -80,32 +116,46 @@ async def delete_structure_member(structure_member_id: int,
 
 @router.get("/get_member/{structure_member_id}")
 async def get_structure_member(structure_member_id: int,
+                               include: Tuple[str, ...] = Depends(member_include),
                                current_user: User = Depends(get_current_user),
-                               session: AsyncSession = Depends(get_session_without_commit)):
+                               session: AsyncSession = Depends(get_session_without_commit)) -> SStrMemDetail:
     """
     Получение участника структуры по его идентификатору.
     """
     service = StructureService(session)
-    return await service.get_structure_member(structure_member_id)
+    return to_schema(SStrMemDetail, await service.get_structure_member(structure_member_id, include))
+
+
+@router.get("/members/{structure_member_id}/reports")
+async def get_member_reports(structure_member_id: int,
+                             current_user: User = Depends(get_current_user),
+                             session: AsyncSession = Depends(get_session_without_commit)) -> SStrMemReports:
+    """
+    Получение количества прямых и всех подчиненных участника структуры.
+    """
+    service = StructureService(session)
+    return await service.get_member_reports(structure_member_id)
 
 
 @router.get("/members/{structure_id}")
 async def get_structure_members(structure_id: int,
+                                include: Tuple[str, ...] = Depends(member_include),
                                 current_user: User = Depends(get_current_user),
                                 session: AsyncSession = Depends(get_session_without_commit)) -> dict:
     """
     Получение всех участников структуры по идентификатору структуры.
     """
     service = StructureService(session)
-    return await service.get_structure_members(structure_id)
+    return await service.get_structure_members(structure_id, include)
 
 
 @router.get("/all_members")
-async def get_all_structure_members(current_user: User = Depends(get_current_user),
+async def get_all_structure_members(include: Tuple[str, ...] = Depends(member_include),
+                                    current_user: User = Depends(get_current_user),
                                     session: AsyncSession = Depends(get_session_without_commit)
-                                    ) -> list[SStrMemResponse]:
+                                    ) -> list[SStrMemDetail]:
     """
     Получение всех участников всех структур.
     """
     service = StructureService(session)
-    return await service.get_all_structure_members()
+    return [to_schema(SStrMemDetail, member) for member in await service.get_all_structure_members(include)]
@@ -1,33 +1,43 @@
+from typing import Any, Dict, Tuple, Union
+
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from user_team_service.user_app.services.task_service import TaskService
 from user_team_service.user_app.dependencies.auth_dep import get_current_user, get_current_admin_user
+from user_team_service.user_app.dependencies.include_dep import fields_param
 from user_team_service.user_app.dependencies.repository_dep import get_session_with_commit, get_session_without_commit
 
 from user_team_service.user_app.models.user_model import User
+from user_team_service.user_app.repositories.auth_repository import UsersRepository
 from user_team_service.user_app.schemas.auth_schemas import SUserInfo, UserUpdate
 from user_team_service.user_app.services.user_service import UserService
 
 router = APIRouter()
 
+user_fields = fields_param(UsersRepository.selectable_fields)
+
 
 @router.get("/get/{user_id}")
 async def get_user(
     user_id: int,
+    fields: Tuple[str, ...] = Depends(user_fields),
     session: AsyncSession = Depends(get_session_without_commit),
     user_data: User = Depends(get_current_user)
-) -> SUserInfo:
+) -> Union[SUserInfo, Dict[str, Any]]:
     """
     Получение информации о пользователе по его идентификатору.
 
     :param user_id: Идентификатор пользователя.
+    :param fields: Поля ответа (по умолчанию все).
     :param session: Асинхронная сессия базы данных.
     :param user_data: Данные текущего администратора.
     :return: Информация о пользователе.
     """
     print(f"Received request for user_id: {user_id}, user_data: {user_data}")
     user_service = UserService(session)
+    if fields:
+        return await user_service.get_user_fields(user_id, fields)
     return await user_service.get_user_by_id(user_id)
 
 
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -5,16 +8,75 @@ class SCompanyCreate(BaseModel):
     name: str = Field(min_length=3, max_length=50, description="Название, от 3 до 50 символов")
 
 
+class SCompanyUser(BaseModel):
+    id: int = Field(description="Идентификатор пользователя")
+    first_name: str = Field(description="Имя")
+    last_name: str = Field(description="Фамилия")
+    email: str = Field(description="Электронная почта")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SCompanyStructure(BaseModel):
+    id: int = Field(description="Идентификатор структуры")
+    name: str = Field(description="Название структуры")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class SCompanyResponse(SCompanyCreate):
     id: int = Field(description="Идентификатор компании")
-    users: list = Field(description="Список работников компании")
+    users_count: int = Field(description="Количество пользователей компании")
+    users: List[SCompanyUser] = Field(default_factory=list,
+                                      description="Список работников компании (загружается при include=users)")
+    structures: List[SCompanyStructure] = Field(default_factory=list,
+                                                description="Структуры компании (загружаются при include=structures)")
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class SCompanyHeadcount(BaseModel):
+    id: int = Field(description="Идентификатор компании")
+    users_count: int = Field(description="Количество пользователей компании")
+
+
 class SCompanyDelete(BaseModel):
     id: int = Field(description="Идентификатор компании")
 
 
 class SCompanyList(SCompanyDelete, SCompanyCreate):
     ...
+
+
+class SCompanyRelated(BaseModel):
+    company_id: int = Field(description="Идентификатор компании")
+
+
+class SSoftDelete(BaseModel):
+    deleted_at: datetime = Field(description="Время удаления")
+
+
+class SCompanyDeleteJob(BaseModel):
+    message: str = Field(description="Сообщение о принятом удалении")
+    job_id: int = Field(description="Идентификатор фоновой задачи удаления")
+
+
+class SOrgChartMember(BaseModel):
+    id: int = Field(description="Идентификатор участника структуры")
+    user_id: Optional[int] = Field(description="Идентификатор пользователя")
+    first_name: Optional[str] = Field(description="Имя")
+    last_name: Optional[str] = Field(description="Фамилия")
+    email: Optional[str] = Field(description="Электронная почта")
+    role: str = Field(description="Роль в структуре")
+    manager_id: Optional[int] = Field(description="Идентификатор участника-менеджера")
+    subordinates: List["SOrgChartMember"] = Field(description="Подчиненные из той же структуры")
+
+
+class SOrgChartStructure(SCompanyStructure):
+    members: List[SOrgChartMember] = Field(description="Участники верхнего уровня структуры")
+
+
+class SOrgChart(SCompanyCreate):
+    id: int = Field(description="Идентификатор компании")
+    version: int = Field(description="Версия оргструктуры")
+    structures: List[SOrgChartStructure] = Field(description="Структуры компании")
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SEvent(BaseModel):
+    id: int = Field(description="Идентификатор события в outbox источника")
+    seq: int = Field(validation_alias="delivery_seq", description="Номер доставки")
+    event_type: str = Field(description="Тип события")
+    aggregate_id: Optional[int] = Field(default=None, description="Идентификатор измененной сущности")
+    payload: dict = Field(default_factory=dict, description="Данные события")
+    created_at: datetime = Field(description="Время возникновения события")
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class SEventBatch(BaseModel):
+    source: str = Field(description="Имя сервиса-источника")
+    events: List[SEvent] = Field(description="Пачка событий")
+
+
+class SEventBatchResult(BaseModel):
+    accepted: int = Field(description="Количество обработанных событий")
+    last_seq: int = Field(description="Смещение источника после обработки пачки")
@@ -0,0 +1,27 @@
+import enum
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class SDirectoryUser(BaseModel):
+    id: int = Field(description="Идентификатор пользователя")
+    first_name: str = Field(description="Имя пользователя")
+    last_name: str = Field(description="Фамилия пользователя")
+    company_id: Optional[int] = Field(default=None, description="Идентификатор компании")
+    status: str = Field(description="Статус пользователя")
+    structure_ids: List[int] = Field(description="Идентификаторы структур пользователя")
+    updated_at: datetime = Field(description="Время последнего изменения")
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator('status', mode='before')
+    @classmethod
+    def status_value(cls, value):
+        return value.value if isinstance(value, enum.Enum) else value
+
+
+class SDirectoryPage(BaseModel):
+    items: List[SDirectoryUser] = Field(description="Измененные пользователи")
+    has_more: bool = Field(description="Есть ли еще изменения после последней записи")
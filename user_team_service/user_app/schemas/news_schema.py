@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SNewsCreate(BaseModel):
@@ -8,10 +11,34 @@ class SNewsCreate(BaseModel):
 
 class SNews(SNewsCreate):
     author_id: int = Field(description="Идентификатор автора новости")
+    company_id: Optional[int] = Field(default=None, description="Идентификатор компании автора")
 
 
 class SNewsAll(SNews):
     id: int = Field(description="Идентификатор новости")
+    created_at: Optional[datetime] = Field(default=None, description="Время публикации")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SNewsAuthor(BaseModel):
+    id: int = Field(description="Идентификатор автора")
+    first_name: str = Field(description="Имя автора")
+    last_name: str = Field(description="Фамилия автора")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SNewsDetail(SNewsAll):
+    author: Optional[SNewsAuthor] = Field(default=None, description="Автор (загружается при include=author)")
+
+
+class SNewsPage(BaseModel):
+    items: List[SNewsAll] = Field(description="Новости страницы, от новых к старым")
+    next_before_created_at: Optional[datetime] = Field(
+        default=None, description="Значение before_created_at для следующей страницы (None — последняя)")
+    next_before_id: Optional[int] = Field(default=None,
+                                          description="Значение before_id для следующей страницы (None — последняя)")
 
 
 class SNewsFilter(BaseModel):
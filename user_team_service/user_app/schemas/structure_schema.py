@@ -1,6 +1,7 @@
-from typing import Optional
+import enum
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 
 class SstrMembers(BaseModel):
@@ -18,8 +19,6 @@ class SStructure(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class SStructureResponse(SStructure):
-    id: int = Field(description="Идентификатор структуры")
 
 
 class SStructureChange(BaseModel):
@@ -35,7 +34,70 @@ class SStrMemID(SstrMembers):
 
 
 class SStrMemResponse(SStrMemID):
-    ...
+    direct_reports_count: int = Field(description="Количество прямых подчиненных")
+    total_reports_count: int = Field(description="Количество всех подчиненных, прямых и косвенных")
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("role", mode="before")
+    @classmethod
+    def role_value(cls, value):
+        # Из базы роль приходит перечислением RoleEnum
+        return value.value if isinstance(value, enum.Enum) else value
+
+
+class SMemberUser(BaseModel):
+    id: int = Field(description="Идентификатор пользователя")
+    first_name: str = Field(description="Имя")
+    last_name: str = Field(description="Фамилия")
+    email: str = Field(description="Электронная почта")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SStrMemDetail(SStrMemResponse):
+    user: Optional[SMemberUser] = Field(default=None, description="Пользователь (загружается при include=user)")
+    manager: Optional[SStrMemResponse] = Field(default=None,
+                                               description="Руководитель (загружается при include=manager)")
+
+
+class SUserPerformance(BaseModel):
+    user_id: int = Field(description="Идентификатор пользователя")
+    total: int = Field(description="Всего задач")
+    overdue: int = Field(description="Незавершенных задач с прошедшим сроком")
+    by_status: Dict[str, int] = Field(description="Количество задач по статусам")
+    rating_average: Optional[float] = Field(default=None, description="Средняя оценка за период")
+    ratings: int = Field(default=0, description="Количество оценок за период")
+
+
+class SMemberPerformance(SStrMemDetail):
+    performance: Optional[SUserPerformance] = Field(
+        default=None, description="Задачи и оценки участника (нет, если сервис задач не ответил вовремя)")
+
+
+class SStructurePerformance(BaseModel):
+    structure_id: int = Field(description="Идентификатор структуры")
+    complete: bool = Field(description="Получены ли показатели всех участников")
+    missing_user_ids: List[int] = Field(description="Пользователи, показатели которых не получены")
+    members: List[SMemberPerformance] = Field(description="Участники структуры с показателями")
+
+
+class SStructureResponse(SStructure):
+    id: int = Field(description="Идентификатор структуры")
+    members_count: int = Field(description="Количество участников структуры")
+    members: List[SStrMemResponse] = Field(default_factory=list,
+                                           description="Участники структуры (загружаются при include=members)")
+
+
+class SStructureHeadcount(BaseModel):
+    id: int = Field(description="Идентификатор структуры")
+    members_count: int = Field(description="Количество участников структуры")
+
+
+class SStrMemReports(BaseModel):
+    id: int = Field(description="Идентификатор участника структуры")
+    direct_reports_count: int = Field(description="Количество прямых подчиненных")
+    total_reports_count: int = Field(description="Количество всех подчиненных, прямых и косвенных")
 
 
 class SStructureUpdate(BaseModel):
@@ -0,0 +1,40 @@
+from typing import Optional
+
+import asyncpg
+from loguru import logger
+
+from user_team_service.user_app.core.cache import CACHE_CHANNEL, apply_invalidation
+from user_team_service.user_app.core.config import database_url
+
+
+class CacheInvalidationListener:
+    """
+    Слушатель канала Postgres LISTEN/NOTIFY, сбрасывающий общие кэши процесса.
+
+    Каждый процесс держит одно выделенное соединение (вне пула), поэтому запись, измененная
+    в любом процессе, удаляется из кэшей всех процессов сразу после коммита.
+    """
+
+    def __init__(self, channel: str = CACHE_CHANNEL):
+        self.channel = channel
+        self._connection: Optional[asyncpg.Connection] = None
+
+    async def ensure_connected(self) -> None:
+        """Подключается к каналу, если соединения нет или оно было потеряно."""
+        if self._connection is not None and not self._connection.is_closed():
+            return
+        self._connection = await asyncpg.connect(database_url.replace("postgresql+asyncpg://", "postgresql://"))
+        await self._connection.add_listener(self.channel, self._on_notification)
+        logger.info(f"Подписка на канал сброса кэшей {self.channel} установлена.")
+
+    async def close(self) -> None:
+        """Закрывает соединение слушателя."""
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        apply_invalidation(payload)
+
+
+cache_invalidation_listener = CacheInvalidationListener()
@@ -1,12 +1,22 @@
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from user_team_service.user_app.core.cache import pop_everywhere
 from user_team_service.user_app.exceptions.auth_exceptions import UserNotFoundException
 from user_team_service.user_app.exceptions.exception import CompanyAlreadyExistsException, CompanyNotFoundException
 from user_team_service.user_app.repositories.auth_repository import UsersRepository
-from user_team_service.user_app.repositories.teams_repository import CompanyRepository
+from user_team_service.user_app.repositories.teams_repository import CompanyRepository, StructureRepository
 from user_team_service.user_app.schemas.auth_schemas import SUserCompany, SUserSearch
-from user_team_service.user_app.schemas.company_schemas import SCompanyCreate, SCompanyDelete
+from user_team_service.user_app.schemas.company_schemas import (SCompanyCreate, SCompanyDelete, SCompanyHeadcount,
+                                                                SCompanyRelated, SSoftDelete)
+from user_team_service.user_app.services.jobs import enqueue_job
+from user_team_service.user_app.services.news_service import NEWS_FEED_CACHE
+from user_team_service.user_app.services.org_chart import build_org_chart, org_chart_cache, serialize_org_chart
+from user_team_service.user_app.services.outbox import record_user_event
+from user_team_service.user_app.services.purger import COMPANY_PURGE_JOB
 
 
 class CompanyUserService:
@@ -27,11 +37,10 @@ class CompanyUserService:
         :param company_data: Данные для создания компании.
         :raises CompanyAlreadyExistsException: Если компания с таким именем уже существует.
         """
-        existing_comp = await self.company_repo.find_one_or_none(filters=SCompanyCreate(name=company_data.name))
-        if existing_comp:
+        company = await self.company_repo.insert_or_conflict(values=company_data, conflict_columns=['name'])
+        if company is None:
             raise CompanyAlreadyExistsException
 
-        await self.company_repo.add(values=company_data)
         return {'message': f'Компания {company_data.name} успешно создана!'}
 
     async def update_company(self, company_id: int, company_data: SCompanyCreate):
@@ -46,16 +55,26 @@ class CompanyUserService:
         if rowcount == 0:
             raise CompanyNotFoundException
 
-    async def delete_company(self, company_id: int):
+    async def delete_company(self, company_id: int, created_by: Optional[int] = None) -> int:
         """
         Удаление компании по ее идентификатору.
 
+        Компания и ее структуры только помечаются удаленными и сразу перестают быть видны;
+        зависимые данные удаляются фоновой задачей небольшими пачками.
+
         :param company_id: Идентификатор компании для удаления.
-        :raises CompanyNotFoundException: Если компания не найдена или не удалена.
+        :param created_by: Администратор, запросивший удаление.
+        :return: Идентификатор фоновой задачи удаления.
+        :raises CompanyNotFoundException: Если компания не найдена или уже удалена.
         """
-        rowcount = await self.company_repo.delete(filters=SCompanyDelete(id=company_id))
-        if rowcount == 0:
+        deleted_at = SSoftDelete(deleted_at=datetime.now(timezone.utc))
+        deleted = await self.company_repo.update_returning(filters=SCompanyDelete(id=company_id), values=deleted_at)
+        if not deleted:
             raise CompanyNotFoundException
+        await StructureRepository(self.session).update(filters=SCompanyRelated(company_id=company_id),
+                                                       values=deleted_at)
+        await pop_everywhere(self.session, NEWS_FEED_CACHE, company_id)
+        return await enqueue_job(self.session, COMPANY_PURGE_JOB, {"company_id": company_id}, created_by=created_by)
 
     async def get_all_companies(self):
         """
@@ -65,19 +84,57 @@ class CompanyUserService:
         """
         return await self.company_repo.find_all()
 
-    async def get_company_by_id(self, company_id: int):
+    async def get_company_by_id(self, company_id: int, include: Sequence[str] = ()):
         """
         Получение компании по ее идентификатору.
 
         :param company_id: Идентификатор компании.
+        :param include: Загружаемые связи (users, structures).
         :return: Данные компании.
         :raises CompanyNotFoundException: Если компания не найдена.
         """
-        company = await self.company_repo.find_one_or_none_by_id(company_id)
+        company = await self.company_repo.find_one_or_none_by_id(company_id, include)
         if not company:
             raise CompanyNotFoundException
         return company
 
+    async def get_headcount(self, company_id: int) -> SCompanyHeadcount:
+        """
+        Получение численности компании из поддерживаемого триггерами счетчика, без подсчета пользователей.
+
+        :param company_id: Идентификатор компании.
+        :return: Количество пользователей компании.
+        :raises CompanyNotFoundException: Если компания не найдена.
+        """
+        headcount = await self.company_repo.find_fields_by_id(company_id, ("users_count",))
+        if not headcount:
+            raise CompanyNotFoundException
+        return SCompanyHeadcount(**headcount)
+
+    async def get_org_chart(self, company_id: int) -> bytes:
+        """
+        Получение оргструктуры компании: структуры, участники и их подчиненные.
+
+        Сериализованное дерево кэшируется по версии оргструктуры, которую увеличивают триггеры базы
+        данных при любом изменении; проверка версии — один запрос по первичному ключу. При промахе
+        оргструктура выбирается двумя плоскими запросами и собирается за линейное время.
+
+        :param company_id: Идентификатор компании.
+        :return: Оргструктура в формате JSON.
+        :raises CompanyNotFoundException: Если компания не найдена.
+        """
+        stamp = await self.company_repo.find_org_version(company_id)
+        if stamp is None:
+            raise CompanyNotFoundException
+        cached = org_chart_cache.get(company_id)
+        if cached is not None and cached[0] == stamp.org_version:
+            return cached[1]
+
+        structures, members = await self.company_repo.find_org_chart_rows(company_id)
+        body = serialize_org_chart(build_org_chart(company_id, stamp.name, stamp.org_version, structures, members))
+        org_chart_cache.set(company_id, (stamp.org_version, body))
+        return body
+
     async def add_user_to_company(self, user_id: int, company_id: int):
         """
         Добавление пользователя в компанию.
@@ -91,16 +148,17 @@ class CompanyUserService:
         user_data = await self.user_repo.find_one_or_none_by_id(user_id)
         if not user_data:
             raise UserNotFoundException
+        company_data = await self.company_repo.find_one_or_none_by_id(company_id)
 
         # Проверка на существование компании
-        company_data = await self.company_repo.find_one_or_none_by_id(company_id)
         if not company_data:
             raise CompanyNotFoundException
 
         updated_values = SUserCompany(company_id=company_id)
-        rowcount = await self.user_repo.update(filters=SUserSearch(id=user_id), values=updated_values)
-        if rowcount == 0:
+        updated = await self.user_repo.update_returning(filters=SUserSearch(id=user_id), values=updated_values)
+        if not updated:
             raise HTTPException(status_code=404, detail="Записи не обновлены.")
+        await record_user_event(self.session, "user.updated", user_id, updated[0])
 
     async def remove_user_from_company(self, user_id: int):
         """
@@ -110,6 +168,7 @@ class CompanyUserService:
         :raises HTTPException: Если запись не обновлена.
         """
         updated_values = SUserCompany(company_id=None)
-        rowcount = await self.user_repo.update(filters=SUserSearch(id=user_id), values=updated_values)
-        if rowcount == 0:
+        updated = await self.user_repo.update_returning(filters=SUserSearch(id=user_id), values=updated_values)
+        if not updated:
             raise HTTPException(status_code=404, detail="Записи не обновлены.")
+        await record_user_event(self.session, "user.updated", user_id, updated[0])
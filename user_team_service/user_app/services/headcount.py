@@ -0,0 +1,48 @@
+from typing import Awaitable, Callable, Dict
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_team_service.user_app.database.database import async_session_maker
+from user_team_service.user_app.models.job_model import Job
+from user_team_service.user_app.repositories.teams_repository import (CompanyRepository, StructureMemberRepository,
+                                                                      StructureRepository)
+from user_team_service.user_app.services.jobs import enqueue_unique_job, job_handler
+
+HEADCOUNT_RECONCILE_JOB = "headcount.reconcile"
+
+# Счетчик -> пересчет по данным таблиц; каждый выполняется в своей транзакции, чтобы не держать
+# блокировки всех таблиц одновременно
+RECONCILERS: Dict[str, Callable[[AsyncSession], Awaitable[int]]] = {
+    "users_count": lambda session: CompanyRepository(session).reconcile_users_count(),
+    "members_count": lambda session: StructureRepository(session).reconcile_members_count(),
+    "reports_count": lambda session: StructureMemberRepository(session).reconcile_reports_count(),
+}
+
+
+async def reconcile_headcount(job: Job) -> dict:
+    """
+    Выполняет задачу сверки счетчиков численности и подчиненных.
+
+    Триггеры поддерживают счетчики приращениями, и ошибка в одном изменении остается в счетчике
+    навсегда; сверка пересчитывает их по данным таблиц и исправляет расхождения.
+
+    :param job: Задача сверки.
+    :return: Количество исправленных записей по каждому счетчику.
+    """
+    fixed = {}
+    for name, reconcile in RECONCILERS.items():
+        async with async_session_maker() as session:
+            fixed[name] = await reconcile(session)
+            await session.commit()
+        if fixed[name]:
+            logger.warning(f"Сверка счетчиков: исправлено {fixed[name]} записей ({name}).")
+    return fixed
+
+
+async def schedule_headcount_reconcile() -> None:
+    """Ставит задачу сверки счетчиков в очередь, если она еще не ожидает выполнения."""
+    await enqueue_unique_job(HEADCOUNT_RECONCILE_JOB, {})
+
+
+job_handler(HEADCOUNT_RECONCILE_JOB)(reconcile_headcount)
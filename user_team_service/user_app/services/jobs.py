@@ -0,0 +1,156 @@
+import asyncio
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_team_service.user_app.core.config import settings
+from user_team_service.user_app.database.database import async_session_maker
+from user_team_service.user_app.models.job_model import Job
+from user_team_service.user_app.repositories.job_repository import JobRepository
+
+JobHandler = Callable[[Job], Awaitable[Optional[dict]]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str):
+    """Регистрирует обработчик фоновых задач указанного типа."""
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+async def enqueue_job(session: AsyncSession, kind: str, payload: dict, max_attempts: int = None,
+                      created_by: Optional[int] = None) -> int:
+    """
+    Ставит фоновую задачу в очередь в текущей транзакции.
+
+    :param session: Сессия, в транзакции которой создается задача.
+    :param kind: Тип задачи.
+    :param payload: Параметры задачи.
+    :param max_attempts: Максимальное количество запусков (по умолчанию JOB_MAX_ATTEMPTS).
+    :param created_by: Пользователь, поставивший задачу; только он (и администраторы) видит ее состояние.
+    :return: Идентификатор задачи.
+    """
+    return await JobRepository(session).enqueue(kind, payload, max_attempts or settings.JOB_MAX_ATTEMPTS, created_by)
+
+
+async def enqueue_unique_job(kind: str, payload: dict, max_attempts: int = None) -> Optional[int]:
+    """
+    Ставит задачу в очередь в отдельной транзакции, если задача того же типа еще не в очереди.
+
+    Используется для периодических задач, которые ставят в очередь все процессы приложения.
+
+    :param kind: Тип задачи.
+    :param payload: Параметры задачи.
+    :param max_attempts: Максимальное количество запусков (по умолчанию JOB_MAX_ATTEMPTS).
+    :return: Идентификатор задачи или None, если задача уже в очереди.
+    """
+    async with async_session_maker() as session:
+        job_id = await JobRepository(session).enqueue_unique(kind, payload, max_attempts or settings.JOB_MAX_ATTEMPTS)
+        await session.commit()
+    return job_id
+
+
+class JobWorker:
+    """
+    Пул обработчиков фоновых задач из очереди в таблице jobs.
+
+    Каждый из concurrency циклов захватывает задачу (SKIP LOCKED), выполняет ее обработчик
+    и записывает результат; пока задача выполняется, время ее активности периодически обновляется.
+    Задача с ошибкой повторяется с растущей задержкой, пока не исчерпаны попытки. Пул можно
+    запускать в жизненном цикле приложения и в отдельном процессе (модуль worker) одновременно.
+    """
+
+    def __init__(self, concurrency: int = None, poll_interval: float = None):
+        self.concurrency = concurrency or settings.JOB_CONCURRENCY
+        self.poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._stopped = asyncio.Event()
+
+    def start(self) -> None:
+        """Запускает циклы обработки, если они еще не запущены."""
+        if self._tasks:
+            return
+        self._stopped.clear()
+        self._tasks = [asyncio.create_task(self._run(), name=f"job-worker-{number}")
+                       for number in range(self.concurrency)]
+        logger.info(f"Обработчик фоновых задач запущен: {self.concurrency} потоков, типы {sorted(_handlers)}.")
+
+    async def stop(self) -> None:
+        """
+        Останавливает обработку: новые задачи не захватываются, текущие получают JOB_SHUTDOWN_TIMEOUT
+        на завершение, после чего прерываются и будут повторно захвачены после JOB_STALE_AFTER.
+        """
+        self._stopped.set()
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(self._tasks, timeout=settings.JOB_SHUTDOWN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+        logger.info("Обработчик фоновых задач остановлен.")
+
+    async def run_once(self) -> bool:
+        """
+        Захватывает и выполняет одну задачу.
+
+        :return: True, если задача была захвачена.
+        """
+        async with async_session_maker() as session:
+            job = await JobRepository(session).claim_next(list(_handlers),
+                                                          timedelta(seconds=settings.JOB_STALE_AFTER))
+            await session.commit()
+        if job is None:
+            return False
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, job.attempts))
+        try:
+            result = await _handlers[job.kind](job)
+        except Exception as e:
+            logger.error(f"Ошибка фоновой задачи {job.kind} {job.id} (попытка {job.attempts}): {e}")
+            async with async_session_maker() as session:
+                recorded = await JobRepository(session).fail(job.id, job.attempts, str(e),
+                                                             timedelta(seconds=settings.JOB_RETRY_DELAY))
+                await session.commit()
+        else:
+            async with async_session_maker() as session:
+                recorded = await JobRepository(session).finish(job.id, job.attempts, result)
+                await session.commit()
+            if recorded:
+                logger.info(f"Фоновая задача {job.kind} {job.id} выполнена.")
+        finally:
+            heartbeat.cancel()
+        if not recorded:
+            logger.warning(f"Результат задачи {job.kind} {job.id} (попытка {job.attempts}) не записан: "
+                           f"задача уже захвачена повторно.")
+        return True
+
+    async def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if await self.run_once():
+                    continue
+            except Exception as e:
+                logger.error(f"Ошибка обработчика фоновых задач: {e}")
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def _heartbeat(job_id: int, attempts: int) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                async with async_session_maker() as session:
+                    await JobRepository(session).heartbeat(job_id, attempts)
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Не удалось обновить активность задачи {job_id}: {e}")
+
+
+job_worker = JobWorker()
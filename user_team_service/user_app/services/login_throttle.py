@@ -0,0 +1,126 @@
+import math
+import time
+from typing import Callable, List
+
+from user_team_service.user_app.core.cache import TTLCache
+from user_team_service.user_app.core.config import settings
+
+
+class LoginThrottle:
+    """
+    Учет неудачных попыток входа по email и по IP-адресу в скользящем окне.
+
+    Окно приближается двумя соседними фиксированными окнами: счетчик предыдущего окна
+    учитывается с весом, убывающим по мере прохождения текущего. Состояние ключа — три числа,
+    поэтому даже перебор по множеству адресов почти не расходует память, а проверка не обращается
+    к базе данных и не вычисляет хэш пароля.
+
+    Попытка учитывается до проверки пароля (acquire) и списывается при успешном входе, поэтому
+    параллельные запросы видят друг друга и одновременная серия не проходит мимо лимита.
+    Состояние хранится в памяти процесса: с несколькими процессами лимит действует в каждом из них.
+    """
+
+    def __init__(self, window: float = None, max_per_email: int = None, max_per_ip: int = None,
+                 maxsize: int = None, timer: Callable[[], float] = time.monotonic):
+        """
+        :param window: Длина окна в секундах.
+        :param max_per_email: Допустимое количество неудачных попыток на email за окно.
+        :param max_per_ip: Допустимое количество неудачных попыток с одного IP-адреса за окно.
+        :param maxsize: Максимальное количество отслеживаемых ключей.
+        :param timer: Источник времени (для тестов).
+        """
+        self.window = window or settings.LOGIN_FAILURE_WINDOW
+        self.max_per_email = max_per_email or settings.LOGIN_MAX_FAILURES_PER_EMAIL
+        self.max_per_ip = max_per_ip or settings.LOGIN_MAX_FAILURES_PER_IP
+        self._timer = timer
+        self._failures: TTLCache[List[float]] = TTLCache(maxsize=maxsize or settings.LOGIN_THROTTLE_MAX_KEYS,
+                                                         ttl=2 * self.window, timer=timer)
+
+    def retry_after(self, email: str, ip: str) -> int:
+        """
+        Проверяет, допустима ли попытка входа.
+
+        :param email: Email из запроса.
+        :param ip: IP-адрес клиента.
+        :return: 0, если попытка допустима, иначе время в секундах до следующей допустимой попытки.
+        """
+        now = self._timer()
+        wait = max(self._wait(f"email:{email.lower()}", self.max_per_email, now),
+                   self._wait(f"ip:{ip}", self.max_per_ip, now))
+        return math.ceil(wait) if wait > 0 else 0
+
+    def acquire(self, email: str, ip: str) -> int:
+        """
+        Проверяет, допустима ли попытка входа, и сразу учитывает ее как неудачную.
+
+        Проверка и учет выполняются без ожидания между ними, поэтому в пределах процесса
+        лимит не превышается и при одновременных запросах.
+
+        :param email: Email из запроса.
+        :param ip: IP-адрес клиента.
+        :return: 0, если попытка допустима и учтена, иначе время в секундах до следующей допустимой попытки.
+        """
+        retry_after = self.retry_after(email, ip)
+        if not retry_after:
+            self.register_failure(email, ip)
+        return retry_after
+
+    def register_success(self, email: str, ip: str) -> None:
+        """После успешного входа сбрасывает неудачи по email и возвращает учтенную попытку с IP-адреса."""
+        self.reset(email)
+        key = f"ip:{ip}"
+        state = self._state(key, self._timer())
+        if state[2] > 0:
+            state[2] -= 1
+            self._failures.set(key, state)
+
+    def delay(self, email: str) -> float:
+        """
+        Возвращает прогрессивную задержку ответа: удваивается с каждой недавней неудачей по email.
+
+        :param email: Email из запроса.
+        :return: Задержка в секундах (0, если неудач не было).
+        """
+        failures = self._estimate(f"email:{email.lower()}", self._timer())
+        if failures < 1:
+            return 0.0
+        return min(settings.LOGIN_DELAY_MAX, settings.LOGIN_DELAY_BASE * 2 ** (int(failures) - 1))
+
+    def register_failure(self, email: str, ip: str) -> None:
+        """Учитывает неудачную попытку входа."""
+        now = self._timer()
+        for key in (f"email:{email.lower()}", f"ip:{ip}"):
+            state = self._state(key, now)
+            state[2] += 1
+            self._failures.set(key, state)
+
+    def reset(self, email: str) -> None:
+        """Сбрасывает неудачи по email после успешного входа."""
+        self._failures.pop(f"email:{email.lower()}")
+
+    def _state(self, key: str, now: float) -> List[float]:
+        """Возвращает состояние [начало текущего окна, счетчик предыдущего окна, счетчик текущего окна]."""
+        start = now - now % self.window
+        state = self._failures.get(key)
+        if state is None or state[0] < start - self.window:
+            return [start, 0, 0]
+        if state[0] < start:
+            return [start, state[2], 0]
+        return state
+
+    def _estimate(self, key: str, now: float) -> float:
+        start, previous, current = self._state(key, now)
+        return previous * (1 - (now - start) / self.window) + current
+
+    def _wait(self, key: str, limit: int, now: float) -> float:
+        """Время, через которое оценка количества неудач станет меньше лимита."""
+        start, previous, current = self._state(key, now)
+        if previous * (1 - (now - start) / self.window) + current < limit:
+            return 0.0
+        if current >= limit:
+            # Дождаться следующего окна, где текущий счетчик станет предыдущим и начнет убывать
+            return start + self.window - now + self.window * (1 - limit / (current + 1))
+        return start + self.window * (1 - (limit - current) / previous) - now
+
+
+login_throttle = LoginThrottle()
@@ -1,10 +1,19 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from user_team_service.user_app.core.cache import TTLCache, pop_everywhere, shared_cache
+from user_team_service.user_app.core.config import settings
 from user_team_service.user_app.exceptions.exception import NewsNotFoundException
+from user_team_service.user_app.models import News
 from user_team_service.user_app.repositories.teams_repository import NewsRepository
-from user_team_service.user_app.schemas.news_schema import SNewsCreate, SNews, SNewsAll, SNewsFilter
+from user_team_service.user_app.schemas.news_schema import SNewsCreate, SNews, SNewsAll, SNewsFilter, SNewsPage
+
+# Первая страница ленты каждой компании — ее читают почти все пользователи
+NEWS_FEED_CACHE = "news_feed"
+news_feed_cache: TTLCache[SNewsPage] = shared_cache(NEWS_FEED_CACHE, TTLCache(maxsize=settings.NEWS_FEED_CACHE_SIZE,
+                                                                             ttl=settings.NEWS_FEED_CACHE_TTL))
 
 
 class NewsService:
@@ -17,18 +26,20 @@ class NewsService:
         self.session = session
         self.repository = NewsRepository(session)
 
-    async def create_news(self, news_data: SNewsCreate, author_id: int) -> SNews:
+    async def create_news(self, news_data: SNewsCreate, author_id: int, company_id: Optional[int] = None) -> News:
         """
         Создание новой новости.
 
         :param news_data: Данные для создания новости.
         :param author_id: Идентификатор автора новости.
+        :param company_id: Идентификатор компании автора (лента, в которой будет опубликована новость).
         :return: Созданная новость.
         """
         news_data_dict = news_data.model_dump()
         news_data_dict['author_id'] = author_id
-        new_news = SNews(**news_data_dict)
-        await self.repository.add(values=new_news)
+        news_data_dict['company_id'] = company_id
+        new_news = await self.repository.add(values=SNews(**news_data_dict))
+        await pop_everywhere(self.session, NEWS_FEED_CACHE, company_id)
         return new_news
 
     async def delete_news(self, news_id: int):
@@ -36,28 +47,60 @@ class NewsService:
         Удаление новости по идентификатору.
 
         :param news_id: Идентификатор новости для удаления.
+        :raises NewsNotFoundException: Если новость не найдена.
         """
-        news = await self.repository.find_one_or_none_by_id(news_id)
-        if not news:
+        deleted = await self.repository.delete_returning(filters=SNewsFilter(id=news_id))
+        if not deleted:
             raise NewsNotFoundException
-        await self.repository.delete(filters=SNewsFilter(id=news_id))
+        await pop_everywhere(self.session, NEWS_FEED_CACHE, deleted[0]['company_id'])
 
-    async def get_one_news(self, news_id: int) -> SNewsAll:
+    async def get_one_news(self, news_id: int, include: Sequence[str] = ()) -> SNewsAll:
         """
         Получение информации о новости по ее идентификатору.
 
         :param news_id: Идентификатор новости.
+        :param include: Загружаемые связи (author).
         :return: Информация о новости.
         """
-        news = await self.repository.find_one_or_none_by_id(news_id)
+        news = await self.repository.find_one_or_none_by_id(news_id, include)
         if not news:
             raise NewsNotFoundException
         return news
 
-    async def get_all_news(self) -> List[SNewsAll]:
+    async def get_all_news(self, include: Sequence[str] = ()) -> List[SNewsAll]:
         """
         Получение списка всех новостей.
 
+        :param include: Загружаемые связи (author).
         :return: Список всех новостей.
         """
-        return await self.repository.find_all()
+        return await self.repository.find_all(include=include)
+
+    async def get_company_feed(self, company_id: int, limit: int = None,
+                               before: Optional[Tuple[datetime, int]] = None) -> SNewsPage:
+        """
+        Получение страницы ленты новостей компании.
+
+        Первая страница стандартного размера берется из кэша процесса; после коммита создания
+        и удаления новостей кэш сбрасывается во всех процессах сервиса.
+
+        :param company_id: Идентификатор компании.
+        :param limit: Размер страницы.
+        :param before: Курсор (created_at, id) последней новости предыдущей страницы.
+        :return: Страница ленты.
+        """
+        limit = limit or settings.NEWS_FEED_PAGE_SIZE
+        cacheable = before is None and limit == settings.NEWS_FEED_PAGE_SIZE
+        if cacheable:
+            page = news_feed_cache.get(company_id)
+            if page is not None:
+                return page
+
+        records = await self.repository.find_company_feed(company_id, limit, before)
+        items = [SNewsAll.model_validate(record) for record in records]
+        page = SNewsPage(items=items)
+        if len(items) == limit:
+            page.next_before_created_at, page.next_before_id = items[-1].created_at, items[-1].id
+        if cacheable:
+            news_feed_cache.set(company_id, page)
+        return page
@@ -0,0 +1,81 @@
+import json
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from user_team_service.user_app.core.cache import TTLCache
+from user_team_service.user_app.core.config import settings
+
+# Сериализованная оргструктура компании: идентификатор компании -> (версия оргструктуры, JSON)
+org_chart_cache: TTLCache[Tuple[int, bytes]] = TTLCache(maxsize=settings.ORG_CHART_CACHE_SIZE,
+                                                        ttl=settings.ORG_CHART_CACHE_TTL)
+
+
+def build_org_chart(company_id: int, name: str, version: int, structures: Iterable,
+                    members: Iterable) -> Dict[str, Any]:
+    """
+    Собирает дерево оргструктуры из плоских строк за один проход по каждому списку.
+
+    Участник вкладывается в подчиненные своего менеджера, если менеджер состоит в той же структуре;
+    иначе участник находится на верхнем уровне структуры, а manager_id позволяет показать связь
+    с менеджером из другой структуры. Цикл подчинения разрывается: один из его участников
+    выносится на верхний уровень.
+
+    :param company_id: Идентификатор компании.
+    :param name: Название компании.
+    :param version: Версия оргструктуры компании.
+    :param structures: Строки структур (id, name).
+    :param members: Строки участников (id, structure_id, manager_id, role, user_id, first_name, last_name, email).
+    :return: Дерево оргструктуры в виде словарей, готовое к сериализации.
+    """
+    structure_nodes: Dict[int, Dict[str, Any]] = {
+        structure_id: {"id": structure_id, "name": structure_name, "members": []}
+        for structure_id, structure_name in structures
+    }
+    member_nodes: Dict[int, Dict[str, Any]] = {}
+    member_structures: Dict[int, int] = {}
+    for member_id, structure_id, manager_id, role, user_id, first_name, last_name, email in members:
+        member_nodes[member_id] = {
+            "id": member_id,
+            "user_id": user_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "role": getattr(role, "value", role),
+            "manager_id": manager_id,
+            "subordinates": [],
+        }
+        member_structures[member_id] = structure_id
+
+    for member_id, node in member_nodes.items():
+        structure_id = member_structures[member_id]
+        manager_id = node["manager_id"]
+        if manager_id != member_id and member_structures.get(manager_id) == structure_id:
+            member_nodes[manager_id]["subordinates"].append(node)
+        else:
+            structure_nodes[structure_id]["members"].append(node)
+
+    # Участники цикла подчинения (A — менеджер B, B — менеджер A) недостижимы с верхнего уровня:
+    # цикл разрывается, и первый недостижимый участник выносится на верхний уровень структуры
+    reached: Set[int] = set()
+    _mark_reached([node for structure in structure_nodes.values() for node in structure["members"]], reached)
+    for member_id, node in member_nodes.items():
+        if member_id not in reached:
+            subordinates = member_nodes[node["manager_id"]]["subordinates"]
+            subordinates[:] = [subordinate for subordinate in subordinates if subordinate is not node]
+            structure_nodes[member_structures[member_id]]["members"].append(node)
+            _mark_reached([node], reached)
+
+    return {"id": company_id, "name": name, "version": version, "structures": list(structure_nodes.values())}
+
+
+def _mark_reached(roots: List[Dict[str, Any]], reached: Set[int]) -> None:
+    """Отмечает участников поддеревьев roots."""
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        reached.add(node["id"])
+        stack.extend(node["subordinates"])
+
+
+def serialize_org_chart(chart: Dict[str, Any]) -> bytes:
+    """Сериализует оргструктуру в компактный JSON."""
+    return json.dumps(chart, ensure_ascii=False, separators=(",", ":")).encode()
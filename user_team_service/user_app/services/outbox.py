@@ -0,0 +1,139 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_team_service.user_app.core.config import settings
+from user_team_service.user_app.database.database import engine
+from user_team_service.user_app.repositories.auth_repository import UsersRepository
+from user_team_service.user_app.repositories.outbox_repository import ConsumerOffsetRepository, OutboxRepository
+from user_team_service.user_app.schemas.event_schema import SEvent, SEventBatch, SEventBatchResult
+from user_team_service.user_app.schemas.internal_schema import SDirectoryUser
+
+EventHandler = Callable[[AsyncSession, SEvent], Awaitable[None]]
+
+_handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+
+
+def event_handler(event_type: str):
+    """Регистрирует обработчик входящих событий указанного типа."""
+    def decorator(func: EventHandler) -> EventHandler:
+        _handlers[event_type].append(func)
+        return func
+    return decorator
+
+
+async def record_user_event(session: AsyncSession, event_type: str, user_id: int, user=None) -> None:
+    """
+    Записывает в outbox событие об изменении пользователя в текущей транзакции.
+
+    Для user.created и user.updated в событие попадает актуальная запись справочника,
+    для user.deleted — только идентификатор.
+
+    :param session: Сессия, в которой изменен пользователь.
+    :param event_type: Тип события.
+    :param user_id: Идентификатор пользователя.
+    :param user: Уже полученное актуальное состояние пользователя (например, из UPDATE ... RETURNING);
+                 если не передано, запись справочника читается из базы.
+    """
+    payload = {"id": user_id}
+    if event_type != "user.deleted":
+        if user is not None:
+            entry = SDirectoryUser.model_validate(user)
+        else:
+            entry = await UsersRepository(session).get_directory_entry(user_id)
+        if entry is None:
+            return
+        payload = entry.model_dump(mode="json")
+    await OutboxRepository(session).add_event(event_type, user_id, payload)
+
+
+class OutboxRelay:
+    """
+    Ретранслятор outbox: публикует неопубликованные события пачками во входящий эндпоинт соседнего сервиса.
+
+    В каждый момент публикует только один процесс (advisory-блокировка на выделенном соединении),
+    поэтому номера доставки монотонны. Выборка пачки с номерами доставки фиксируется до отправки,
+    а отметка о публикации — отдельной транзакцией после успешного ответа получателя; во время
+    запроса транзакция не открыта. Неподтвержденная пачка отправляется повторно с теми же номерами —
+    доставка «как минимум один раз», дубликаты отсекаются смещением получателя.
+    """
+
+    def __init__(self, source: str, peer_url: str):
+        self.source = source
+        self.peer_url = peer_url
+
+    async def relay_once(self) -> int:
+        """
+        Публикует накопившиеся события.
+
+        :return: Количество опубликованных событий.
+        """
+        async with engine.connect() as connection:
+            session = AsyncSession(bind=connection, expire_on_commit=False)
+            repository = OutboxRepository(session)
+            try:
+                locked = await repository.try_lock_relay()
+                await session.commit()
+                if not locked:
+                    return 0
+                try:
+                    return await self._relay(session, repository)
+                finally:
+                    await session.rollback()
+                    await repository.unlock_relay()
+                    await session.commit()
+            finally:
+                await session.close()
+
+    async def _relay(self, session: AsyncSession, repository: OutboxRepository) -> int:
+        total = 0
+        headers = {"X-Internal-Token": settings.INTERNAL_API_TOKEN}
+        async with httpx.AsyncClient(base_url=self.peer_url, headers=headers) as client:
+            while True:
+                events = await repository.claim_batch(settings.OUTBOX_BATCH_SIZE)
+                await session.commit()
+                if not events:
+                    await repository.prune_published(timedelta(days=settings.OUTBOX_RETENTION_DAYS))
+                    await session.commit()
+                    return total
+                batch = SEventBatch(source=self.source, events=[SEvent.model_validate(event) for event in events])
+                response = await client.post("/internal/events", json=batch.model_dump(mode="json"))
+                response.raise_for_status()
+                await repository.mark_published([event.id for event in events])
+                await session.commit()
+                total += len(events)
+                logger.info(f"Опубликовано {len(events)} событий outbox в {self.peer_url}.")
+                if len(events) < settings.OUTBOX_BATCH_SIZE:
+                    return total
+
+
+class EventConsumer:
+    """Прием пачек событий от соседнего сервиса с учетом смещения источника."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.offsets = ConsumerOffsetRepository(session)
+
+    async def consume(self, batch: SEventBatch) -> SEventBatchResult:
+        """
+        Обрабатывает пачку событий в одной транзакции.
+
+        События с номером доставки не больше смещения источника уже были обработаны и пропускаются.
+
+        :param batch: Пачка событий.
+        :return: Количество обработанных событий и новое смещение.
+        """
+        last_seq = await self.offsets.lock_offset(batch.source)
+        fresh = sorted((event for event in batch.events if event.seq > last_seq), key=lambda event: event.seq)
+        for event in fresh:
+            for handler in _handlers.get(event.event_type, ()):
+                await handler(self.session, event)
+        if fresh:
+            last_seq = fresh[-1].seq
+            await self.offsets.set_offset(batch.source, last_seq)
+        logger.info(f"Принято {len(fresh)} из {len(batch.events)} событий от {batch.source}.")
+        return SEventBatchResult(accepted=len(fresh), last_seq=last_seq)
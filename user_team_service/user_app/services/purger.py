@@ -0,0 +1,118 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_team_service.user_app.core.config import settings
+from user_team_service.user_app.database.database import async_session_maker
+from user_team_service.user_app.models.job_model import Job
+from user_team_service.user_app.repositories.auth_repository import UsersRepository
+from user_team_service.user_app.repositories.job_repository import JobRepository
+from user_team_service.user_app.repositories.outbox_repository import OutboxRepository
+from user_team_service.user_app.repositories.teams_repository import (CompanyRepository, NewsRepository,
+                                                                      StructureMemberRepository, StructureRepository)
+from user_team_service.user_app.schemas.company_schemas import SCompanyDelete, SCompanyRelated
+from user_team_service.user_app.schemas.structure_schema import SStrMemAll, SStructureChange
+from user_team_service.user_app.services.jobs import job_handler
+
+COMPANY_PURGE_JOB = "company.purge"
+STRUCTURE_PURGE_JOB = "structure.purge"
+
+BatchStep = Callable[[AsyncSession], Awaitable[int]]
+
+
+class CascadePurger:
+    """
+    Фоновое удаление компаний и структур, помеченных удаленными.
+
+    Вместо одного каскадного DELETE, который держит блокировки на все зависимые строки, данные
+    удаляются пачками по PURGE_BATCH_SIZE строк, каждая пачка — в отдельной короткой транзакции
+    с паузой PURGE_BATCH_PAUSE между пачками. Прогресс сохраняется в задаче после каждой пачки;
+    повторный запуск прерванной задачи продолжает удаление с того места, где оно остановилось.
+
+    Таблица jobs появилась для этих задач; общая очередь с JobWorker и /jobs/{id} (services/jobs.py)
+    построена поверх нее, и удаления выполняются как ее обработчики COMPANY_PURGE_JOB и STRUCTURE_PURGE_JOB.
+    """
+
+    def __init__(self, batch_size: int = None, pause: float = None):
+        self.batch_size = batch_size or settings.PURGE_BATCH_SIZE
+        self.pause = settings.PURGE_BATCH_PAUSE if pause is None else pause
+
+    async def purge_company(self, job: Job) -> dict:
+        """Выполняет задачу удаления компании."""
+        progress = {}
+        await self._purge_company(job.id, job.payload["company_id"], progress)
+        return progress
+
+    async def purge_structure(self, job: Job) -> dict:
+        """Выполняет задачу удаления структуры."""
+        progress = {}
+        await self._purge_structure(job.id, job.payload["structure_id"], progress)
+        return progress
+
+    async def _purge_company(self, job_id: int, company_id: int, progress: dict) -> None:
+        """Удаляет структуры, новости и членство пользователей компании, затем саму компанию."""
+        for structure_id in await self._structure_ids(company_id):
+            await self._purge_structure(job_id, structure_id, progress)
+
+        async def detach_users(session: AsyncSession) -> int:
+            users = await UsersRepository(session).detach_company_batch(company_id, self.batch_size)
+            await OutboxRepository(session).add_events([
+                {"event_type": "user.updated", "aggregate_id": user.id, "payload": user.model_dump(mode="json")}
+                for user in users
+            ])
+            return len(users)
+
+        async def delete_news(session: AsyncSession) -> int:
+            return await NewsRepository(session).delete_batch(SCompanyRelated(company_id=company_id), self.batch_size)
+
+        await self._run_batches(job_id, "users", detach_users, progress)
+        await self._run_batches(job_id, "news", delete_news, progress)
+        async with async_session_maker() as session:
+            await CompanyRepository(session).delete(SCompanyDelete(id=company_id))
+            await session.commit()
+
+    async def _purge_structure(self, job_id: int, structure_id: int, progress: dict) -> None:
+        """Удаляет участников структуры пачками, затем саму структуру."""
+
+        async def delete_members(session: AsyncSession) -> int:
+            return await StructureMemberRepository(session).delete_batch(
+                SStrMemAll(structure_id=structure_id), self.batch_size
+            )
+
+        await self._run_batches(job_id, "members", delete_members, progress)
+        async with async_session_maker() as session:
+            progress["structures"] = progress.get("structures", 0) + await StructureRepository(session).delete(
+                SStructureChange(id=structure_id)
+            )
+            await JobRepository(session).save_progress(job_id, progress)
+            await session.commit()
+
+    async def _run_batches(self, job_id: int, name: str, step: BatchStep, progress: dict) -> None:
+        """
+        Повторяет шаг удаления, пока он обрабатывает полные пачки.
+
+        :param job_id: Идентификатор задачи для сохранения прогресса.
+        :param name: Ключ счетчика в прогрессе.
+        :param step: Шаг, обрабатывающий одну пачку в переданной сессии.
+        :param progress: Прогресс задачи.
+        """
+        while True:
+            async with async_session_maker() as session:
+                count = await step(session)
+                progress[name] = progress.get(name, 0) + count
+                await JobRepository(session).save_progress(job_id, progress)
+                await session.commit()
+            if count < self.batch_size:
+                return
+            await asyncio.sleep(self.pause)
+
+    @staticmethod
+    async def _structure_ids(company_id: int):
+        async with async_session_maker() as session:
+            return await StructureRepository(session).find_company_structure_ids(company_id)
+
+
+cascade_purger = CascadePurger()
+job_handler(COMPANY_PURGE_JOB)(cascade_purger.purge_company)
+job_handler(STRUCTURE_PURGE_JOB)(cascade_purger.purge_structure)
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_team_service.user_app.core.config import settings
+from user_team_service.user_app.core.revocation import TokenDenylist
+from user_team_service.user_app.database.database import async_session_maker
+from user_team_service.user_app.repositories.outbox_repository import OutboxRepository
+from user_team_service.user_app.repositories.revoked_token_repository import RevokedTokenRepository
+
+token_denylist = TokenDenylist(settings.TOKEN_DENYLIST_CAPACITY, settings.TOKEN_DENYLIST_ERROR_RATE)
+
+
+async def revoke_tokens(session: AsyncSession, claims: Iterable[dict]) -> None:
+    """
+    Отзывает токены в текущей транзакции.
+
+    Отзыв сохраняется в таблицу (для остальных процессов сервиса) и в outbox событием token.revoked
+    (для сервиса задач), а в памяти текущего процесса действует сразу.
+
+    :param session: Сессия, в транзакции которой выполняется отзыв.
+    :param claims: Полезные нагрузки отзываемых токенов; токены без jti пропускаются.
+    """
+    claims = [payload for payload in claims if payload.get("jti") and payload.get("exp")]
+    await RevokedTokenRepository(session).revoke(
+        (payload["jti"], datetime.fromtimestamp(int(payload["exp"]), tz=timezone.utc)) for payload in claims
+    )
+    await OutboxRepository(session).add_events([
+        {"event_type": "token.revoked", "aggregate_id": int(payload["sub"]) if payload.get("sub") else None,
+         "payload": {"jti": payload["jti"], "exp": int(payload["exp"])}}
+        for payload in claims
+    ])
+    for payload in claims:
+        token_denylist.add(payload["jti"], int(payload["exp"]))
+
+
+class RevocationSync:
+    """
+    Загрузка отозванных токенов из таблицы revokedtokens в память процесса.
+
+    Таблица общая для всех процессов сервиса, поэтому отзыв, сделанный в любом из них, доходит
+    до остальных за TOKEN_REVOCATION_SYNC_INTERVAL. Курсор — время создания последней загруженной
+    записи; запрос начинается немного раньше курсора, чтобы не потерять записи из транзакций,
+    зафиксированных позже времени их создания.
+    """
+
+    def __init__(self, denylist: TokenDenylist = token_denylist):
+        self.denylist = denylist
+        self._watermark: Optional[datetime] = None
+
+    async def refresh(self) -> int:
+        """
+        Применяет к памяти процесса отзывы, созданные с прошлого обновления, и удаляет истекшие.
+
+        :return: Количество загруженных отзывов.
+        """
+        since = self._watermark - timedelta(seconds=settings.TOKEN_REVOCATION_SYNC_OVERLAP) if self._watermark else None
+        async with async_session_maker() as session:
+            records = await RevokedTokenRepository(session).find_revoked_since(since)
+        for record in records:
+            self.denylist.add(record.jti, record.expires_at.timestamp())
+            if self._watermark is None or record.created_at > self._watermark:
+                self._watermark = record.created_at
+        self.denylist.prune()
+        return len(records)
+
+    async def load(self) -> None:
+        """Загружает все действующие отзывы при старте."""
+        await self.refresh()
+        logger.info(f"Загружено отозванных токенов: {len(self.denylist)}.")
+
+    @staticmethod
+    async def purge_expired() -> None:
+        """Удаляет из таблицы истекшие отзывы."""
+        async with async_session_maker() as session:
+            await RevokedTokenRepository(session).purge_expired()
+            await session.commit()
+
+
+revocation_sync = RevocationSync()
@@ -1,13 +1,22 @@
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from user_team_service.user_app.exceptions.exception import StructureNotFoundException, StructureMemberNotFoundException
+from user_team_service.user_app.core.loading import to_schema
+from user_team_service.user_app.exceptions.exception import (ManagerCycleException, StructureNotFoundException,
+                                                             StructureMemberNotFoundException)
 from user_team_service.user_app.repositories.teams_repository import StructureRepository, StructureMemberRepository
+from user_team_service.user_app.schemas.company_schemas import SSoftDelete
 from user_team_service.user_app.schemas.structure_schema import (SStructure, SStructureChange, SStructureResponse,
-                                                                 SstrMembers, SStrMemResponse, SStrMemAll,
-                                                                 SStructureUpdate, SStrMemFilter)
+                                                                 SstrMembers, SStrMemDetail, SStrMemResponse, SStrMemAll,
+                                                                 SStructureUpdate, SStrMemFilter, SStructureHeadcount,
+                                                                 SStrMemReports, SMemberPerformance,
+                                                                 SStructurePerformance)
+from user_team_service.user_app.services.jobs import enqueue_job
+from user_team_service.user_app.services.purger import STRUCTURE_PURGE_JOB
+from user_team_service.user_app.services.task_service import TaskService
 
 
 class StructureService:
@@ -50,40 +59,61 @@ class StructureService:
             raise HTTPException(status_code=404, detail="Записи не обновлены")
         return {'message': 'Данные успешно обновлены!'}
 
-    async def delete_structure(self, structure_id: int) -> dict:
+    async def delete_structure(self, structure_id: int, created_by: Optional[int] = None) -> dict:
         """
         Удаление структуры по идентификатору.
 
+        Структура помечается удаленной, участники удаляются фоновой задачей небольшими пачками.
+
         :param structure_id: Идентификатор структуры для удаления.
+        :param created_by: Администратор, запросивший удаление.
         :raises HTTPException: Если удаление не выполнено.
-        :return: Сообщение об успешном удалении.
+        :return: Сообщение о принятом удалении и идентификатор фоновой задачи.
         """
-        rowcount = await self.structure_repo.delete(
+        rowcount = await self.structure_repo.update(
             filters=SStructureChange(id=structure_id),
+            values=SSoftDelete(deleted_at=datetime.now(timezone.utc)),
         )
         if rowcount == 0:
             raise HTTPException(status_code=404, detail="Удаление не выполнено")
-        return {'message': 'Данные успешно удалены!'}
+        job_id = await enqueue_job(self.session, STRUCTURE_PURGE_JOB, {"structure_id": structure_id},
+                                   created_by=created_by)
+        return {'message': 'Структура удалена, данные удаляются в фоне.', 'job_id': job_id}
 
-    async def get_structure(self, structure_id: int) -> SStructure:
+    async def get_structure(self, structure_id: int, include: Sequence[str] = ()) -> SStructure:
         """
         Получение структуры по идентификатору.
 
         :param structure_id: Идентификатор структуры.
+        :param include: Загружаемые связи (members).
         :return: Информация о структуре.
         """
-        structure = await self.structure_repo.find_one_or_none_by_id(structure_id)
+        structure = await self.structure_repo.find_one_or_none_by_id(structure_id, include)
         if not structure:
             raise StructureNotFoundException
         return structure
 
-    async def get_all_structures(self) -> List[SStructureResponse]:
+    async def get_headcount(self, structure_id: int) -> SStructureHeadcount:
+        """
+        Получение численности структуры из поддерживаемого триггерами счетчика.
+
+        :param structure_id: Идентификатор структуры.
+        :return: Количество участников структуры.
+        :raises StructureNotFoundException: Если структура не найдена.
+        """
+        headcount = await self.structure_repo.find_fields_by_id(structure_id, ("members_count",))
+        if not headcount:
+            raise StructureNotFoundException
+        return SStructureHeadcount(**headcount)
+
+    async def get_all_structures(self, include: Sequence[str] = ()) -> List[SStructureResponse]:
         """
         Получение всех структур.
 
+        :param include: Загружаемые связи (members).
         :return: Список всех структур.
         """
-        return await self.structure_repo.find_all()
+        return await self.structure_repo.find_all(include=include)
 
     async def create_structure_member(self, structure_data: SstrMembers) -> dict:
         """
@@ -103,6 +133,7 @@ class StructureService:
 
         :param structure_member_id: Идентификатор участника структуры.
         :param structure_data: Данные для обновления участника структуры.
+        :raises ManagerCycleException: Если новый менеджер — сам участник или его подчиненный.
         :raises HTTPException: Если запись не обновлена.
         :return: Сообщение об успешном обновлении.
         """
@@ -110,6 +141,10 @@ class StructureService:
         structure_member = await self.member_repo.find_one_or_none_by_id(structure_member_id)
         if not structure_member:
             raise StructureMemberNotFoundException
+        manager_id = structure_data.manager_id
+        if (manager_id is not None and manager_id != structure_member.manager_id
+                and await self.member_repo.manager_chain_contains(manager_id, structure_member_id)):
+            raise ManagerCycleException
         rowcount = await self.member_repo.update(
             filters=SStructureChange(id=structure_member_id),
             values=structure_data
@@ -133,24 +168,40 @@ class StructureService:
             raise HTTPException(status_code=404, detail="Удаление не выполнено")
         return {'message': 'Данные успешно удалены!'}
 
-    async def get_structure_member(self, structure_member_id: int) -> SstrMembers:
+    async def get_structure_member(self, structure_member_id: int, include: Sequence[str] = ()) -> SstrMembers:
         """
         Получение участника структуры по идентификатору.
 
         :param structure_member_id: Идентификатор участника структуры.
+        :param include: Загружаемые связи (user, manager).
         :raises HTTPException: Если участник не найден.
         :return: Информация об участнике структуры.
         """
-        member = await self.member_repo.find_one_or_none_by_id(structure_member_id)
+        member = await self.member_repo.find_one_or_none_by_id(structure_member_id, include)
         if not member:
             raise HTTPException(status_code=404, detail="Участник не найден")
         return member
 
-    async def get_structure_members(self, structure_id: int) -> dict:
+    async def get_member_reports(self, structure_member_id: int) -> SStrMemReports:
+        """
+        Получение количества прямых и всех подчиненных участника из поддерживаемых триггерами счетчиков.
+
+        :param structure_member_id: Идентификатор участника структуры.
+        :return: Количество прямых и всех подчиненных.
+        :raises StructureMemberNotFoundException: Если участник не найден.
+        """
+        reports = await self.member_repo.find_fields_by_id(structure_member_id,
+                                                           ("direct_reports_count", "total_reports_count"))
+        if not reports:
+            raise StructureMemberNotFoundException
+        return SStrMemReports(**reports)
+
+    async def get_structure_members(self, structure_id: int, include: Sequence[str] = ()) -> dict:
         """
         Получение всех участников структуры по идентификатору структуры.
 
         :param structure_id: Идентификатор структуры.
+        :param include: Загружаемые связи участников (user, manager).
         :raises HTTPException: Если структура не найдена.
         :return: Список участников структуры.
         """
@@ -158,15 +209,37 @@ class StructureService:
         if not structure:
             raise HTTPException(status_code=404, detail="Структура не найдена")
 
-        members = await self.member_repo.find_all(filters=SStrMemAll(structure_id=structure_id))
-        members_response = [SStrMemResponse(**member.__dict__) for member in members]
+        members = await self.member_repo.find_all(filters=SStrMemAll(structure_id=structure_id), include=include)
+        members_response = [to_schema(SStrMemDetail, member) for member in members]
 
         return {"structure_id": structure_id, "members": members_response}
 
-    async def get_all_structure_members(self) -> list[SStrMemResponse]:
+    async def get_performance_report(self, structure_id: int) -> SStructurePerformance:
+        """
+        Получение отчета об эффективности структуры: участники с их задачами и оценками из сервиса задач.
+
+        Если сервис задач не успел ответить для части участников, отчет возвращается частичным.
+
+        :param structure_id: Идентификатор структуры.
+        :raises HTTPException: Если структура не найдена.
+        :return: Участники структуры с показателями и список пользователей без показателей.
+        """
+        members = (await self.get_structure_members(structure_id, include=("user",)))["members"]
+        performance, missing = await TaskService(self.session).get_performance(
+            [member.user_id for member in members])
+        return SStructurePerformance(
+            structure_id=structure_id,
+            complete=not missing,
+            missing_user_ids=missing,
+            members=[SMemberPerformance(**member.model_dump(), performance=performance.get(member.user_id))
+                     for member in members],
+        )
+
+    async def get_all_structure_members(self, include: Sequence[str] = ()) -> list[SStrMemResponse]:
         """
         Получение всех участников всех структур.
 
+        :param include: Загружаемые связи (user, manager).
         :return: Список всех участников структур.
         """
-        return await self.member_repo.find_all()
+        return await self.member_repo.find_all(include=include)
@@ -1,6 +1,11 @@
+import asyncio
+from typing import Dict, List, Sequence, Tuple
+
 import httpx
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from user_team_service.user_app.core.config import settings
 from user_team_service.user_app.models import User
 
 
@@ -12,7 +17,49 @@ class TaskService:
         :param session: Асинхронная сессия базы данных.
         """
         self.session = session
-        self.base_url = "http://service2:8002"
+        self.base_url = settings.TASK_SERVICE_URL
+        # Межсервисные запросы не ограничиваются лимитом частоты сервиса задач
+        self.headers = {"X-Internal-Token": settings.INTERNAL_API_TOKEN}
+
+    async def get_performance(self, user_ids: Sequence[int]) -> Tuple[Dict[int, dict], List[int]]:
+        """
+        Получение показателей пользователей (задачи и оценки) из сервиса задач.
+
+        Идентификаторы делятся на пачки по PERFORMANCE_BATCH_SIZE; пачки запрашиваются параллельно,
+        не больше PERFORMANCE_CONCURRENCY одновременно, поэтому время ответа определяется самой медленной
+        волной пачек, а не суммой запросов. Через PERFORMANCE_DEADLINE секунд незавершенные запросы
+        отменяются, и возвращаются уже полученные показатели.
+
+        :param user_ids: Идентификаторы пользователей.
+        :return: Показатели по идентификатору пользователя и список пользователей, показатели которых не получены.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        size = settings.PERFORMANCE_BATCH_SIZE
+        batches = [user_ids[start:start + size] for start in range(0, len(user_ids), size)]
+        semaphore = asyncio.Semaphore(settings.PERFORMANCE_CONCURRENCY)
+        results: Dict[int, dict] = {}
+
+        async with httpx.AsyncClient(base_url=self.base_url, headers=self.headers,
+                                     timeout=settings.PERFORMANCE_DEADLINE) as client:
+            async def fetch(batch: List[int]) -> None:
+                async with semaphore:
+                    response = await client.get("/internal/performance", params={"user_ids": batch})
+                    response.raise_for_status()
+                    for item in response.json():
+                        results[item["user_id"]] = item
+
+            requests = [asyncio.create_task(fetch(batch)) for batch in batches]
+            if requests:
+                done, pending = await asyncio.wait(requests, timeout=settings.PERFORMANCE_DEADLINE)
+                for request in pending:
+                    request.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                failed = [request.exception() for request in done if request.exception() is not None]
+                if pending or failed:
+                    logger.warning(f"Показатели из сервиса задач получены частично: {len(pending)} пачек не успели "
+                                   f"к сроку, {len(failed)} завершились ошибкой {failed[:1]}")
+
+        return results, [user_id for user_id in user_ids if user_id not in results]
 
     async def get_tasks_for_user(self, current_user: User):
         """
@@ -21,7 +68,7 @@ class TaskService:
         :param current_user: Текущий пользователь, для которого нужно получить задачи.
         :return: Список задач, назначенных текущему пользователю.
         """
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(headers=self.headers) as client:
             response = await client.get(f"{self.base_url}/tasks/all")
             response.raise_for_status()
             tasks = response.json()
@@ -37,7 +84,7 @@ class TaskService:
         :param task_data: Данные для обновления задачи в формате словаря.
         :return: Сообщение об успешном обновлении задачи.
         """
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(headers=self.headers) as client:
             await client.put(f"{self.base_url}/tasks/update?task_id={task_id}", json=task_data)
 
             return {'message': 'Задача успешно обновлена!'}
@@ -48,7 +95,7 @@ class TaskService:
 
         :param task_id: Идентификатор задачи, которую нужно удалить.
         """
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(headers=self.headers) as client:
             await client.delete(f"{self.base_url}/tasks/delete/{task_id}")
 
     async def get_my_motivation(self, current_user: User):
@@ -61,7 +108,7 @@ class TaskService:
         res = {}
         my_tasks = await self.get_tasks_for_user(current_user)
         for task in my_tasks:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(headers=self.headers) as client:
                 response = await client.get(f"{self.base_url}/motivations/get_by_taskid/{task['id']}")
                 if response.status_code == 200:
                     res[f"Task ID {task['id']}"] = response.json()["rating"]
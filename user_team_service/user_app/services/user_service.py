@@ -1,9 +1,12 @@
+from typing import Any, Dict, Optional, Sequence
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from user_team_service.user_app.exceptions.auth_exceptions import UserNotFoundException
 from user_team_service.user_app.models import User
 from user_team_service.user_app.repositories.auth_repository import UsersRepository
+from user_team_service.user_app.services.outbox import record_user_event
 from user_team_service.user_app.schemas.auth_schemas import SUserInfo, UserBase, EmailModel, SUserStatus, UserUpdate, SUserSearch
 
 
@@ -27,6 +30,16 @@ class UserService:
         """
         return await self.users_repo.find_one_or_none_by_id(user_id)
 
+    async def get_user_fields(self, user_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Получение выбранных полей пользователя по его идентификатору.
+
+        :param user_id: Идентификатор пользователя.
+        :param fields: Колонки ответа (см. UsersRepository.selectable_fields).
+        :return: Словарь поле -> значение или None, если пользователь не найден.
+        """
+        return await self.users_repo.find_fields_by_id(user_id, fields)
+
     async def update_user(self, current_user: User, user_data: UserUpdate) -> dict:
         """
         Обновление данных пользователя.
@@ -47,12 +60,13 @@ class UserService:
             if existing_user:
                 raise HTTPException(status_code=400, detail="Email уже используется другим пользователем.")
 
-        rowcount = await self.users_repo.update(
+        updated = await self.users_repo.update_returning(
             filters=EmailModel(email=current_user.email),
             values=user_data
         )
-        if rowcount == 0:
+        if not updated:
             raise HTTPException(status_code=404, detail="Записи не обновлены")
+        await record_user_event(self.session, "user.updated", current_user.id, updated[0])
 
         return {'message': 'Данные успешно обновлены!'}
 
@@ -74,6 +88,7 @@ class UserService:
         )
         if rowcount == 0:
             raise HTTPException(status_code=404, detail="Удаление не выполнено")
+        await record_user_event(self.session, "user.deleted", user_id)
 
         return {'message': 'Данные успешно удалены!'}
 
@@ -85,20 +100,14 @@ class UserService:
         :param status: Новый статус пользователя.
         :return: Сообщение об успешном обновлении статуса.
         :raises UserNotFoundException: Если пользователь не найден.
-        :raises HTTPException: Если запись не обновлена.
         """
-        user_data = await self.users_repo.find_one_or_none_by_id(user_id)
-        if user_data is None:
-            raise UserNotFoundException
-
-        user_data.status = status
-        updated_values = SUserStatus(status=user_data.status)
-
-        rowcount = await self.users_repo.update(
-            filters=EmailModel(email=user_data.email),
-            values=updated_values
+        updated = await self.users_repo.update_returning(
+            filters=SUserSearch(id=user_id),
+            values=SUserStatus(status=status)
         )
-        if rowcount == 0:
-            raise HTTPException(status_code=404, detail="Записи не обновлены")
+        if not updated:
+            raise UserNotFoundException
+        user_data = updated[0]
+        await record_user_event(self.session, "user.updated", user_id, user_data)
 
         return {'message': f'Статус пользователя {user_data.email} успешно обновлен!'}
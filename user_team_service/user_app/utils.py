@@ -1,3 +1,5 @@
+import asyncio
+import uuid
 from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta, timezone
@@ -12,7 +14,7 @@ def create_tokens(data: dict) -> dict:
     # AccessToken - 30 минут
     access_expire = now + timedelta(minutes=30)
     access_payload = data.copy()
-    access_payload.update({"exp": int(access_expire.timestamp()), "type": "access"})
+    access_payload.update({"exp": int(access_expire.timestamp()), "type": "access", "jti": uuid.uuid4().hex})
     access_token = jwt.encode(
         access_payload,
         settings.SECRET_KEY,
@@ -22,7 +24,7 @@ def create_tokens(data: dict) -> dict:
     # RefreshToken - 7 дней
     refresh_expire = now + timedelta(days=7)
     refresh_payload = data.copy()
-    refresh_payload.update({"exp": int(refresh_expire.timestamp()), "type": "refresh"})
+    refresh_payload.update({"exp": int(refresh_expire.timestamp()), "type": "refresh", "jti": uuid.uuid4().hex})
     refresh_token = jwt.encode(
         refresh_payload,
         settings.SECRET_KEY,
@@ -32,7 +34,8 @@ def create_tokens(data: dict) -> dict:
 
 
 async def authenticate_user(user, password):
-    if not user or verify_password(plain_password=password, hashed_password=user.password) is False:
+    # bcrypt намеренно медленный, поэтому проверка выполняется вне цикла событий
+    if not user or await asyncio.to_thread(verify_password, password, user.password) is False:
         return None
     return user
 